@@ -0,0 +1,81 @@
+"""
+Gunicorn settings for the backend API
+
+    cd backend/src && gunicorn -c ../gunicorn.conf.py
+
+Every setting can be overridden from the environment. Threads per worker
+should not exceed DB_POOL_SIZE + DB_MAX_OVERFLOW.
+
+Graceful reloads: `kill -HUP <master>` starts fresh workers and lets old
+ones finish in-flight requests (up to graceful_timeout). With preload_app
+the master holds the code, so deploying new code needs USR2 (re-exec the
+master) followed by WINCH/TERM of the old master instead.
+"""
+import multiprocessing
+import os
+import tempfile
+
+wsgi_app = 'wsgi:app'
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+worker_class = 'gthread' if threads > 1 else 'sync'
+
+# Workers only see their own metrics, so /metrics needs a directory they all
+# write to (utils/metrics.py). Without METRICS_DIR, use a fresh one for this
+# master; set before the app (and Config) is imported.
+if workers > 1 and not os.getenv('METRICS_DIR'):
+    os.environ['METRICS_DIR'] = tempfile.mkdtemp(prefix='movies-metrics-')
+
+# Import the app, compile templates and warm catalog snapshots once in the
+# master; workers share the compiled pages copy-on-write and the snapshots
+# through the (shared) cache
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true').lower() == 'true'
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 60))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+
+# Recycle workers now and then to cap slow memory growth; jitter avoids
+# every worker restarting at once
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 200))
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')
+
+
+def on_starting(server):
+    """
+    Refuse a per-process cache or per-process metrics with several workers;
+    metrics restart from zero with the master (see utils/metrics.py)
+    """
+    from config import Config
+    from utils.cache import LOCAL_CACHE_TYPES
+    from utils.metrics import reset
+    if server.cfg.workers > 1 and Config.CACHE_TYPE in LOCAL_CACHE_TYPES:
+        raise RuntimeError(
+            f"CACHE_TYPE={Config.CACHE_TYPE} is per process and {server.cfg.workers} workers would "
+            "each keep their own cache; use a shared backend (e.g. FileSystemCache) or WEB_CONCURRENCY=1")
+    if server.cfg.workers > 1 and Config.METRICS_ENABLED and not Config.METRICS_DIR:
+        # Only when the worker count came from the command line (see above)
+        raise RuntimeError(
+            f"{server.cfg.workers} workers need METRICS_DIR so /metrics covers all of them; "
+            "set it or METRICS_ENABLED=false")
+    reset(Config.METRICS_DIR)
+
+
+def post_fork(server, worker):
+    """Never reuse pooled connections inherited from the master"""
+    from wsgi import app
+    from database import db
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+
+def child_exit(server, worker):
+    """Keep a recycled worker's metrics in the shared totals"""
+    from config import Config
+    from utils.metrics import fold_exited_worker
+    fold_exited_worker(Config.METRICS_DIR, worker.pid)
@@ -0,0 +1,30 @@
+"""add script checkpoint
+
+Revision ID: 3b8d5f0e2c71
+Revises: a6c4e8f2b157
+Create Date: 2026-10-19 22:05:31.204117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '3b8d5f0e2c71'
+down_revision = 'a6c4e8f2b157'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('script_checkpoint',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('state', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('script_checkpoint')
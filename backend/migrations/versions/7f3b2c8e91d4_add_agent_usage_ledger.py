@@ -0,0 +1,53 @@
+"""add agent usage ledger
+
+Revision ID: 7f3b2c8e91d4
+Revises: 5c1e9a7d2b40
+Create Date: 2026-10-19 10:41:07.118530
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7f3b2c8e91d4'
+down_revision = '5c1e9a7d2b40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('agent_usage',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('member_id', sa.Integer(), nullable=False),
+    sa.Column('trigger', sa.String(length=20), nullable=False),
+    sa.Column('input_tokens', sa.Integer(), nullable=False),
+    sa.Column('output_tokens', sa.Integer(), nullable=False),
+    sa.Column('cache_creation_tokens', sa.Integer(), nullable=False),
+    sa.Column('cache_read_tokens', sa.Integer(), nullable=False),
+    sa.Column('cost', sa.Numeric(precision=10, scale=6), nullable=False),
+    sa.Column('charged', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['member_id'], ['member.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('agent_usage', schema=None) as batch_op:
+        batch_op.create_index('ix_agent_usage_member_created_at', ['member_id', 'created_at'], unique=False)
+
+    # Carry existing totals into the ledger so a rollup reproduces them
+    op.execute("""
+        INSERT INTO agent_usage (
+            member_id, trigger, input_tokens, output_tokens,
+            cache_creation_tokens, cache_read_tokens, cost, charged, created_at
+        )
+        SELECT id, 'carryover', 0, 0, 0, 0, agent_usage, true, now()
+        FROM member
+        WHERE agent_usage > 0
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('agent_usage', schema=None) as batch_op:
+        batch_op.drop_index('ix_agent_usage_member_created_at')
+
+    op.drop_table('agent_usage')
@@ -0,0 +1,121 @@
+"""add catalog change feed
+
+Revision ID: a6c4e8f2b157
+Revises: f1a7c3d9e624
+Create Date: 2026-10-19 20:12:48.660391
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6c4e8f2b157'
+down_revision = 'f1a7c3d9e624'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('movie', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False))
+
+    op.create_table('movie_change',
+    sa.Column('version', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('movie_id', sa.Integer(), nullable=False),
+    sa.Column('op', sa.String(length=10), nullable=False),
+    sa.Column('changed_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('version')
+    )
+    with op.batch_alter_table('movie_change', schema=None) as batch_op:
+        batch_op.create_index('ix_movie_change_changed_at', ['changed_at'], unique=False)
+
+    # updated_at only moves when a column actually changes (clock_timestamp,
+    # so a second change in the same transaction is still seen)
+    op.execute("""
+        CREATE FUNCTION movie_touch() RETURNS trigger AS $$
+        BEGIN
+            IF (to_jsonb(NEW) - 'updated_at' - 'dedup_key') IS DISTINCT FROM (to_jsonb(OLD) - 'updated_at' - 'dedup_key') THEN
+                NEW.updated_at := clock_timestamp();
+            END IF;
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER movie_touch BEFORE UPDATE ON movie
+        FOR EACH ROW EXECUTE FUNCTION movie_touch()
+    """)
+
+    # Catalog writers serialize on this lock (taken before any row is touched),
+    # so change versions become visible in commit order and a reader that saw
+    # version N can never later find a smaller version appearing
+    op.execute("""
+        CREATE FUNCTION movie_change_lock() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_advisory_xact_lock(hashtext('movie_change'));
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER movie_change_lock BEFORE INSERT OR UPDATE OR DELETE ON movie
+        FOR EACH STATEMENT EXECUTE FUNCTION movie_change_lock()
+    """)
+
+    # One set-based insert per statement via transition tables, so bulk
+    # merges don't pay a row-level trigger call per movie
+    op.execute("""
+        CREATE FUNCTION movie_log_changes() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO movie_change (movie_id, op)
+                SELECT id, 'insert' FROM new_rows ORDER BY id;
+            ELSIF TG_OP = 'UPDATE' THEN
+                INSERT INTO movie_change (movie_id, op)
+                SELECT n.id, 'update'
+                FROM new_rows n JOIN old_rows o ON o.id = n.id
+                WHERE n.updated_at IS DISTINCT FROM o.updated_at
+                ORDER BY n.id;
+            ELSE
+                INSERT INTO movie_change (movie_id, op)
+                SELECT id, 'delete' FROM old_rows ORDER BY id;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER movie_log_insert AFTER INSERT ON movie
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION movie_log_changes()
+    """)
+    op.execute("""
+        CREATE TRIGGER movie_log_update AFTER UPDATE ON movie
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION movie_log_changes()
+    """)
+    op.execute("""
+        CREATE TRIGGER movie_log_delete AFTER DELETE ON movie
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION movie_log_changes()
+    """)
+
+
+def downgrade():
+    op.execute('DROP TRIGGER movie_log_delete ON movie')
+    op.execute('DROP TRIGGER movie_log_update ON movie')
+    op.execute('DROP TRIGGER movie_log_insert ON movie')
+    op.execute('DROP FUNCTION movie_log_changes()')
+    op.execute('DROP TRIGGER movie_change_lock ON movie')
+    op.execute('DROP FUNCTION movie_change_lock()')
+    op.execute('DROP TRIGGER movie_touch ON movie')
+    op.execute('DROP FUNCTION movie_touch()')
+
+    with op.batch_alter_table('movie_change', schema=None) as batch_op:
+        batch_op.drop_index('ix_movie_change_changed_at')
+
+    op.drop_table('movie_change')
+
+    with op.batch_alter_table('movie', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
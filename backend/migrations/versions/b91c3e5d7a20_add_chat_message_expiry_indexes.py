@@ -0,0 +1,28 @@
+"""add chat message expiry indexes
+
+Revision ID: b91c3e5d7a20
+Revises: a4d8e2f1c6b3
+Create Date: 2026-10-19 13:20:16.553207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b91c3e5d7a20'
+down_revision = 'a4d8e2f1c6b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('chat_message', schema=None) as batch_op:
+        batch_op.create_index('ix_chat_message_member_active_created_at', ['member_id', 'active', 'created_at'], unique=False)
+        batch_op.create_index('ix_chat_message_active_created_at', ['created_at'], unique=False, postgresql_where=sa.text('active'))
+
+
+def downgrade():
+    with op.batch_alter_table('chat_message', schema=None) as batch_op:
+        batch_op.drop_index('ix_chat_message_active_created_at', postgresql_where=sa.text('active'))
+        batch_op.drop_index('ix_chat_message_member_active_created_at')
@@ -0,0 +1,41 @@
+"""add catalog and watchlist indexes
+
+Revision ID: c27d9f4a8e15
+Revises: b91c3e5d7a20
+Create Date: 2026-10-19 14:05:53.901442
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c27d9f4a8e15'
+down_revision = 'b91c3e5d7a20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Trigram index backs the /movies title search (ILIKE '%term%')
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    with op.batch_alter_table('movie', schema=None) as batch_op:
+        batch_op.create_index('ix_movie_genre', ['genre'], unique=False)
+        batch_op.create_index('ix_movie_release_year', ['release_year'], unique=False)
+        batch_op.create_index('ix_movie_rating', ['rating'], unique=False)
+        batch_op.create_index('ix_movie_title_trgm', ['title'], unique=False, postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'})
+
+    with op.batch_alter_table('watchlist', schema=None) as batch_op:
+        batch_op.create_index('ix_watchlist_member_status', ['member_id', 'status'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('watchlist', schema=None) as batch_op:
+        batch_op.drop_index('ix_watchlist_member_status')
+
+    with op.batch_alter_table('movie', schema=None) as batch_op:
+        batch_op.drop_index('ix_movie_title_trgm', postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'})
+        batch_op.drop_index('ix_movie_rating')
+        batch_op.drop_index('ix_movie_release_year')
+        batch_op.drop_index('ix_movie_genre')
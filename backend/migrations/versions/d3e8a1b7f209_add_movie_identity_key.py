@@ -0,0 +1,60 @@
+"""add movie identity key
+
+Revision ID: d3e8a1b7f209
+Revises: c27d9f4a8e15
+Create Date: 2026-10-19 16:22:40.117254
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3e8a1b7f209'
+down_revision = 'c27d9f4a8e15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Fold existing duplicates into the lowest id before the key can be unique
+    op.execute("""
+        CREATE TEMP TABLE movie_duplicate AS
+        SELECT id, keep_id
+        FROM (
+            SELECT id, min(id) OVER (
+                PARTITION BY title, coalesce(release_year, 0), coalesce(director, '')
+            ) AS keep_id
+            FROM movie
+        ) t
+        WHERE id <> keep_id
+    """)
+    # Watchlists keep one entry per surviving movie (the one already on it, else the oldest)
+    op.execute("""
+        DELETE FROM watchlist w
+        USING (
+            SELECT w2.id, row_number() OVER (
+                PARTITION BY w2.member_id, coalesce(d.keep_id, w2.movie_id)
+                ORDER BY d.keep_id IS NOT NULL, w2.id
+            ) AS row_num
+            FROM watchlist w2
+            LEFT JOIN movie_duplicate d ON d.id = w2.movie_id
+        ) r
+        WHERE w.id = r.id AND r.row_num > 1
+    """)
+    op.execute("""
+        UPDATE watchlist w SET movie_id = d.keep_id
+        FROM movie_duplicate d
+        WHERE w.movie_id = d.id
+    """)
+    op.execute("DELETE FROM movie m USING movie_duplicate d WHERE m.id = d.id")
+    op.execute("DROP TABLE movie_duplicate")
+
+    # Bulk ingestion upserts against this key (ON CONFLICT)
+    op.create_index('uq_movie_identity', 'movie',
+                    ['title', sa.text('coalesce(release_year, 0)'), sa.text("coalesce(director, '')")],
+                    unique=True)
+
+
+def downgrade():
+    op.drop_index('uq_movie_identity', table_name='movie')
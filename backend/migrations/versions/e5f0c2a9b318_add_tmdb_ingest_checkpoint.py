@@ -0,0 +1,40 @@
+"""add tmdb ingest checkpoint
+
+Revision ID: e5f0c2a9b318
+Revises: d3e8a1b7f209
+Create Date: 2026-10-19 17:40:12.558031
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5f0c2a9b318'
+down_revision = 'd3e8a1b7f209'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('tmdb_ingest',
+    sa.Column('tmdb_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('movie_id', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), server_default='1', nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('ingested_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['movie_id'], ['movie.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('tmdb_id')
+    )
+    with op.batch_alter_table('tmdb_ingest', schema=None) as batch_op:
+        batch_op.create_index('ix_tmdb_ingest_movie_id', ['movie_id'], unique=False)
+        batch_op.create_index('ix_tmdb_ingest_ingested_at', ['ingested_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('tmdb_ingest', schema=None) as batch_op:
+        batch_op.drop_index('ix_tmdb_ingest_ingested_at')
+        batch_op.drop_index('ix_tmdb_ingest_movie_id')
+
+    op.drop_table('tmdb_ingest')
@@ -0,0 +1,73 @@
+"""add movie dedup key
+
+Revision ID: f1a7c3d9e624
+Revises: e5f0c2a9b318
+Create Date: 2026-10-19 18:55:07.302119
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1a7c3d9e624'
+down_revision = 'e5f0c2a9b318'
+branch_labels = None
+depends_on = None
+
+# Case-folded title without punctuation or whitespace, plus the year
+DEDUP_KEY = "lower(regexp_replace(title, '[[:punct:][:space:]]+', '', 'g')) || ':' || coalesce(release_year::text, '')"
+
+
+def upgrade():
+    with op.batch_alter_table('movie', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('dedup_key', sa.Text(), sa.Computed(DEDUP_KEY, persisted=True), nullable=True))
+
+    # Fold rows that only differed by case, punctuation or director into the lowest id
+    op.execute("""
+        CREATE TEMP TABLE movie_duplicate AS
+        SELECT id, keep_id
+        FROM (
+            SELECT id, min(id) OVER (PARTITION BY dedup_key) AS keep_id
+            FROM movie
+        ) t
+        WHERE id <> keep_id
+    """)
+    op.execute("""
+        DELETE FROM watchlist w
+        USING (
+            SELECT w2.id, row_number() OVER (
+                PARTITION BY w2.member_id, coalesce(d.keep_id, w2.movie_id)
+                ORDER BY d.keep_id IS NOT NULL, w2.id
+            ) AS row_num
+            FROM watchlist w2
+            LEFT JOIN movie_duplicate d ON d.id = w2.movie_id
+        ) r
+        WHERE w.id = r.id AND r.row_num > 1
+    """)
+    op.execute("""
+        UPDATE watchlist w SET movie_id = d.keep_id
+        FROM movie_duplicate d
+        WHERE w.movie_id = d.id
+    """)
+    op.execute("""
+        UPDATE tmdb_ingest i SET movie_id = d.keep_id
+        FROM movie_duplicate d
+        WHERE i.movie_id = d.id
+    """)
+    op.execute("DELETE FROM movie m USING movie_duplicate d WHERE m.id = d.id")
+    op.execute("DROP TABLE movie_duplicate")
+
+    # The normalized key is stricter than the old identity, so it replaces it
+    with op.batch_alter_table('movie', schema=None) as batch_op:
+        batch_op.create_index('uq_movie_dedup_key', ['dedup_key'], unique=True)
+        batch_op.drop_index('uq_movie_identity')
+
+
+def downgrade():
+    with op.batch_alter_table('movie', schema=None) as batch_op:
+        batch_op.create_index('uq_movie_identity',
+                              ['title', sa.text('coalesce(release_year, 0)'), sa.text("coalesce(director, '')")],
+                              unique=True)
+        batch_op.drop_index('uq_movie_dedup_key')
+        batch_op.drop_column('dedup_key')
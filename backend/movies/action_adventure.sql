@@ -98,4 +98,5 @@ INSERT INTO movie (title, description, release_year, runtime_minutes, director,
 ('The Fast and the Furious', 'Los Angeles police officer Brian O''Conner must decide where his loyalty really lies when he becomes enamored with the street racing world he has been sent undercover to destroy.', 2001, 106, 'Rob Cohen', 'Action', 'PG-13', 6.8),
 ('Die Another Day', 'James Bond is sent to investigate the connection between a North Korean terrorist and a diamond mogul, who is funding the development of an international space weapon.', 2002, 133, 'Lee Tamahori', 'Action', 'PG-13', 6.1),
 ('The Bourne Identity', 'A man is picked up by a fishing boat, bullet-riddled and suffering from amnesia, before racing to elude assassins and attempting to regain his memory.', 2002, 119, 'Doug Liman', 'Action', 'PG-13', 7.9),
-('xXx', 'An extreme sports athlete, Xander Cage, is recruited by the government on a special mission.', 2002, 124, 'Rob Cohen', 'Action', 'PG-13', 5.8);
\ No newline at end of file
+('xXx', 'An extreme sports athlete, Xander Cage, is recruited by the government on a special mission.', 2002, 124, 'Rob Cohen', 'Action', 'PG-13', 5.8)
+ON CONFLICT DO NOTHING;  -- duplicates across datasets (uq_movie_dedup_key)
\ No newline at end of file
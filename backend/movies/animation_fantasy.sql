@@ -102,4 +102,5 @@ INSERT INTO movie (title, description, release_year, runtime_minutes, director,
 ('Incredibles 2', 'The Incredibles family takes on a new mission which involves a change in family roles: Bob Parr must manage the house while his wife Helen fights crime.', 2018, 118, 'Brad Bird', 'Animation', 'PG', 7.6),
 ('Ralph Breaks the Internet', 'Six years after the events of Wreck-It Ralph, Ralph and Vanellope discover a wi-fi router in their arcade, leading them into a new adventure.', 2018, 112, 'Phil Johnston', 'Animation', 'PG', 7.0),
 ('Toy Story 4', 'When a new toy called Forky joins Woody and the gang, a road trip alongside old and new friends reveals how big the world can be for a toy.', 2019, 100, 'Josh Cooley', 'Animation', 'G', 7.7),
-('Frozen II', 'Anna, Elsa, Kristoff, Olaf and Sven leave Arendelle to travel to an ancient, autumn-bound forest of an enchanted land.', 2019, 103, 'Chris Buck', 'Animation', 'PG', 6.8);
\ No newline at end of file
+('Frozen II', 'Anna, Elsa, Kristoff, Olaf and Sven leave Arendelle to travel to an ancient, autumn-bound forest of an enchanted land.', 2019, 103, 'Chris Buck', 'Animation', 'PG', 6.8)
+ON CONFLICT DO NOTHING;  -- duplicates across datasets (uq_movie_dedup_key)
\ No newline at end of file
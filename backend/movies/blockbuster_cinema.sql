@@ -98,4 +98,5 @@ INSERT INTO movie (title, description, release_year, runtime_minutes, director,
 ('October Sky', 'The true story of Homer Hickam, a coal miner''s son who was inspired by the first Sputnik launch to take up rocketry against his father''s wishes.', 1999, 108, 'Joe Johnston', 'Biography', 'PG', 7.8),
 ('The World Is Not Enough', 'James Bond uncovers a nuclear plot while protecting an oil heiress from her former kidnapper, an international terrorist who can''t feel pain.', 1999, 128, 'Michael Apted', 'Action', 'PG-13', 6.4),
 ('Tarzan', 'A man raised by gorillas must decide where he really belongs when he discovers he is a human.', 1999, 88, 'Chris Buck', 'Animation', 'G', 7.3),
-('Wild Wild West', 'The two best special agents in the Wild West must save President Grant from the clutches of a diabolical, wheelchair-bound, steampunk-savvy, Confederate scientist.', 1999, 106, 'Barry Sonnenfeld', 'Action', 'PG-13', 4.9);
\ No newline at end of file
+('Wild Wild West', 'The two best special agents in the Wild West must save President Grant from the clutches of a diabolical, wheelchair-bound, steampunk-savvy, Confederate scientist.', 1999, 106, 'Barry Sonnenfeld', 'Action', 'PG-13', 4.9)
+ON CONFLICT DO NOTHING;  -- duplicates across datasets (uq_movie_dedup_key)
\ No newline at end of file
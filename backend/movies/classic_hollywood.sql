@@ -103,4 +103,5 @@ INSERT INTO movie (title, description, release_year, runtime_minutes, director,
 ('The Apprenticeship of Duddy Kravitz', 'In a quest to fulfill his grandfather''s expectations, Duddy Kravitz, a brash, restless young Jewish man will stop at nothing to buy land.', 1974, 120, 'Ted Kotcheff', 'Comedy', 'PG', 6.8),
 ('Harry and Tonto', 'When his apartment building is torn down, a retired lifelong New Yorker goes on a cross country odyssey with his beloved cat Tonto.', 1974, 115, 'Paul Mazursky', 'Comedy', 'R', 7.4),
 ('The Front Page', 'A ruthless editor tries to get his star reporter to postpone his retirement.', 1974, 105, 'Billy Wilder', 'Comedy', 'PG', 7.3),
-('Daisy Miller', 'In this comedy of manners, Frederick Winterbourne tries to figure out the bright and bubbly Daisy Miller, only to be helped and hindered by false judgments from their fellow friends.', 1974, 91, 'Peter Bogdanovich', 'Comedy', 'G', 6.1);
\ No newline at end of file
+('Daisy Miller', 'In this comedy of manners, Frederick Winterbourne tries to figure out the bright and bubbly Daisy Miller, only to be helped and hindered by false judgments from their fellow friends.', 1974, 91, 'Peter Bogdanovich', 'Comedy', 'G', 6.1)
+ON CONFLICT DO NOTHING;  -- duplicates across datasets (uq_movie_dedup_key)
\ No newline at end of file
@@ -98,4 +98,5 @@ INSERT INTO movie (title, description, release_year, runtime_minutes, director,
 ('The Lighthouse', 'Two lighthouse keepers try to maintain their sanity while living on a remote and mysterious New England island in the 1890s.', 2019, 109, 'Robert Eggers', 'Drama', 'R', 7.4),
 ('Invisible Man', 'When Cecilia''s abusive ex takes his own life and leaves her his fortune, she suspects his death was a hoax. As a series of coincidences turn lethal, Cecilia works to prove that she is being hunted.', 2020, 124, 'Leigh Whannell', 'Horror', 'R', 7.1),
 ('Saint Maud', 'A pious nurse becomes dangerously obsessed with saving the soul of her dying patient.', 2019, 84, 'Rose Glass', 'Horror', 'R', 6.7),
-('Nope', 'The residents of a lonely gulch in inland California bear witness to an uncanny and chilling discovery.', 2022, 130, 'Jordan Peele', 'Horror', 'R', 6.8);
\ No newline at end of file
+('Nope', 'The residents of a lonely gulch in inland California bear witness to an uncanny and chilling discovery.', 2022, 130, 'Jordan Peele', 'Horror', 'R', 6.8)
+ON CONFLICT DO NOTHING;  -- duplicates across datasets (uq_movie_dedup_key)
\ No newline at end of file
@@ -95,4 +95,5 @@ INSERT INTO movie (title, description, release_year, runtime_minutes, director,
 ('Past Lives', 'Nora and Hae Sung, two deeply connected childhood friends, are wrest apart after Nora''s family emigrates from South Korea. Two decades later, they are reunited.', 2023, 105, 'Celine Song', 'Drama', 'PG-13', 7.9),
 ('Fallen Leaves', 'In modern-day Helsinki, two lonely souls in search of love meet by chance in a karaoke bar. However, their path to happiness is beset by obstacles.', 2023, 81, 'Aki Kaurismäki', 'Comedy', 'PG-13', 7.4),
 ('The Promised Land', 'In 1755, the impoverished Captain Ludvig Kahlen sets out to conquer the harsh, uninhabitable Danish heath with a seemingly impossible goal: to establish a colony in the name of the King.', 2023, 127, 'Nikolaj Arcel', 'Drama', 'R', 7.8),
-('Totem', 'Seven-year-old Sol is spending the day at her grandfather''s home, for a surprise party for Sol''s father, Tonatiuh. As daylight fades, Sol comes to understand that her world is about to change.', 2023, 95, 'Lila Avilés', 'Drama', 'R', 7.2);
\ No newline at end of file
+('Totem', 'Seven-year-old Sol is spending the day at her grandfather''s home, for a surprise party for Sol''s father, Tonatiuh. As daylight fades, Sol comes to understand that her world is about to change.', 2023, 95, 'Lila Avilés', 'Drama', 'R', 7.2)
+ON CONFLICT DO NOTHING;  -- duplicates across datasets (uq_movie_dedup_key)
\ No newline at end of file
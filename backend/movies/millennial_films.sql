@@ -100,4 +100,5 @@ INSERT INTO movie (title, description, release_year, runtime_minutes, director,
 ('District 9', 'Violence ensues after an extraterrestrial race forced to live in slum-like conditions on Earth finds a kindred spirit in a government agent exposed to their biotechnology.', 2009, 112, 'Neill Blomkamp', 'Action', 'R', 7.9),
 ('Star Trek', 'The brash James T. Kirk tries to live up to his father''s legacy with Mr. Spock keeping him in check as a vengeful Romulan from the future creates black holes to destroy the Federation.', 2009, 127, 'J.J. Abrams', 'Action', 'PG-13', 7.9),
 ('Up', 'Seventy-eight year old Carl Fredricksen travels to Paradise Falls in his house equipped with balloons, inadvertently taking a young stowaway.', 2009, 96, 'Pete Docter', 'Animation', 'PG', 8.3),
-('The Hangover', 'Three buddies wake up from a bachelor party in Las Vegas, with no memory of the previous night and the bachelor missing.', 2009, 100, 'Todd Phillips', 'Comedy', 'R', 7.7);
\ No newline at end of file
+('The Hangover', 'Three buddies wake up from a bachelor party in Las Vegas, with no memory of the previous night and the bachelor missing.', 2009, 100, 'Todd Phillips', 'Comedy', 'R', 7.7)
+ON CONFLICT DO NOTHING;  -- duplicates across datasets (uq_movie_dedup_key)
\ No newline at end of file
@@ -95,4 +95,5 @@ INSERT INTO movie (title, description, release_year, runtime_minutes, director,
 ('Crimes and Misdemeanors', 'An ophthalmologist''s mistress threatens to reveal their affair to his wife while a married documentary filmmaker is infatuated with another woman.', 1989, 104, 'Woody Allen', 'Comedy', 'PG-13', 7.8),
 ('The Fabulous Baker Boys', 'The lives of two struggling musicians, who happen to be brothers, take a turn for the better when they team up with a young woman who begins performing with them.', 1989, 114, 'Steve Kloves', 'Comedy', 'R', 6.9),
 ('Steel Magnolias', 'A young beautician, newly arrived in a small Louisiana town, finds work at the local salon, where a small group of women share a close bond of friendship.', 1989, 117, 'Herbert Ross', 'Comedy', 'PG', 7.3),
-('The Abyss', 'A civilian diving team is enlisted to search for a lost nuclear submarine and faces danger while encountering an alien aquatic species.', 1989, 140, 'James Cameron', 'Adventure', 'PG-13', 7.5);
\ No newline at end of file
+('The Abyss', 'A civilian diving team is enlisted to search for a lost nuclear submarine and faces danger while encountering an alien aquatic species.', 1989, 140, 'James Cameron', 'Adventure', 'PG-13', 7.5)
+ON CONFLICT DO NOTHING;  -- duplicates across datasets (uq_movie_dedup_key)
\ No newline at end of file
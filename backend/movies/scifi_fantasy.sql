@@ -94,4 +94,5 @@ INSERT INTO movie (title, description, release_year, runtime_minutes, director,
 ('The Mummy', 'At an archaeological dig in the ancient city of Hamunaptra, an American serving in the French Foreign Legion accidentally awakens a mummy.', 1999, 124, 'Stephen Sommers', 'Action', 'PG-13', 7.1),
 ('X-Men', 'In a world where mutants exist and are discriminated against, two groups form for an inevitable clash: the supremacist Brotherhood, and the pacifist X-Men.', 2000, 104, 'Bryan Singer', 'Action', 'PG-13', 7.3),
 ('Unbreakable', 'A man learns something extraordinary about himself after a devastating accident.', 2000, 106, 'M. Night Shyamalan', 'Drama', 'PG-13', 7.3),
-('Donnie Darko', 'After narrowly escaping a bizarre accident, a troubled teenager is plagued by visions of a man in a large rabbit suit who manipulates him to commit a series of crimes.', 2001, 113, 'Richard Kelly', 'Drama', 'R', 8.0);
\ No newline at end of file
+('Donnie Darko', 'After narrowly escaping a bizarre accident, a troubled teenager is plagued by visions of a man in a large rabbit suit who manipulates him to commit a series of crimes.', 2001, 113, 'Richard Kelly', 'Drama', 'R', 8.0)
+ON CONFLICT DO NOTHING;  -- duplicates across datasets (uq_movie_dedup_key)
\ No newline at end of file
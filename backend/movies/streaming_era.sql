@@ -101,4 +101,5 @@ INSERT INTO movie (title, description, release_year, runtime_minutes, director,
 ('Marriage Story', 'Noah Baumbach''s incisive and compassionate look at a marriage breaking up and a family staying together.', 2019, 137, 'Noah Baumbach', 'Comedy', 'R', 7.9),
 ('Little Women', 'Jo March reflects back and forth on her life, telling the beloved story of the March sisters.', 2019, 135, 'Greta Gerwig', 'Drama', 'PG', 7.8),
 ('Avengers: Endgame', 'After the devastating events of Avengers: Infinity War, the universe is in ruins. With the help of remaining allies, the Avengers assemble once more to reverse Thanos'' actions.', 2019, 181, 'Anthony Russo', 'Action', 'PG-13', 8.4),
-('Toy Story 4', 'When a new toy called Forky joins Woody and the gang, a road trip alongside old and new friends reveals how big the world can be for a toy.', 2019, 100, 'Josh Cooley', 'Animation', 'G', 7.7);
\ No newline at end of file
+('Toy Story 4', 'When a new toy called Forky joins Woody and the gang, a road trip alongside old and new friends reveals how big the world can be for a toy.', 2019, 100, 'Josh Cooley', 'Animation', 'G', 7.7)
+ON CONFLICT DO NOTHING;  -- duplicates across datasets (uq_movie_dedup_key)
\ No newline at end of file
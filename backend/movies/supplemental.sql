@@ -27,4 +27,5 @@ INSERT INTO movie (title, description, release_year, runtime_minutes, director,
 ('Everything Everywhere All at Once', 'An aging Chinese immigrant is swept up in an insane adventure, where she alone can save what''s important to her by connecting with the lives she could have led.', 2022, 139, 'Daniel Kwan', 'Action', 'R', 7.8),
 ('Top Gun: Maverick', 'After thirty years, Maverick is still pushing the envelope as a top naval aviator, but must confront ghosts of his past when he leads TOP GUN''s elite graduates on a mission.', 2022, 130, 'Joseph Kosinski', 'Action', 'PG-13', 8.3),
 ('The Fabelmans', 'Growing up in post-World War II era Arizona, a young man named Sammy Fabelman discovers a shattering family secret and explores how the power of films can help him see the truth.', 2022, 151, 'Steven Spielberg', 'Drama', 'PG-13', 7.5),
-('Oppenheimer', 'The story of American scientist J. Robert Oppenheimer and his role in the development of the atomic bomb.', 2023, 180, 'Christopher Nolan', 'Biography', 'R', 8.3);
\ No newline at end of file
+('Oppenheimer', 'The story of American scientist J. Robert Oppenheimer and his role in the development of the atomic bomb.', 2023, 180, 'Christopher Nolan', 'Biography', 'R', 8.3)
+ON CONFLICT DO NOTHING;  -- duplicates across datasets (uq_movie_dedup_key)
\ No newline at end of file
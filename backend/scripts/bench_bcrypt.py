@@ -0,0 +1,69 @@
+"""
+Measure login hashing latency and throughput for candidate bcrypt costs.
+
+Runs password verification through the same bounded pool the app uses
+(utils/hashing.py, sized by BCRYPT_POOL_SIZE / BCRYPT_MAX_WAITING) with N
+concurrent callers, and reports percentiles against a latency SLO so the
+work factor (BCRYPT_ROUNDS) can be tuned.
+
+Usage:
+    python scripts/bench_bcrypt.py --rounds 10 11 12 13 --concurrency 8 --logins 64 --slo-ms 250
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.hashing import HashingBusyError, check_password, hash_password, HashingStats  # noqa: E402
+import utils.hashing as hashing  # noqa: E402
+
+PASSWORD = 'correct horse battery staple'
+
+
+def run(rounds, concurrency, logins):
+    """Verify `logins` passwords with `concurrency` callers; return a stats snapshot"""
+    hashing.stats = HashingStats()
+    password_hash = hash_password(PASSWORD, rounds=rounds)
+    hashing.stats = HashingStats()
+
+    def login(_):
+        try:
+            return check_password(PASSWORD, password_hash)
+        except HashingBusyError:
+            return None
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as callers:
+        results = list(callers.map(login, range(logins)))
+    elapsed = time.perf_counter() - started
+
+    snapshot = hashing.stats.snapshot()
+    snapshot['wall_per_sec'] = round(sum(1 for r in results if r) / elapsed, 2)
+    return snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser(description='bcrypt cost vs. login latency/throughput')
+    parser.add_argument('--rounds', type=int, nargs='+', default=[10, 11, 12, 13])
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--logins', type=int, default=64)
+    parser.add_argument('--slo-ms', type=float, default=250.0, help='p95 login latency target')
+    args = parser.parse_args()
+
+    print(f"pool={hashing.Config.BCRYPT_POOL_SIZE} waiting={hashing.Config.BCRYPT_MAX_WAITING} "
+          f"concurrency={args.concurrency} logins={args.logins}")
+    print("-" * 72)
+    print(f"{'rounds':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'logins/s':>9} {'rejected':>9}  SLO")
+    for rounds in args.rounds:
+        snap = run(rounds, args.concurrency, args.logins)
+        latency = snap.get('verify_latency_ms', {'p50': 0, 'p95': 0, 'p99': 0})
+        verdict = '✓' if latency['p95'] <= args.slo_ms else '✗'
+        print(f"{rounds:>6} {latency['p50']:>9} {latency['p95']:>9} {latency['p99']:>9} "
+              f"{snap['wall_per_sec']:>9} {snap['rejected']:>9}  {verdict}")
+
+
+if __name__ == '__main__':
+    main()
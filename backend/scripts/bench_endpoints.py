@@ -0,0 +1,363 @@
+"""
+Latency and query-count benchmark for the hot endpoints.
+
+Builds a scratch database (schema.sql + migrations) filled by
+generate_data.py at a chosen scale, then calls each endpoint repeatedly through the Flask test client
+and through a real threaded HTTP server, with the in-process Claude stub
+standing in for the API. Reports p50/p90/p99 latency and SQL statements per
+request, and can save the results as a baseline or fail when a run
+regresses against one.
+
+Usage:
+    python scripts/bench_endpoints.py --movies 1000000 --members 100000 --watchlist 100 --chat 60 --keep
+    python scripts/bench_endpoints.py --reuse --save-baseline bench-baseline.json
+    python scripts/bench_endpoints.py --reuse --baseline bench-baseline.json --tolerance 0.25
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+import psycopg2
+from dotenv import load_dotenv
+
+from generate_data import generate
+
+load_dotenv()
+
+BENCH_DB = os.getenv('BENCH_DB_NAME', 'movies_bench')
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+SCHEMA_PATH = os.path.join(BACKEND_DIR, 'schema.sql')
+MIGRATIONS_DIR = os.path.join(BACKEND_DIR, 'migrations')
+
+# The app reads its database from the environment at import time
+os.environ['DB_NAME'] = BENCH_DB
+os.environ.setdefault('CLAUDE_BACKEND', 'stub')
+# A route over its @query_budget or repeating a statement (N+1) fails its requests
+os.environ.setdefault('QUERY_GUARD', 'raise')
+sys.path.insert(0, os.path.join(BACKEND_DIR, 'src'))
+
+BENCH_EMAIL = 'bench-adult@example.com'
+
+# (name, method, path, authenticated, json body); chat_message runs last
+# because it grows the member's history
+ENDPOINTS = [
+    ('movies', 'GET', '/movies', False, None),
+    ('movies_member', 'GET', '/movies?page=3', True, None),
+    ('movies_genre', 'GET', '/movies?genre=Drama', True, None),
+    ('movies_search', 'GET', '/movies?search=Midnight%20Harbor', True, None),
+    ('movie_detail', 'GET', '/movies/{movie_id}', True, None),
+    ('watchlist', 'GET', '/watchlist', True, None),
+    ('watchlist_overview', 'GET', '/watchlist/overview', True, None),
+    ('chat_history', 'GET', '/chat/history', True, None),
+    ('chat_message', 'POST', '/chat/message', True, {'message': 'Something like Alien, but funnier'}),
+]
+
+def admin_connect():
+    conn = psycopg2.connect(
+        host=os.getenv('DB_HOST', 'localhost'),
+        database=os.getenv('BENCH_ADMIN_DB', 'postgres'),
+        user=os.getenv('DB_USER', os.getenv('USER')),
+        password=os.getenv('DB_PASSWORD', ''),
+        port=os.getenv('DB_PORT', '5432'),
+    )
+    conn.autocommit = True
+    return conn
+
+
+def database_exists():
+    conn = admin_connect()
+    with conn.cursor() as cursor:
+        cursor.execute('SELECT 1 FROM pg_database WHERE datname = %s', (BENCH_DB,))
+        exists = cursor.fetchone() is not None
+    conn.close()
+    return exists
+
+
+def recreate_database():
+    conn = admin_connect()
+    with conn.cursor() as cursor:
+        cursor.execute(f'DROP DATABASE IF EXISTS {BENCH_DB}')
+        cursor.execute(f'CREATE DATABASE {BENCH_DB}')
+    conn.close()
+
+
+def drop_database():
+    conn = admin_connect()
+    with conn.cursor() as cursor:
+        cursor.execute(f'DROP DATABASE IF EXISTS {BENCH_DB}')
+    conn.close()
+
+
+def seed(args):
+    """Load synthetic data at the requested scale (see generate_data.py)"""
+    started = time.perf_counter()
+    result = generate(args.movies, args.members, args.watchlist, args.chat, seed=args.seed)
+    print(f"Seeded {args.movies} movies, {args.members} members, {result['watchlist'][0]} watchlist rows "
+          f"and {result['chat_message'][0]} chat messages in {time.perf_counter() - started:.1f}s")
+
+
+def bench_member(engine):
+    """
+    The member requests run as: an adult copy of the seeded member with
+    the longest chat history among those with a watchlist, recreated on
+    each run
+    """
+    conn = engine.raw_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT c.member_id FROM chat_message c JOIN member m ON m.id = c.member_id
+            WHERE m.email <> %s AND EXISTS (SELECT 1 FROM watchlist w WHERE w.member_id = c.member_id)
+            GROUP BY c.member_id ORDER BY count(*) DESC, c.member_id LIMIT 1
+        """, (BENCH_EMAIL,))
+        template_id = cursor.fetchone()[0]
+        cursor.execute('DELETE FROM member WHERE email = %s', (BENCH_EMAIL,))
+        cursor.execute("""
+            INSERT INTO member (email, password_hash, first_name, last_name, date_of_birth, email_verified, agent_usage)
+            VALUES (%s, 'x', 'Bench', 'Member', %s, true, 0)
+            RETURNING id
+        """, (BENCH_EMAIL, date(1985, 6, 15)))
+        member_id = cursor.fetchone()[0]
+        cursor.execute("""
+            INSERT INTO watchlist (member_id, movie_id, status, added_at)
+            SELECT %s, movie_id, status, added_at FROM watchlist WHERE member_id = %s
+        """, (member_id, template_id))
+        cursor.execute("""
+            INSERT INTO chat_message (member_id, role, content, active, created_at, recommended_movie_ids)
+            SELECT %s, role, content, active, created_at, recommended_movie_ids FROM chat_message WHERE member_id = %s
+        """, (member_id, template_id))
+        cursor.execute('SELECT min(id) FROM movie')
+        movie_id = cursor.fetchone()[0]
+        conn.commit()
+        return member_id, movie_id
+    finally:
+        conn.close()
+
+
+def make_token(app, member_id, age):
+    import jwt
+    from auth import AUTHENTICATION_COOKIE, RATING_CLAIM
+    from utils.movies import get_rating_tier
+    token = jwt.encode({
+        'member_id': member_id,
+        RATING_CLAIM: get_rating_tier(age),
+        'exp': datetime.utcnow() + timedelta(hours=2),
+    }, app.config['SECRET_KEY'], algorithm='HS256')
+    return AUTHENTICATION_COOKIE, token
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+
+class QueryCounter:
+    """Counts statements sent to the database between reset() calls"""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+        self.count = 0
+        event.listen(engine, 'before_cursor_execute', self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def reset(self):
+        self.count = 0
+
+
+def measure(name, send, counter, warmup, iterations):
+    """
+    Time `send()` (which returns an HTTP status) iterations times
+
+    Returns:
+        dict: Latency percentiles in ms, median queries per request and errors
+    """
+    for _ in range(warmup):
+        send()
+    latencies, queries, errors = [], [], 0
+    for _ in range(iterations):
+        counter.reset()
+        started = time.perf_counter()
+        status = send()
+        latencies.append((time.perf_counter() - started) * 1000)
+        queries.append(counter.count)
+        if status >= 400:
+            errors += 1
+    return {
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p90_ms': round(percentile(latencies, 90), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+        'mean_ms': round(statistics.mean(latencies), 2),
+        'queries': statistics.median_low(queries),
+        'max_queries': max(queries),
+        'errors': errors,
+    }
+
+
+def run_client(app, member_id, movie_id, counter, args):
+    client = app.test_client()
+    name, token = make_token(app, member_id, 40)
+    results = {}
+    for endpoint, method, path, authenticated, body in ENDPOINTS:
+        path = path.format(movie_id=movie_id)
+        if authenticated:
+            client.set_cookie('localhost', name, token)
+        else:
+            client.delete_cookie('localhost', name)
+        send = lambda: client.open(path, method=method, json=body).status_code
+        results[endpoint] = measure(endpoint, send, counter, args.warmup, args.iterations)
+    return results
+
+
+def run_server(app, member_id, movie_id, counter, args):
+    import requests
+    from werkzeug.serving import make_server
+
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    name, token = make_token(app, member_id, 40)
+    results = {}
+    try:
+        with requests.Session() as session:
+            for endpoint, method, path, authenticated, body in ENDPOINTS:
+                url = base_url + path.format(movie_id=movie_id)
+                cookies = {name: token} if authenticated else None
+                send = lambda: session.request(method, url, json=body, cookies=cookies).status_code
+                results[endpoint] = measure(endpoint, send, counter, args.warmup, args.iterations)
+    finally:
+        server.shutdown()
+    return results
+
+
+def print_results(mode, results):
+    print(f"\n{mode}")
+    print(f"  {'endpoint':<20} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'queries':>8} {'errors':>7}")
+    for endpoint, r in results.items():
+        print(f"  {endpoint:<20} {r['p50_ms']:>9.1f} {r['p90_ms']:>9.1f} {r['p99_ms']:>9.1f} "
+              f"{r['queries']:>8} {r['errors']:>7}")
+
+
+def compare(results, baseline, tolerance, floor_ms):
+    """
+    Regressions against a saved baseline: slower p90 beyond tolerance, or more queries
+
+    Runs at a different scale (or seed) than the baseline aren't comparable
+    and fail outright.
+    """
+    if baseline.get('scale') != results['scale']:
+        return [f"baseline scale {baseline.get('scale')} differs from this run's {results['scale']}; "
+                "rerun at the baseline's scale or save a new baseline"]
+    regressions = []
+    for mode, endpoints in results['modes'].items():
+        for endpoint, current in endpoints.items():
+            before = baseline.get('modes', {}).get(mode, {}).get(endpoint)
+            if not before:
+                continue
+            allowed = before['p90_ms'] * (1 + tolerance) + floor_ms
+            if current['p90_ms'] > allowed:
+                regressions.append(f"{mode} {endpoint}: p90 {current['p90_ms']:.1f} ms > "
+                                   f"{allowed:.1f} ms (baseline {before['p90_ms']:.1f} ms)")
+            if current['queries'] > before['queries']:
+                regressions.append(f"{mode} {endpoint}: {current['queries']} queries > baseline {before['queries']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark hot endpoints against a seeded database')
+    parser.add_argument('--movies', type=int, default=100000)
+    parser.add_argument('--members', type=int, default=5000)
+    parser.add_argument('--watchlist', type=int, default=40, help='Mean watchlist size (of members with one)')
+    parser.add_argument('--chat', type=int, default=40, help='Mean chat messages (of members with a history)')
+    parser.add_argument('--seed', type=int, default=42, help='Data generator seed')
+    parser.add_argument('--mode', choices=['client', 'server', 'both'], default='both')
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--reuse', action='store_true', help='Benchmark the existing scratch database without reseeding')
+    parser.add_argument('--keep', action='store_true', help='Keep the scratch database afterwards (for --reuse)')
+    parser.add_argument('--baseline', help='Fail on regressions against this results file')
+    parser.add_argument('--save-baseline', help='Write results to this file')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed p90 slowdown vs. baseline (0.25 = 25%%)')
+    parser.add_argument('--floor-ms', type=float, default=2.0, help='Absolute p90 slack, absorbs timer noise on fast routes')
+    args = parser.parse_args()
+
+    reuse = args.reuse and database_exists()
+    if not reuse:
+        recreate_database()
+    try:
+        results = run(args, reuse)
+    finally:
+        if not (args.keep or args.reuse):
+            drop_database()
+
+    for mode, endpoints in results['modes'].items():
+        print_results(mode, endpoints)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✓ Saved baseline to {args.save_baseline}")
+
+    failures = [f"{mode} {endpoint}: {r['errors']} errors"
+                for mode, endpoints in results['modes'].items()
+                for endpoint, r in endpoints.items() if r['errors']]
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures += compare(results, json.load(f), args.tolerance, args.floor_ms)
+
+    print("\n" + "=" * 72)
+    if failures:
+        for failure in failures:
+            print(f"✗ {failure}")
+        sys.exit(1)
+    print("✓ Benchmark complete" + (" - no regressions against baseline" if args.baseline else ""))
+
+
+def run(args, reuse):
+    from flask_migrate import upgrade
+    from app import create_app
+    from config import Config
+    from database import db
+
+    class BenchConfig(Config):
+        # Benchmarks post many chat messages; keep the member under the spend cap
+        AGENT_USAGE_LIMIT = float('inf')
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        engine = db.engine
+        if not reuse:
+            with engine.begin() as conn:
+                with open(SCHEMA_PATH) as f:
+                    conn.exec_driver_sql(f.read())
+            upgrade(directory=MIGRATIONS_DIR)
+            seed(args)
+        member_id, movie_id = bench_member(engine)
+        counter = QueryCounter(engine)
+        db.session.remove()
+
+    results = {
+        'scale': {k: getattr(args, k) for k in ('movies', 'members', 'watchlist', 'chat', 'seed')},
+        'recorded_at': datetime.utcnow().isoformat(),
+        'modes': {},
+    }
+    if args.mode in ('client', 'both'):
+        results['modes']['test_client'] = run_client(app, member_id, movie_id, counter, args)
+    if args.mode in ('server', 'both'):
+        results['modes']['http_server'] = run_server(app, member_id, movie_id, counter, args)
+
+    with app.app_context():
+        db.engine.dispose()
+    return results
+
+
+if __name__ == '__main__':
+    main()
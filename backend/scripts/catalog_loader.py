@@ -0,0 +1,162 @@
+"""
+Bulk loader for catalog ingestion.
+
+Fetched movies are COPYed into a temporary staging table and merged into
+`movie` with one INSERT ... ON CONFLICT against the normalized catalog key
+(movie.dedup_key, unique via uq_movie_dedup_key), all in a single
+transaction: one round trip for the data, one for the merge, one commit.
+Titles differing only in case, punctuation or spacing merge into one row.
+
+Existing rows are only updated when a field actually changes, and missing
+values never overwrite known ones. Movies carrying a `tmdb_id` are recorded
+in the tmdb_ingest checkpoint in the same transaction, so a crash never
+leaves the checkpoint ahead of (or behind) the catalog.
+"""
+import csv
+import io
+
+from psycopg2.extras import execute_values
+
+STAGE_COLUMNS = (
+    'title', 'description', 'director', 'release_year', 'genre',
+    'rating', 'imdb_rating', 'poster_url', 'runtime_minutes',
+)
+COPY_COLUMNS = ('tmdb_id',) + STAGE_COLUMNS
+UPDATE_COLUMNS = ('description', 'genre', 'rating', 'imdb_rating', 'poster_url', 'runtime_minutes')
+
+# Must match the movie.dedup_key generated column (models/movie.py DEDUP_KEY)
+DEDUP_KEY = "lower(regexp_replace(title, '[[:punct:][:space:]]+', '', 'g')) || ':' || coalesce(release_year::text, '')"
+
+CREATE_STAGE = f"""
+    CREATE TEMP TABLE movie_stage (
+        seq SERIAL,
+        tmdb_id INTEGER,
+        title VARCHAR(200) NOT NULL,
+        description TEXT,
+        director VARCHAR(100),
+        release_year INTEGER,
+        genre VARCHAR(50),
+        rating VARCHAR(10),
+        imdb_rating DECIMAL(3,1),
+        poster_url VARCHAR(500),
+        runtime_minutes INTEGER,
+        dedup_key TEXT GENERATED ALWAYS AS ({DEDUP_KEY}) STORED
+    ) ON COMMIT DROP
+"""
+
+MERGE = f"""
+    WITH merged AS (
+        INSERT INTO movie ({', '.join(STAGE_COLUMNS)})
+        SELECT DISTINCT ON (dedup_key) {', '.join(STAGE_COLUMNS)}
+        FROM movie_stage
+        ORDER BY dedup_key, seq DESC  -- last copy in the batch wins
+        ON CONFLICT (dedup_key) DO UPDATE SET
+            {', '.join(f'{c} = coalesce(EXCLUDED.{c}, movie.{c})' for c in UPDATE_COLUMNS)}
+        WHERE ({', '.join(f'movie.{c}' for c in UPDATE_COLUMNS)})
+            IS DISTINCT FROM
+            ({', '.join(f'coalesce(EXCLUDED.{c}, movie.{c})' for c in UPDATE_COLUMNS)})
+        RETURNING (xmax = 0) AS inserted
+    )
+    SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted)
+    FROM merged
+"""
+
+RECORD_LOADED = """
+    INSERT INTO tmdb_ingest (tmdb_id, movie_id, status, attempts, error, ingested_at)
+    SELECT DISTINCT ON (s.tmdb_id) s.tmdb_id, m.id, 'loaded', 1, NULL, now()
+    FROM movie_stage s
+    JOIN movie m ON m.dedup_key = s.dedup_key
+    WHERE s.tmdb_id IS NOT NULL
+    ORDER BY s.tmdb_id, s.seq DESC
+    ON CONFLICT (tmdb_id) DO UPDATE SET
+        movie_id = EXCLUDED.movie_id,
+        status = EXCLUDED.status,
+        attempts = tmdb_ingest.attempts + 1,
+        error = NULL,
+        ingested_at = EXCLUDED.ingested_at
+"""
+
+RECORD_FAILED = """
+    INSERT INTO tmdb_ingest (tmdb_id, status, error)
+    VALUES %s
+    ON CONFLICT (tmdb_id) DO UPDATE SET
+        attempts = tmdb_ingest.attempts + 1,
+        error = EXCLUDED.error,
+        ingested_at = now()
+    WHERE tmdb_ingest.status = 'failed'
+"""
+
+
+def _copy_buffer(movies):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for movie in movies:
+        # Empty CSV fields load as NULL
+        writer.writerow(['' if movie.get(c) is None else movie[c] for c in COPY_COLUMNS])
+    buffer.seek(0)
+    return buffer
+
+
+def load_movies(conn, movies):
+    """
+    Stage and merge movies into the catalog in one transaction
+
+    Args:
+        conn: psycopg2 connection (committed on success, rolled back on error)
+        movies: Iterable of movie dicts with STAGE_COLUMNS keys
+
+    Returns:
+        dict: {'inserted', 'updated', 'skipped'} counts; skipped covers
+              unchanged existing rows, duplicates within the batch and
+              rows without a title
+    """
+    movies = list(movies)
+    loadable = [m for m in movies if m.get('title')]
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(CREATE_STAGE)
+            cursor.copy_expert(
+                f"COPY movie_stage ({', '.join(COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                _copy_buffer(loadable),
+            )
+            cursor.execute(MERGE)
+            inserted, updated = cursor.fetchone()
+            cursor.execute(RECORD_LOADED)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    return {
+        'inserted': inserted,
+        'updated': updated,
+        'skipped': len(movies) - inserted - updated,
+    }
+
+
+def record_failures(conn, failures):
+    """
+    Record TMDB ids whose details could not be fetched
+
+    Failed ids are retried on the next run; an id that already loaded is
+    never demoted to failed.
+
+    Args:
+        conn: psycopg2 connection (committed)
+        failures: Dict of tmdb_id -> error message
+    """
+    if not failures:
+        return
+    with conn.cursor() as cursor:
+        execute_values(cursor, RECORD_FAILED, [(tmdb_id, 'failed', error) for tmdb_id, error in failures.items()])
+    conn.commit()
+
+
+def loaded_tmdb_ids(conn, tmdb_ids):
+    """Subset of tmdb_ids already loaded by an earlier run"""
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT tmdb_id FROM tmdb_ingest WHERE status = 'loaded' AND tmdb_id = ANY(%s)",
+            (list(tmdb_ids),)
+        )
+        return {row[0] for row in cursor.fetchall()}
@@ -0,0 +1,328 @@
+"""
+EXPLAIN-based regression check for the hot route queries.
+
+Builds a scratch database (schema.sql + migrations), seeds it with
+synthetic rows, calls each hot GET route through the Flask test client while
+capturing every SELECT it issues, then EXPLAINs those statements. Exits
+non-zero when a statement falls back to a sequential scan on a hot table
+(unless the route explicitly allows it) or its estimated cost exceeds the
+route's budget.
+
+Usage:
+    python scripts/explain_check.py [--movies 50000] [--members 2000] [--report] [--keep]
+"""
+import argparse
+import os
+import sys
+from datetime import date, datetime, timedelta
+
+import psycopg2
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SCRATCH_DB = os.getenv('EXPLAIN_DB_NAME', 'movies_explain')
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+SCHEMA_PATH = os.path.join(BACKEND_DIR, 'schema.sql')
+MIGRATIONS_DIR = os.path.join(BACKEND_DIR, 'migrations')
+
+# The app reads its database from the environment at import time
+os.environ['DB_NAME'] = SCRATCH_DB
+os.environ.setdefault('CLAUDE_BACKEND', 'stub')
+sys.path.insert(0, os.path.join(BACKEND_DIR, 'src'))
+
+HOT_TABLES = {'movie', 'member', 'watchlist', 'chat_message'}
+AGES = {'adult': 40, 'minor': 15}  # of the seeded members
+
+# (path, member, max total cost, tables allowed to be seq scanned)
+# Budgets are planner cost units at the default seed size; scale them with
+# --cost-scale when seeding a different catalog size.
+ROUTES = [
+    # Anonymous first page also counts the whole catalog for pagination
+    ('/movies', None, 5000, {'movie'}),
+    ('/movies?genre=Drama', 'adult', 3000, set()),
+    ('/movies?search=Seed%20Movie%201234', 'minor', 3000, set()),
+    ('/movies/{movie_id}', 'adult', 100, set()),
+    # DISTINCT genre may hash the catalog when the visibility map is cold
+    ('/movies/genres', None, 5000, {'movie'}),
+    ('/watchlist', 'adult', 500, set()),
+    ('/watchlist?status=watched', 'adult', 500, set()),
+    ('/watchlist/overview', 'adult', 500, set()),
+    # Fresh picks sample ORDER BY random() across the allowed catalog by design
+    ('/watchlist/overview', 'minor', 10000, {'movie'}),
+    ('/chat/history', 'adult', 500, set()),
+]
+
+GENRES = [
+    'Action', 'Adventure', 'Animation', 'Comedy', 'Crime', 'Documentary', 'Drama',
+    'Family', 'Fantasy', 'History', 'Horror', 'Music', 'Mystery', 'Romance',
+    'Science Fiction', 'Thriller', 'War', 'Western', 'Biography', 'Sport',
+]
+
+SEED_SQL = """
+INSERT INTO movie (title, director, release_year, genre, description, runtime_minutes, rating, imdb_rating)
+SELECT 'Seed Movie ' || g,
+       'Director ' || (g %% 500),
+       1920 + (g %% 105),
+       (%(genres)s::text[])[1 + g %% %(genre_count)s],
+       'Synthetic movie for query plan checks',
+       80 + g %% 100,
+       (ARRAY['G', 'PG', 'PG-13', 'R', 'NC-17', 'Unrated'])[1 + g %% 6],
+       5 + (g %% 50) / 10.0
+FROM generate_series(1, %(movies)s) g;
+
+INSERT INTO member (email, password_hash, first_name, last_name, date_of_birth, email_verified, agent_usage)
+SELECT 'seed' || g || '@example.com', 'x', 'Seed', 'Member', date '1960-01-01' + (g %% 20000), true, 0
+FROM generate_series(1, %(members)s) g;
+
+INSERT INTO watchlist (member_id, movie_id, status, added_at)
+SELECT m.id,
+       1 + ((m.id * 7919 + k * 104729) %% %(movies)s),
+       (CASE WHEN k %% 3 = 0 THEN 'watched' ELSE 'queued' END)::watchliststatus,
+       now() - k * interval '1 day'
+FROM member m, generate_series(1, %(watchlist)s) k
+ON CONFLICT DO NOTHING;
+
+INSERT INTO chat_message (member_id, role, content, active, created_at)
+SELECT m.id,
+       CASE WHEN k %% 2 = 0 THEN 'assistant' ELSE 'user' END,
+       'Seed message ' || k,
+       k > %(chat)s - 4,
+       now() - (%(chat)s - k) * interval '1 minute'
+FROM member m, generate_series(1, %(chat)s) k;
+"""
+
+
+def admin_connect():
+    conn = psycopg2.connect(
+        host=os.getenv('DB_HOST', 'localhost'),
+        database=os.getenv('EXPLAIN_ADMIN_DB', 'postgres'),
+        user=os.getenv('DB_USER', os.getenv('USER')),
+        password=os.getenv('DB_PASSWORD', ''),
+        port=os.getenv('DB_PORT', '5432'),
+    )
+    conn.autocommit = True
+    return conn
+
+
+def recreate_database():
+    conn = admin_connect()
+    with conn.cursor() as cursor:
+        cursor.execute(f'DROP DATABASE IF EXISTS {SCRATCH_DB}')
+        cursor.execute(f'CREATE DATABASE {SCRATCH_DB}')
+    conn.close()
+
+
+def drop_database():
+    conn = admin_connect()
+    with conn.cursor() as cursor:
+        cursor.execute(f'DROP DATABASE IF EXISTS {SCRATCH_DB}')
+    conn.close()
+
+
+def create_member(cursor, email, date_of_birth):
+    cursor.execute("""
+        INSERT INTO member (email, password_hash, first_name, last_name, date_of_birth, email_verified, agent_usage)
+        VALUES (%s, 'x', 'Explain', 'Check', %s, true, 0)
+        RETURNING id
+    """, (email, date_of_birth))
+    return cursor.fetchone()[0]
+
+
+def seed(engine, args):
+    """Load schema-compatible synthetic rows and refresh planner statistics"""
+    conn = engine.raw_connection()
+    try:
+        cursor = conn.cursor()
+        today = date.today()
+        adult_id = create_member(cursor, 'explain-adult@example.com', date(1985, 6, 15))
+        cursor.execute(SEED_SQL, {
+            'genres': GENRES,
+            'genre_count': len(GENRES),
+            'movies': args.movies,
+            'members': args.members,
+            'watchlist': args.watchlist,
+            'chat': args.chat,
+        })
+        # Created after the watchlist seed so the minor has an empty watchlist
+        minor_id = create_member(cursor, 'explain-minor@example.com', today.replace(year=today.year - 15, day=1))
+        conn.commit()
+
+        conn.set_session(autocommit=True)  # the pool proxy only forwards attribute reads
+        cursor.execute('VACUUM ANALYZE')
+        cursor.execute('SELECT min(id) FROM movie')
+        movie_id = cursor.fetchone()[0]
+        return {'adult': adult_id, 'minor': minor_id}, movie_id
+    finally:
+        conn.close()
+
+
+def make_token(app, member_id, date_of_birth_age):
+    import jwt
+    from auth import AUTHENTICATION_COOKIE, RATING_CLAIM
+    from utils.movies import get_rating_tier
+    token = jwt.encode({
+        'member_id': member_id,
+        RATING_CLAIM: get_rating_tier(date_of_birth_age),
+        'exp': datetime.utcnow() + timedelta(minutes=30),
+    }, app.config['SECRET_KEY'], algorithm='HS256')
+    return AUTHENTICATION_COOKIE, token
+
+
+def plan_nodes(plan):
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from plan_nodes(child)
+
+
+def explain(engine, statement, parameters):
+    conn = engine.raw_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute('EXPLAIN (FORMAT JSON) ' + statement, parameters)
+        return cursor.fetchone()[0][0]['Plan']
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+def plan_problems(plan, max_cost, seq_scan_ok=()):
+    """Seq scans of hot tables not in seq_scan_ok, and a total cost over max_cost"""
+    seq_scans = sorted({
+        node.get('Relation Name') for node in plan_nodes(plan)
+        if node['Node Type'] == 'Seq Scan' and node.get('Relation Name') in HOT_TABLES
+    } - set(seq_scan_ok))
+
+    problems = []
+    if seq_scans:
+        problems.append(f"seq scan on {', '.join(seq_scans)}")
+    if plan['Total Cost'] > max_cost:
+        problems.append(f"cost {plan['Total Cost']:.0f} > budget {max_cost:.0f}")
+    return problems
+
+
+def prepare(app, args):
+    """
+    Create the schema in the (empty) scratch database and seed it
+
+    Returns:
+        tuple: (members, movie_id) as returned by seed()
+    """
+    from flask_migrate import upgrade
+    from database import db
+
+    with app.app_context():
+        with db.engine.begin() as conn:
+            with open(SCHEMA_PATH) as f:
+                conn.exec_driver_sql(f.read())
+        upgrade(directory=MIGRATIONS_DIR)
+        return seed(db.engine, args)
+
+
+def capture_selects(app):
+    """List that fills with the (statement, parameters) of every SELECT the app runs"""
+    from sqlalchemy import event
+    from database import db
+
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            captured.append((statement, parameters))
+
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', capture)
+    return captured
+
+
+def call_route(client, path, who, members):
+    """GET a route as the seeded 'adult' or 'minor' member, or anonymously (who=None)"""
+    client.delete_cookie('localhost', 'auth_token')
+    if who:
+        name, token = make_token(client.application, members[who], AGES[who])
+        client.set_cookie('localhost', name, token)
+    return client.get(path)
+
+
+def route_plans(app, captured, path, who, members):
+    """
+    Call a route and EXPLAIN the SELECTs it ran
+
+    Returns:
+        tuple: (response, [(statement, plan), ...])
+    """
+    from database import db
+
+    captured.clear()
+    # Each request gets its own app context (and session), as in production
+    response = call_route(app.test_client(), path, who, members)
+    with app.app_context():
+        plans = [(statement, explain(db.engine, statement, parameters)) for statement, parameters in captured]
+    return response, plans
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Fail when hot route queries regress to seq scans')
+    parser.add_argument('--movies', type=int, default=50000)
+    parser.add_argument('--members', type=int, default=2000)
+    parser.add_argument('--watchlist', type=int, default=20, help='Watchlist rows per member')
+    parser.add_argument('--chat', type=int, default=30, help='Chat messages per member')
+    parser.add_argument('--cost-scale', type=float, default=1.0, help='Multiply every cost budget')
+    parser.add_argument('--report', action='store_true', help='Print every plan summary, not just failures')
+    parser.add_argument('--keep', action='store_true', help='Keep the scratch database afterwards')
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+
+    recreate_database()
+    try:
+        failures = run_checks(args)
+    finally:
+        if not args.keep:
+            drop_database()
+
+    print("\n" + "=" * 72)
+    if failures:
+        print(f"✗ {failures} query plan regressions")
+        sys.exit(1)
+    print("✓ All hot route queries use indexes within budget")
+
+
+def run_checks(args):
+    from app import create_app
+    from database import db
+
+    app = create_app()
+    members, movie_id = prepare(app, args)
+    captured = capture_selects(app)
+
+    failures = 0
+    for path, who, max_cost, seq_scan_ok in ROUTES:
+        path = path.format(movie_id=movie_id)
+        response, plans = route_plans(app, captured, path, who, members)
+        label = f"GET {path} ({who or 'anonymous'})"
+        if response.status_code not in (200, 202):
+            print(f"✗ {label}: HTTP {response.status_code}")
+            failures += 1
+            continue
+
+        print(f"\n{label}: {len(plans)} queries")
+        for statement, plan in plans:
+            problems = plan_problems(plan, max_cost * args.cost_scale, seq_scan_ok)
+            summary = ' '.join(statement.split())[:110]
+            if problems:
+                failures += 1
+                print(f"  ✗ {'; '.join(problems)}\n      {summary}")
+            elif args.report:
+                print(f"  ✓ cost {plan['Total Cost']:.0f} ({plan['Node Type']})\n      {summary}")
+
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+    return failures
+
+
+if __name__ == '__main__':
+    main()
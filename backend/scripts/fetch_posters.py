@@ -1,15 +1,69 @@
+"""
+Backfill missing movie posters from TMDB search.
+
+Movies with no poster_url are read in keyset-paged batches (id > last id),
+searched concurrently through the shared rate-limited TMDB client, and each
+batch's hits are written back with one UPDATE ... FROM (VALUES ...). The
+update only fills rows whose poster_url is still NULL, so it never clobbers
+a poster set by another writer in the meantime.
+
+The last id of each batch is saved with its update (script_checkpoint
+table, so every database has its own progress) together with the ids whose
+search failed. The next run searches those failed ids first and then picks
+up after the last id. Movies TMDB had no poster for are not searched again
+until --restart.
+
+Usage:
+    python scripts/fetch_posters.py [--batch-size 200] [--concurrency 8] [--limit 1000] [--restart]
+    TMDB_BASE_URL=http://127.0.0.1:8090/3 TMDB_API_KEY=mock python scripts/fetch_posters.py
+"""
+import argparse
 import os
-import requests
-import psycopg2
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+import psycopg2
 from dotenv import load_dotenv
+from psycopg2.extras import Json, execute_values
+
+from tmdb_engine import (
+    DEFAULT_BURST, DEFAULT_CONCURRENCY, DEFAULT_RATE, IMAGE_BASE_URL,
+    TMDB_API_KEY, TMDBClient, TMDBError,
+)
 
 load_dotenv()
 
-# TMDB Configuration
-TMDB_API_KEY = os.getenv('TMDB_API_KEY')
-TMDB_BASE_URL = 'https://api.themoviedb.org/3'
-TMDB_IMAGE_BASE = 'https://image.tmdb.org/t/p/w500'
+CHECKPOINT = 'poster_backfill'
+
+LOAD_CHECKPOINT = "SELECT state FROM script_checkpoint WHERE name = %s"
+
+SAVE_CHECKPOINT = """
+    INSERT INTO script_checkpoint (name, state) VALUES (%s, %s)
+    ON CONFLICT (name) DO UPDATE SET state = EXCLUDED.state, updated_at = now()
+"""
+
+SELECT_BATCH = """
+    SELECT id, title, release_year
+    FROM movie
+    WHERE poster_url IS NULL AND id > %s
+    ORDER BY id
+    LIMIT %s
+"""
+
+SELECT_RETRY = """
+    SELECT id, title, release_year
+    FROM movie
+    WHERE poster_url IS NULL AND id = ANY(%s)
+    ORDER BY id
+"""
+
+UPDATE_POSTERS = """
+    UPDATE movie SET poster_url = v.poster_url
+    FROM (VALUES %s) AS v (id, poster_url)
+    WHERE movie.id = v.id AND movie.poster_url IS NULL
+"""
+
 
 # Database connection
 def connect_db():
@@ -21,75 +75,167 @@ def connect_db():
         port=os.getenv('DB_PORT', '5432')
     )
 
-def search_tmdb_movie(title, year):
-    """Search TMDB for movie and return poster path"""
-    url = f'{TMDB_BASE_URL}/search/movie'
-    params = {
-        'api_key': TMDB_API_KEY,
-        'query': title,
-        'year': year
-    }
-    
-    try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
-        
-        if data['results']:
-            poster_path = data['results'][0].get('poster_path')
-            if poster_path:
-                return f'{TMDB_IMAGE_BASE}{poster_path}'
-        return None
-    except Exception as e:
-        print(f'  Error searching TMDB: {e}')
-        return None
+
+def search_poster(client, title, year):
+    """
+    Poster URL of the best TMDB search match, or None
+
+    Raises:
+        TMDBError: When the search itself fails (the movie is retried next run)
+    """
+    results = client.search(title, year)['results']
+    if not results and year:
+        # Release years in the catalog are sometimes off by one from TMDB's
+        results = client.search(title)['results']
+    for result in results[:3]:
+        if result.get('poster_path'):
+            return f"{IMAGE_BASE_URL}{result['poster_path']}"
+    return None
+
+
+def load_state(conn):
+    """Saved (last_id, retry_ids), or (0, []) before the first run"""
+    with conn.cursor() as cursor:
+        cursor.execute(LOAD_CHECKPOINT, (CHECKPOINT,))
+        row = cursor.fetchone()
+    conn.rollback()
+    if not row:
+        return 0, []
+    return row[0].get('last_id', 0), row[0].get('retry_ids', [])
+
+
+def save_state(cursor, last_id, retry_ids):
+    """Record progress in the caller's transaction, so it commits with the batch"""
+    cursor.execute(SAVE_CHECKPOINT, (CHECKPOINT, Json({'last_id': last_id, 'retry_ids': retry_ids})))
+
+
+def resolve_batch(client, pool, rows):
+    """
+    Search posters for a batch of (id, title, year) rows concurrently
+
+    Returns:
+        tuple: (found, missing, errors) - found is a list of (id, poster_url),
+               errors lists ids whose search failed
+    """
+    def resolve(row):
+        movie_id, title, year = row
+        try:
+            return movie_id, search_poster(client, title, year), None
+        except Exception as e:
+            # TMDBError or a malformed response: fail this movie, not the run
+            return movie_id, None, str(e) if isinstance(e, TMDBError) else repr(e)
+
+    found, missing, errors = [], [], []
+    for movie_id, poster_url, error in pool.map(resolve, rows):
+        if error:
+            errors.append(movie_id)
+        elif poster_url:
+            found.append((movie_id, poster_url))
+        else:
+            missing.append(movie_id)
+    return found, missing, errors
+
+
+def backfill(conn, client, batch_size=200, concurrency=DEFAULT_CONCURRENCY, limit=None,
+             after_id=0, retry_ids=()):
+    """
+    Search retry_ids (earlier failures) first, then run the backfill from
+    after_id, saving progress after every batch
+
+    Returns:
+        dict: Counts for 'scanned', 'updated', 'missing', 'errors' and the
+              ids still to retry (saved, and searched first on the next run)
+    """
+    totals = {'scanned': 0, 'updated': 0, 'missing': 0, 'errors': 0}
+    pending = sorted(retry_ids)  # earlier failures not searched yet
+    failed = []                  # failures of this run
+    last_id = after_id
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        while limit is None or totals['scanned'] < limit:
+            size = batch_size if limit is None else min(batch_size, limit - totals['scanned'])
+            with conn.cursor() as cursor:
+                if pending:
+                    retrying, pending = pending[:size], pending[size:]
+                    cursor.execute(SELECT_RETRY, (retrying,))
+                    where = f"retried {len(retrying)} failed ids"
+                else:
+                    cursor.execute(SELECT_BATCH, (last_id, size))
+                    where = None
+                rows = cursor.fetchall()
+            if not rows:
+                if where:
+                    # Those movies got a poster (or were deleted) meanwhile
+                    with conn.cursor() as cursor:
+                        save_state(cursor, last_id, pending + failed)
+                    conn.commit()
+                    continue
+                break
+
+            found, missing, errors = resolve_batch(client, pool, rows)
+            if not where:
+                last_id = rows[-1][0]
+                where = f"up to id {last_id}"
+            failed.extend(errors)
+            with conn.cursor() as cursor:
+                if found:
+                    execute_values(cursor, UPDATE_POSTERS, found, page_size=len(found))
+                updated = cursor.rowcount if found else 0
+                save_state(cursor, last_id, pending + failed)
+            conn.commit()
+
+            totals['scanned'] += len(rows)
+            totals['updated'] += updated
+            totals['missing'] += len(missing)
+            totals['errors'] += len(errors)
+            print(f"  [{totals['scanned']}] {where}: {updated} updated, "
+                  f"{len(missing)} not found, {len(errors)} errors")
+
+    totals['retry_ids'] = pending + failed
+    return totals
+
 
 def main():
+    parser = argparse.ArgumentParser(description='Backfill missing movie posters from TMDB')
+    parser.add_argument('--batch-size', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE, help='Requests per second')
+    parser.add_argument('--burst', type=int, default=DEFAULT_BURST)
+    parser.add_argument('--limit', type=int, default=None, help='Stop after scanning this many movies')
+    parser.add_argument('--restart', action='store_true', help='Ignore saved progress and rescan from the start')
+    args = parser.parse_args()
+
+    if not TMDB_API_KEY:
+        print("✗ ERROR: TMDB_API_KEY not found in environment!")
+        sys.exit(2)
+
+    client = TMDBClient(rate=args.rate, burst=args.burst, concurrency=args.concurrency)
     conn = connect_db()
-    cursor = conn.cursor()
-    
-    # Get all movies without poster URLs
-    cursor.execute("""
-        SELECT id, title, release_year 
-        FROM movie 
-        WHERE poster_url IS NULL
-        ORDER BY id
-    """)
-    
-    movies = cursor.fetchall()
-    total = len(movies)
-    print(f'Found {total} movies without posters\n')
-    
-    success_count = 0
-    fail_count = 0
-    
-    for idx, (movie_id, title, year) in enumerate(movies, 1):
-        print(f'[{idx}/{total}] {title} ({year})... ', end='', flush=True)
-        
-        poster_url = search_tmdb_movie(title, year)
-        
-        if poster_url:
-            cursor.execute(
-                'UPDATE movie SET poster_url = %s WHERE id = %s',
-                (poster_url, movie_id)
-            )
-            conn.commit()
-            print(f'✓ Found')
-            success_count += 1
-        else:
-            print('✗ Not found')
-            fail_count += 1
-        
-        # Rate limiting: TMDB allows 40 requests/10 seconds
-        time.sleep(0.3)
-    
-    cursor.close()
-    conn.close()
-    
+    after_id, retry_ids = (0, []) if args.restart else load_state(conn)
+    if after_id or retry_ids:
+        print(f"Resuming after movie id {after_id}, retrying {len(retry_ids)} failed ids first")
+
+    started = time.perf_counter()
+    try:
+        totals = backfill(conn, client, args.batch_size, args.concurrency, args.limit,
+                          after_id, retry_ids)
+    finally:
+        conn.close()
+    elapsed = time.perf_counter() - started
+
     print(f'\n--- Summary ---')
-    print(f'Success: {success_count}')
-    print(f'Failed:  {fail_count}')
-    print(f'Total:   {total}')
+    print(f"Scanned: {totals['scanned']} in {elapsed:.1f}s "
+          f"({totals['scanned'] / elapsed if elapsed else 0:.1f} movies/sec)")
+    print(f"Updated: {totals['updated']}")
+    print(f"No poster on TMDB: {totals['missing']}")
+    print(f"Errors:  {totals['errors']}")
+    print(f"Requests: {client.stats['requests']}, retries: {client.stats['retries']}, "
+          f"429s: {client.stats['rate_limited']}")
+    if totals['retry_ids']:
+        # Saved with the progress; the next run searches them first
+        print(f"✗ Search failed for movie ids: {', '.join(map(str, totals['retry_ids'][:20]))}"
+              f"{' ...' if len(totals['retry_ids']) > 20 else ''} (rerun to retry them)")
+        sys.exit(1)
+
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,426 @@
+"""
+Generate a synthetic catalog, members, watchlists and chat histories for
+scale testing.
+
+The distributions follow the seed data and real usage: genres and ratings
+weighted like backend/movies (animation skews G/PG, horror skews R),
+release years peaking in the 1990s-2000s, members in every rating tier,
+power-law watchlist sizes drawn from a power-law movie popularity, and
+chat histories made of multi-turn sessions with recommended movie ids on
+the assistant replies.
+
+Rows are generated in fixed-size chunks, each with its own random stream
+derived from --seed, and each chunk is COPYed by a separate worker process.
+The output is therefore the same for a given seed and scale whatever the
+worker count. Only ids (allocated as one block per table) and timestamps
+(relative to --as-of) depend on the target database and the run.
+
+Usage:
+    python scripts/generate_data.py --movies 1000000 --members 100000 [--seed 42] [--workers 8]
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+import psycopg2
+from dotenv import load_dotenv
+
+from seed_loader import clear_catalog_cache
+
+load_dotenv()
+
+# Rows per chunk (and per COPY transaction); part of the output definition,
+# changing them changes the data generated for a seed
+MOVIE_CHUNK = 50000
+MEMBER_CHUNK = 10000
+
+# Shares of the seed datasets, with a small tail of rarer genres
+GENRE_WEIGHTS = {
+    'Drama': 22, 'Action': 20, 'Animation': 12, 'Comedy': 12, 'Adventure': 8,
+    'Biography': 8, 'Crime': 7, 'Horror': 6, 'Sci-Fi': 2, 'Mystery': 1,
+    'Thriller': 1, 'Romance': 1, 'Fantasy': 0.5, 'Documentary': 0.5,
+    'Western': 0.5, 'Musical': 0.5, 'War': 0.5,
+}
+RATING_WEIGHTS = {'G': 9, 'PG': 20, 'PG-13': 18, 'R': 44, 'NC-17': 2, 'Unrated': 7}
+GENRE_RATING_WEIGHTS = {
+    'Animation': {'G': 45, 'PG': 45, 'PG-13': 8, 'Unrated': 2},
+    'Horror': {'PG-13': 20, 'R': 70, 'NC-17': 4, 'Unrated': 6},
+    'Documentary': {'G': 15, 'PG': 25, 'PG-13': 20, 'R': 10, 'Unrated': 30},
+}
+
+# (min age, max age, share): every rating tier is represented
+AGE_BANDS = [(8, 12, 0.06), (13, 16, 0.07), (17, 17, 0.03), (18, 34, 0.36), (35, 54, 0.32), (55, 80, 0.16)]
+
+# Watchlists: Pareto sizes (lower alpha = heavier tail), some members have none
+WATCHLIST_ALPHA = 1.4
+WATCHLIST_EMPTY_SHARE = 0.15
+WATCHED_SHARE = 0.4
+# Movie popularity: rank = n * u**POPULARITY_SKEW, so a few movies are on most watchlists
+POPULARITY_SKEW = 3
+
+# Chats: Pareto session counts, 1-6 exchanges per session; a few members
+# are mid-conversation (active messages within the chat expiry window)
+CHAT_ALPHA = 1.6
+CHAT_EMPTY_SHARE = 0.3
+ACTIVE_SHARE = 0.05
+
+ADJECTIVES = [
+    'Silent', 'Broken', 'Last', 'Crimson', 'Hidden', 'Golden', 'Midnight', 'Lost', 'Electric', 'Frozen',
+    'Savage', 'Quiet', 'Burning', 'Distant', 'Wild', 'Hollow', 'Iron', 'Secret', 'Endless', 'Little',
+    'Dark', 'Bright', 'Final', 'Forgotten', 'Restless', 'Painted', 'Northern', 'Wicked', 'Gentle', 'Falling',
+]
+NOUNS = [
+    'Harbor', 'Kingdom', 'Signal', 'River', 'Garden', 'Empire', 'Witness', 'Horizon', 'Machine', 'Summer',
+    'Frontier', 'Orchard', 'Station', 'Shadow', 'Promise', 'Heist', 'Voyage', 'Letter', 'Storm', 'Island',
+    'Dynasty', 'Circus', 'Mirror', 'Engine', 'Canyon', 'Lullaby', 'Outpost', 'Verdict', 'Carnival', 'Comet',
+]
+FIRST_NAMES = ['Alex', 'Sam', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Jamie', 'Avery', 'Quinn',
+               'Maria', 'Wei', 'Aisha', 'Diego', 'Priya', 'Noah', 'Yuki', 'Omar', 'Elena', 'Kofi']
+LAST_NAMES = ['Smith', 'Garcia', 'Chen', 'Okafor', 'Patel', 'Nguyen', 'Kowalski', 'Haddad', 'Silva', 'Kim',
+              'Johnson', 'Muller', 'Rossi', 'Sato', 'Ivanova', 'Mensah', 'Lopez', 'Cohen', 'Brown', 'Singh']
+USER_PROMPTS = [
+    'Something like {title}, but funnier',
+    'I loved {title}. What should I watch next?',
+    'Any {genre} movies from the {decade}s?',
+    'Recommend a {genre} movie for tonight',
+    'Not in the mood for {genre}, something lighter?',
+    'What else did the director of {title} make?',
+    'Short movies under two hours please',
+]
+ASSISTANT_REPLIES = [
+    'Here are a few picks you might enjoy.',
+    'Based on your watchlist, try these.',
+    'These {genre} titles are well reviewed.',
+    'If you liked {title}, these have a similar feel.',
+]
+
+MOVIE_COLUMNS = ['id', 'title', 'director', 'release_year', 'genre', 'description', 'runtime_minutes', 'rating', 'imdb_rating']
+MEMBER_COLUMNS = ['id', 'email', 'password_hash', 'first_name', 'last_name', 'date_of_birth', 'email_verified', 'agent_usage', 'created_at']
+WATCHLIST_COLUMNS = ['member_id', 'movie_id', 'status', 'added_at', 'watched_at']
+CHAT_COLUMNS = ['member_id', 'role', 'content', 'recommended_movie_ids', 'active', 'created_at']
+
+
+def connect_db():
+    """Connect to PostgreSQL database"""
+    return psycopg2.connect(
+        host=os.getenv('DB_HOST', 'localhost'),
+        database=os.getenv('DB_NAME', 'movies_dev'),
+        user=os.getenv('DB_USER', os.getenv('USER')),
+        password=os.getenv('DB_PASSWORD', ''),
+        port=os.getenv('DB_PORT', '5432')
+    )
+
+
+class CopyStream:
+    """
+    Read-only file over generated COPY text rows, for cursor.copy_expert
+
+    Generated values never contain tabs, newlines or backslashes, so they
+    need no escaping; None becomes \\N.
+    """
+
+    def __init__(self, rows):
+        self.rows = iter(rows)
+        self.buffer = ''
+        self.count = 0
+
+    def read(self, size=-1):
+        parts, length = [self.buffer], len(self.buffer)
+        while size < 0 or length < size:
+            row = next(self.rows, None)
+            if row is None:
+                break
+            line = '\t'.join('\\N' if v is None else str(v) for v in row) + '\n'
+            parts.append(line)
+            length += len(line)
+            self.count += 1
+        data = ''.join(parts)
+        if size < 0:
+            self.buffer = ''
+            return data
+        self.buffer = data[size:]
+        return data[:size]
+
+
+def chunk_random(seed, table, chunk):
+    """Independent, reproducible random stream for one chunk of one table"""
+    return random.Random(f"{seed}:{table}:{chunk}")
+
+
+def weighted(rng, weights):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def pareto_size(rng, mean, alpha, cap):
+    """Pareto-distributed size with roughly the given mean (before the cap)"""
+    return min(cap, int(mean * (alpha - 1) / alpha * rng.paretovariate(alpha)))
+
+
+class Popularity:
+    """
+    Movie ids by power-law popularity
+
+    Ranks are spread over the id range with a multiplicative bijection plus
+    a seeded offset, so the most popular movies aren't simply the lowest ids
+    (and the top rank isn't always the first one).
+    """
+
+    def __init__(self, first_id, count, seed):
+        self.first_id, self.count = first_id, count
+        rng = random.Random(f"{seed}:popularity")
+        stride = rng.randrange(count // 3 + 1, count) if count > 3 else 1
+        while math.gcd(stride, count) != 1:
+            stride += 1
+        self.stride = stride
+        self.offset = rng.randrange(count)
+
+    def pick(self, rng):
+        rank = int(self.count * rng.random() ** POPULARITY_SKEW)
+        return self.first_id + (rank * self.stride + self.offset) % self.count
+
+
+def movie_rows(seed, chunk, first_id, count, as_of):
+    rng = chunk_random(seed, 'movie', chunk)
+    for i in range(chunk * MOVIE_CHUNK, min(count, (chunk + 1) * MOVIE_CHUNK)):
+        genre = weighted(rng, GENRE_WEIGHTS)
+        rating = weighted(rng, GENRE_RATING_WEIGHTS.get(genre, RATING_WEIGHTS))
+        year = min(as_of.year, 1920 + int((as_of.year - 1920) * rng.betavariate(3, 1.6)))
+        phrase = f"{rng.choice(['The ', '', ''])}{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)}"
+        runtime = max(70, min(210, int(rng.gauss(90 if genre == 'Animation' else 108, 16))))
+        imdb = max(1.0, min(9.6, rng.gauss(6.4, 1.0)))
+        yield (
+            first_id + i,
+            f"{phrase} ({seed}x{i})",  # unique per seed, so dedup_key never collides
+            f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            year,
+            genre,
+            f"A {genre.lower()} about a {rng.choice(ADJECTIVES).lower()} {rng.choice(NOUNS).lower()}.",
+            runtime,
+            rating,
+            f"{imdb:.1f}",
+        )
+
+
+def member_birth_date(rng, as_of):
+    low, high, _ = rng.choices(AGE_BANDS, weights=[band[2] for band in AGE_BANDS])[0]
+    age_days = rng.randint(low * 365 + 1, high * 365 + 364)
+    return as_of.date() - timedelta(days=age_days)
+
+
+def member_rows(seed, chunk, first_id, count, as_of, password_hash):
+    rng = chunk_random(seed, 'member', chunk)
+    for i in range(chunk * MEMBER_CHUNK, min(count, (chunk + 1) * MEMBER_CHUNK)):
+        yield (
+            first_id + i,
+            f"gen{seed}-{i}@example.com",
+            password_hash,
+            rng.choice(FIRST_NAMES),
+            rng.choice(LAST_NAMES),
+            member_birth_date(rng, as_of).isoformat(),
+            't' if rng.random() < 0.95 else 'f',
+            f"{rng.expovariate(1 / 0.05):.6f}",
+            (as_of - timedelta(days=rng.uniform(1, 3 * 365))).isoformat(sep=' '),
+        )
+
+
+def watchlist_rows(seed, chunk, first_member, members, popularity, mean, as_of):
+    rng = chunk_random(seed, 'watchlist', chunk)
+    cap = min(popularity.count, mean * 50)
+    for i in range(chunk * MEMBER_CHUNK, min(members, (chunk + 1) * MEMBER_CHUNK)):
+        if rng.random() < WATCHLIST_EMPTY_SHARE:
+            continue
+        size = pareto_size(rng, mean, WATCHLIST_ALPHA, cap)
+        picked = set()
+        # Popular titles repeat; give up on a slot rather than loop forever
+        for _ in range(size * 3):
+            if len(picked) == size:
+                break
+            picked.add(popularity.pick(rng))
+        for movie_id in sorted(picked):
+            added_at = as_of - timedelta(days=rng.uniform(0, 3 * 365))
+            watched = rng.random() < WATCHED_SHARE
+            yield (
+                first_member + i,
+                movie_id,
+                'watched' if watched else 'queued',
+                added_at.isoformat(sep=' '),
+                (added_at + timedelta(days=rng.uniform(0, 60))).isoformat(sep=' ') if watched else None,
+            )
+
+
+def chat_rows(seed, chunk, first_member, members, popularity, mean, as_of):
+    """Sessions of user/assistant exchanges, oldest first per member"""
+    rng = chunk_random(seed, 'chat', chunk)
+    cap = mean * 20
+    for i in range(chunk * MEMBER_CHUNK, min(members, (chunk + 1) * MEMBER_CHUNK)):
+        if rng.random() < CHAT_EMPTY_SHARE:
+            continue
+        messages = max(2, pareto_size(rng, mean, CHAT_ALPHA, cap))
+        sessions = []
+        while messages > 0:
+            exchanges = min(rng.randint(1, 6), max(1, messages // 2))
+            sessions.append(exchanges)
+            messages -= exchanges * 2
+        live = rng.random() < ACTIVE_SHARE
+
+        started = as_of - timedelta(days=rng.uniform(1, 365))
+        step = (as_of - started) / (len(sessions) + 1)
+        for n, exchanges in enumerate(sessions):
+            last = live and n == len(sessions) - 1
+            # The live session ends in the past few seconds
+            at = as_of - timedelta(seconds=exchanges * 15) if last else started + step * n
+            for _ in range(exchanges):
+                recommended = sorted({popularity.pick(rng) for _ in range(rng.randint(3, 5))})
+                context = {
+                    'title': f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)}",
+                    'genre': weighted(rng, GENRE_WEIGHTS).lower(),
+                    'decade': rng.randrange(1950, 2030, 10),
+                }
+                yield (first_member + i, 'user', rng.choice(USER_PROMPTS).format(**context),
+                       None, 't' if last else 'f', at.isoformat(sep=' '))
+                at += timedelta(seconds=rng.uniform(2, 5))
+                yield (first_member + i, 'assistant', rng.choice(ASSISTANT_REPLIES).format(**context),
+                       '{' + ','.join(map(str, recommended)) + '}', 't' if last else 'f', at.isoformat(sep=' '))
+                at += timedelta(seconds=rng.uniform(3, 10))
+
+
+def copy_chunk(task):
+    """Generate one chunk and COPY it in its own transaction (worker process)"""
+    table, columns, generator, args = task
+    started = time.perf_counter()
+    stream = CopyStream(generator(*args))
+    conn = connect_db()
+    try:
+        with conn.cursor() as cursor:
+            cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", stream)
+        conn.commit()
+    finally:
+        conn.close()
+    return table, stream.count, time.perf_counter() - started
+
+
+def allocate_ids(conn, table, count):
+    """Reserve a block of count ids from the table's sequence; returns the first"""
+    with conn.cursor() as cursor:
+        cursor.execute(f"SELECT pg_get_serial_sequence('{table}', 'id')")
+        sequence = cursor.fetchone()[0]
+        cursor.execute("SELECT nextval(%s)", (sequence,))
+        first = cursor.fetchone()[0]
+        if count > 1:
+            cursor.execute("SELECT setval(%s, %s)", (sequence, first + count - 1))
+    conn.commit()
+    return first
+
+
+def run_phase(pool, tasks, totals):
+    for table, rows, seconds in pool.map(copy_chunk, tasks):
+        totals.setdefault(table, [0, 0.0])
+        totals[table][0] += rows
+        totals[table][1] += seconds
+
+
+def generate(movies, members, watchlist=40, chat=20, seed=42, workers=4, as_of=None, password='password'):
+    """
+    Generate and load synthetic data
+
+    Args:
+        movies: Movies to add
+        members: Members to add (each may get a watchlist and chat history)
+        watchlist: Mean watchlist size of members that have one
+        chat: Mean chat messages of members that have a history
+        seed: Random seed; the same seed and scale give the same data
+        workers: Worker processes generating and COPYing chunks
+        as_of: Timestamps are relative to this datetime (default: now)
+        password: Password of every generated member
+
+    Returns:
+        dict: {table: (rows, worker seconds)} plus 'first_movie_id' and 'first_member_id'
+    """
+    import bcrypt
+    as_of = as_of or datetime.now()
+    password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+
+    conn = connect_db()
+    try:
+        first_movie = allocate_ids(conn, 'movie', movies) if movies else None
+        first_member = allocate_ids(conn, 'member', members) if members else None
+    finally:
+        conn.close()
+
+    # Movie chunks serialize on the change feed's lock; members load alongside
+    totals = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        run_phase(pool, [
+            ('movie', MOVIE_COLUMNS, movie_rows, (seed, chunk, first_movie, movies, as_of))
+            for chunk in range(math.ceil(movies / MOVIE_CHUNK))
+        ] + [
+            ('member', MEMBER_COLUMNS, member_rows, (seed, chunk, first_member, members, as_of, password_hash))
+            for chunk in range(math.ceil(members / MEMBER_CHUNK))
+        ], totals)
+
+        # Watchlists and chats reference the rows above, so they go second
+        if movies and members:
+            popularity = Popularity(first_movie, movies, seed)
+            member_chunks = range(math.ceil(members / MEMBER_CHUNK))
+            run_phase(pool, [
+                ('watchlist', WATCHLIST_COLUMNS, watchlist_rows,
+                 (seed, chunk, first_member, members, popularity, watchlist, as_of))
+                for chunk in member_chunks if watchlist
+            ] + [
+                ('chat_message', CHAT_COLUMNS, chat_rows,
+                 (seed, chunk, first_member, members, popularity, chat, as_of))
+                for chunk in member_chunks if chat
+            ], totals)
+
+    conn = connect_db()
+    try:
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute("ANALYZE movie, member, watchlist, chat_message")
+    finally:
+        conn.close()
+
+    return {**{table: tuple(total) for table, total in totals.items()},
+            'first_movie_id': first_movie, 'first_member_id': first_member}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic data for scale testing')
+    parser.add_argument('--movies', type=int, default=100000, help='Movies to add')
+    parser.add_argument('--members', type=int, default=10000, help='Members to add')
+    parser.add_argument('--watchlist', type=int, default=40, help='Mean watchlist size (of members with one)')
+    parser.add_argument('--chat', type=int, default=20, help='Mean chat messages (of members with a history)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 4, help='Worker processes')
+    parser.add_argument('--as-of', type=datetime.fromisoformat, default=None,
+                        help='Timestamps are relative to this time (ISO format; default: now)')
+    parser.add_argument('--password', default='password', help='Password of every generated member')
+    args = parser.parse_args()
+
+    print(f"Generating {args.movies} movies and {args.members} members (seed {args.seed}, "
+          f"{args.workers} workers)...")
+    started = time.perf_counter()
+    try:
+        result = generate(args.movies, args.members, args.watchlist, args.chat,
+                          seed=args.seed, workers=args.workers, as_of=args.as_of, password=args.password)
+    except psycopg2.Error as e:
+        sys.exit(f"✗ Generation failed (chunks already committed are kept): {e}")
+    elapsed = time.perf_counter() - started
+
+    for table in ('movie', 'member', 'watchlist', 'chat_message'):
+        if table in result:
+            rows, seconds = result[table]
+            print(f"  ✓ {table:<14} {rows:>10} rows  ({seconds:.1f} worker-s)")
+    rows = sum(result[table][0] for table in ('movie', 'member', 'watchlist', 'chat_message') if table in result)
+    print(f"✓ Generated {rows} rows in {elapsed:.1f}s ({rows / elapsed * 60 / 1e6:.1f}M rows/min)")
+
+    clear_catalog_cache()
+
+
+if __name__ == '__main__':
+    main()
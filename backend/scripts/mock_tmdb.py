@@ -0,0 +1,171 @@
+"""
+Local HTTP server that mimics the parts of the TMDB API the ingestion
+scripts use: list pages, movie details (credits, release dates) and movie
+search. Payloads are deterministic per id, and rate limiting, latency and
+5xx errors can be injected to exercise the client's retry and pacing.
+
+Usage:
+    python scripts/mock_tmdb.py --port 8090 --rate-limit 50 --error-rate 0.02
+    TMDB_BASE_URL=http://127.0.0.1:8090/3 TMDB_API_KEY=mock python scripts/tmdb_fetch.py ...
+"""
+import argparse
+import json
+import random
+import re
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from tmdb_engine import CATEGORIES, RESULTS_PER_PAGE, TokenBucket
+
+GENRES = [
+    'Action', 'Adventure', 'Animation', 'Comedy', 'Crime', 'Documentary', 'Drama',
+    'Family', 'Fantasy', 'History', 'Horror', 'Music', 'Mystery', 'Romance',
+    'Science Fiction', 'Thriller', 'War', 'Western',
+]
+CERTIFICATIONS = ['G', 'PG', 'PG-13', 'R', 'NC-17', '']
+
+LIST_PATH = re.compile(r'^/3/movie/(?P<category>[a-z_]+)$')
+DETAIL_PATH = re.compile(r'^/3/movie/(?P<id>\d+)$')
+SEARCH_PATH = '/3/search/movie'
+
+
+class MockCatalog:
+    """Deterministic fake catalog of `size` movies"""
+
+    def __init__(self, size=10000, seed=0):
+        self.size = size
+        self.seed = seed
+
+    def _rng(self, *key):
+        return random.Random(f"{self.seed}:{':'.join(map(str, key))}")
+
+    def list_page(self, category, page):
+        # Categories overlap, like the real lists do
+        offset = CATEGORIES.index(category) * self.size // 7
+        start = (page - 1) * RESULTS_PER_PAGE
+        ids = [1 + (offset + start + i) % self.size for i in range(RESULTS_PER_PAGE)]
+        return {
+            'page': page,
+            'results': [{'id': tmdb_id, 'title': self.title(tmdb_id)} for tmdb_id in ids],
+            'total_pages': 500,
+            'total_results': 500 * RESULTS_PER_PAGE,
+        }
+
+    def title(self, tmdb_id):
+        return f"Mock Movie {tmdb_id}"
+
+    def release_year(self, tmdb_id):
+        return 1930 + self._rng('year', tmdb_id).randint(0, 94)
+
+    def details(self, tmdb_id):
+        rng = self._rng('details', tmdb_id)
+        return {
+            'id': tmdb_id,
+            'title': self.title(tmdb_id),
+            'overview': f"A deterministic mock film, number {tmdb_id}.",
+            'release_date': f"{self.release_year(tmdb_id)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            'genres': [{'id': i, 'name': name} for i, name in enumerate(rng.sample(GENRES, 2))],
+            'runtime': rng.randint(75, 180),
+            'vote_average': round(rng.uniform(4, 9), 1),
+            'poster_path': f"/mock{tmdb_id}.jpg",
+            'credits': {'crew': [
+                {'job': 'Producer', 'name': f"Producer {rng.randint(1, 400)}"},
+                {'job': 'Director', 'name': f"Director {rng.randint(1, 800)}"},
+            ]},
+            'release_dates': {'results': [
+                {'iso_3166_1': 'US', 'release_dates': [{'certification': rng.choice(CERTIFICATIONS)}]},
+            ]},
+        }
+
+    def search(self, query, year=None):
+        # Titles look like "... <id>"; roughly one in ten has no poster
+        match = re.search(r'(\d+)\s*$', query or '')
+        if not match:
+            return {'page': 1, 'results': [], 'total_results': 0}
+        tmdb_id = int(match.group(1))
+        poster = None if self._rng('poster', tmdb_id).random() < 0.1 else f"/mock{tmdb_id}.jpg"
+        result = {'id': tmdb_id, 'title': query, 'release_date': f"{year or self.release_year(tmdb_id)}-01-01",
+                  'poster_path': poster}
+        return {'page': 1, 'results': [result], 'total_results': 1}
+
+
+def make_handler(catalog, bucket=None, latency_ms=0.0, error_rate=0.0):
+    """Build a request handler class bound to a catalog and fault settings"""
+    rng = random.Random(catalog.seed)
+
+    class TMDBHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            if latency_ms:
+                time.sleep(latency_ms / 1000)
+            if bucket and not bucket.try_acquire():
+                return self._send_json(429, {'status_code': 25, 'status_message': 'Request count over limit'},
+                                       {'Retry-After': '1'})
+            if error_rate and rng.random() < error_rate:
+                return self._send_json(503, {'status_code': 11, 'status_message': 'Internal error (injected)'})
+
+            url = urlparse(self.path)
+            query = {key: values[0] for key, values in parse_qs(url.query).items()}
+            detail = DETAIL_PATH.match(url.path)
+            listing = LIST_PATH.match(url.path)
+            if detail:
+                tmdb_id = int(detail.group('id'))
+                if not 1 <= tmdb_id <= catalog.size:
+                    return self._send_json(404, {'status_code': 34, 'status_message': 'Not found'})
+                return self._send_json(200, catalog.details(tmdb_id))
+            if listing and listing.group('category') in CATEGORIES:
+                return self._send_json(200, catalog.list_page(listing.group('category'), int(query.get('page', 1))))
+            if url.path == SEARCH_PATH:
+                return self._send_json(200, catalog.search(query.get('query'), query.get('year')))
+            self._send_json(404, {'status_code': 34, 'status_message': f'Unknown path {url.path}'})
+
+        def _send_json(self, status, payload, headers=None):
+            data = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            # Keep ingestion runs quiet; the client reports its own stats
+            pass
+
+    return TMDBHandler
+
+
+def make_server(host='127.0.0.1', port=8090, catalog=None, rate_limit=None, latency_ms=0.0, error_rate=0.0):
+    """Create (but do not start) a threaded mock TMDB server"""
+    bucket = TokenBucket(rate_limit, rate_limit) if rate_limit else None
+    handler = make_handler(catalog or MockCatalog(), bucket, latency_ms, error_rate)
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local TMDB API stand-in')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--catalog-size', type=int, default=10000)
+    parser.add_argument('--rate-limit', type=float, default=None, help='Requests/sec before answering 429')
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of requests answered with 503')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, MockCatalog(args.catalog_size, args.seed),
+                         args.rate_limit, args.latency_ms, args.error_rate)
+    print(f"Mock TMDB API listening on http://{args.host}:{args.port}/3")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,69 @@
+"""
+Find near-duplicate movies that the catalog key lets through.
+
+Exact duplicates (same title up to case, punctuation and spacing, same
+year) cannot land any more: movie.dedup_key is unique and ingestion upserts
+against it. What is left are fuzzy duplicates ("Star Wars: Episode IV - A
+New Hope" vs "Star Wars", off-by-one years). This report only looks at rows
+added since the last run (id above a saved watermark) and finds candidates
+for each one through the pg_trgm title index, so it never scans the catalog
+pairwise. The watermark is kept in the script_checkpoint table of the
+database being checked. Confirmed duplicates are folded with --fold.
+
+Usage:
+    python scripts/remove_duplicates.py [--threshold 0.6] [--all]
+    python scripts/remove_duplicates.py --fold 1234:56   # fold movie 1234 into 56
+"""
+import argparse
 import os
+import sys
+
 import psycopg2
 from dotenv import load_dotenv
+from psycopg2.extras import Json
 
 load_dotenv()
 
+CHECKPOINT = 'remove_duplicates'
+
+LOAD_CHECKPOINT = "SELECT state FROM script_checkpoint WHERE name = %s"
+
+SAVE_CHECKPOINT = """
+    INSERT INTO script_checkpoint (name, state) VALUES (%s, %s)
+    ON CONFLICT (name) DO UPDATE SET state = EXCLUDED.state, updated_at = now()
+"""
+
+# Candidates come from ix_movie_title_trgm (`%` honours pg_trgm.similarity_threshold).
+# Only older rows are compared against, so every pair is reported once.
+FIND_CANDIDATES = """
+    SELECT n.id, n.title, n.release_year, n.director,
+           c.id, c.title, c.release_year, c.director, c.score
+    FROM movie n
+    CROSS JOIN LATERAL (
+        SELECT m.id, m.title, m.release_year, m.director, similarity(m.title, n.title) AS score
+        FROM movie m
+        WHERE m.title %% n.title
+          AND m.id < n.id
+          AND (m.release_year IS NULL OR n.release_year IS NULL
+               OR abs(m.release_year - n.release_year) <= 1)
+        ORDER BY score DESC
+        LIMIT %(per_movie)s
+    ) c
+    WHERE n.id > %(after_id)s
+    ORDER BY n.id, c.score DESC
+"""
+
+# Same steps as the dedup_key migration: keep one watchlist entry per member
+FOLD = """
+    DELETE FROM watchlist w
+    USING watchlist k
+    WHERE w.movie_id = %(dup)s AND k.movie_id = %(keep)s AND k.member_id = w.member_id;
+    UPDATE watchlist SET movie_id = %(keep)s WHERE movie_id = %(dup)s;
+    UPDATE tmdb_ingest SET movie_id = %(keep)s WHERE movie_id = %(dup)s;
+    DELETE FROM movie WHERE id = %(dup)s;
+"""
+
+
 def connect_db():
     """Connect to PostgreSQL database"""
     return psycopg2.connect(
@@ -14,98 +74,93 @@ def connect_db():
         port=os.getenv('DB_PORT', '5432')
     )
 
-def find_duplicates(cursor):
-    """Find duplicate movies based on (title, release_year, director)"""
-    cursor.execute("""
-        SELECT title, release_year, director, COUNT(*) as count
-        FROM movie
-        GROUP BY title, release_year, director
-        HAVING COUNT(*) > 1
-        ORDER BY count DESC, title
-    """)
+
+def load_watermark(conn):
+    """Highest movie id checked by the last run, or 0"""
+    with conn.cursor() as cursor:
+        cursor.execute(LOAD_CHECKPOINT, (CHECKPOINT,))
+        row = cursor.fetchone()
+    return row[0].get('last_id', 0) if row else 0
+
+
+def save_watermark(conn, last_id):
+    with conn.cursor() as cursor:
+        cursor.execute(SAVE_CHECKPOINT, (CHECKPOINT, Json({'last_id': last_id})))
+    conn.commit()
+
+
+def find_candidates(cursor, after_id, threshold=0.6, per_movie=5):
+    """
+    Likely duplicates of movies with id > after_id
+
+    Returns:
+        list: (new_id, title, year, director, old_id, title, year, director, score) rows
+    """
+    cursor.execute("SET pg_trgm.similarity_threshold = %s", (threshold,))
+    cursor.execute(FIND_CANDIDATES, {'after_id': after_id, 'per_movie': per_movie})
     return cursor.fetchall()
 
-def remove_duplicates(cursor, conn):
-    """Remove duplicate movies, keeping the one with the lowest id"""
-    cursor.execute("""
-        DELETE FROM movie
-        WHERE id IN (
-            SELECT id
-            FROM (
-                SELECT id,
-                       ROW_NUMBER() OVER (
-                           PARTITION BY title, release_year, director 
-                           ORDER BY id
-                       ) as row_num
-                FROM movie
-            ) t
-            WHERE row_num > 1
-        )
-    """)
-    deleted_count = cursor.rowcount
+
+def fold_duplicate(conn, dup_id, keep_id):
+    """Repoint watchlists and ingest records from dup_id to keep_id, then delete dup_id"""
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT count(*) FROM movie WHERE id IN (%s, %s)", (dup_id, keep_id))
+        if cursor.fetchone()[0] != 2:
+            raise ValueError(f"Movies {dup_id} and {keep_id} must both exist")
+        cursor.execute(FOLD, {'dup': dup_id, 'keep': keep_id})
     conn.commit()
-    return deleted_count
+
+
+def parse_fold(value):
+    dup, _, keep = value.partition(':')
+    try:
+        return int(dup), int(keep)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected DUP_ID:KEEP_ID, got {value!r}")
+
 
 def main():
+    parser = argparse.ArgumentParser(description='Report and fold near-duplicate movies')
+    parser.add_argument('--threshold', type=float, default=0.6, help='Minimum trigram similarity of titles')
+    parser.add_argument('--per-movie', type=int, default=5, help='Candidates listed per new movie')
+    parser.add_argument('--all', action='store_true', help='Check every movie, not just rows added since the last run')
+    parser.add_argument('--fold', type=parse_fold, action='append', default=[], metavar='DUP_ID:KEEP_ID',
+                        help='Merge a confirmed duplicate into the movie to keep (repeatable)')
+    args = parser.parse_args()
+
     conn = connect_db()
-    cursor = conn.cursor()
-    
-    print("=" * 60)
-    print("MOVIE DUPLICATE REMOVAL")
-    print("=" * 60)
-    
-    # Find duplicates before removal
-    print("\nSearching for duplicates...")
-    duplicates = find_duplicates(cursor)
-    
-    if not duplicates:
-        print("✓ No duplicates found! Database is clean.")
-        cursor.close()
-        conn.close()
-        return
-    
-    print(f"\nFound {len(duplicates)} sets of duplicates:\n")
-    
-    total_duplicate_records = 0
-    for title, year, director, count in duplicates:
-        print(f"  • {title} ({year}) - {director}: {count} copies")
-        total_duplicate_records += count
-    
-    print(f"\nTotal duplicate records: {total_duplicate_records}")
-    print(f"Records to be removed: {total_duplicate_records - len(duplicates)}")
-    
-    # Confirm removal
-    response = input("\nProceed with removal? (yes/no): ").strip().lower()
-    
-    if response not in ['yes', 'y']:
-        print("Aborted. No changes made.")
-        cursor.close()
+
+    if args.fold:
+        for dup_id, keep_id in args.fold:
+            try:
+                fold_duplicate(conn, dup_id, keep_id)
+            except ValueError as e:
+                conn.rollback()
+                print(f"✗ {e}")
+                continue
+            print(f"✓ Folded movie {dup_id} into {keep_id}")
         conn.close()
         return
-    
-    # Remove duplicates
-    print("\nRemoving duplicates...")
-    """
-    cursor.execute("DELETE FROM watchlist")
-    conn.commit()
-    """
-    deleted_count = remove_duplicates(cursor, conn)
-    
-    print(f"✓ Successfully removed {deleted_count} duplicate records")
-    
-    # Verify cleanup
-    duplicates_after = find_duplicates(cursor)
-    if not duplicates_after:
-        print("✓ Database is now clean - no duplicates remain")
-    else:
-        print(f"⚠ Warning: {len(duplicates_after)} duplicate sets still exist")
-    
-    cursor.close()
+
+    after_id = 0 if args.all else load_watermark(conn)
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT coalesce(max(id), 0), count(*) FILTER (WHERE id > %s) FROM movie", (after_id,))
+        max_id, new_count = cursor.fetchone()
+        print(f"Checking {new_count} movies added after id {after_id}...")
+        candidates = find_candidates(cursor, after_id, args.threshold, args.per_movie)
+    if not args.all:
+        save_watermark(conn, max_id)
     conn.close()
-    
-    print("\n" + "=" * 60)
-    print("COMPLETE")
-    print("=" * 60)
+
+    for new_id, title, year, director, old_id, old_title, old_year, old_director, score in candidates:
+        print(f"  • [{new_id}] {title} ({year}) - {director}")
+        print(f"      ~ [{old_id}] {old_title} ({old_year}) - {old_director}  similarity {score:.2f}")
+
+    if candidates:
+        print(f"\n{len(candidates)} possible duplicates. Fold confirmed ones with --fold DUP_ID:KEEP_ID")
+        sys.exit(1)
+    print("✓ No likely duplicates among new movies")
+
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,289 @@
+"""
+Load the seed datasets (backend/movies/*.sql) into the catalog.
+
+Each dataset is parsed in Python and COPYed into an unlogged staging table
+over its own connection, in parallel. The staged rows are then merged into
+`movie` in a single transaction, deduplicated on movie.dedup_key (the first
+dataset, in file name order, wins; existing rows are left alone). When the
+catalog starts out empty the secondary indexes are dropped for the merge and
+rebuilt afterwards, which is much faster than maintaining them row by row.
+Finally the table is ANALYZEd and the cached genre list invalidated.
+
+Usage:
+    python scripts/seed_loader.py [--workers 4] [--rebuild-indexes] [backend/movies/drama.sql ...]
+"""
+import argparse
+import csv
+import glob
+import io
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import psycopg2
+from dotenv import load_dotenv
+
+from catalog_loader import DEDUP_KEY, STAGE_COLUMNS
+
+load_dotenv()
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+DATASET_DIR = os.path.join(BACKEND_DIR, 'movies')
+
+INSERT = re.compile(r'INSERT\s+INTO\s+movie\s*\(([^)]*)\)\s*VALUES', re.IGNORECASE)
+TOKEN = re.compile(r"""
+    (?:\s|--[^\n]*)*                   # whitespace and comments
+    (?:
+        (?P<string>'(?:[^']|'')*')
+      | (?P<null>NULL)\b
+      | (?P<number>-?\d+(?:\.\d+)?)
+      | (?P<open>\()
+      | (?P<close>\))
+      | (?P<comma>,)
+      | (?P<end>;)
+      | (?P<conflict>ON\s+CONFLICT\b(?:\s*\([^)]*\))?\s+DO\s+(?:NOTHING|UPDATE\b[^;]*)\s*;)
+    )""", re.IGNORECASE | re.VERBOSE)
+
+CREATE_STAGE = f"""
+    DROP TABLE IF EXISTS movie_seed;
+    CREATE UNLOGGED TABLE movie_seed (
+        dataset INTEGER NOT NULL,
+        seq INTEGER NOT NULL,
+        title VARCHAR(200) NOT NULL,
+        description TEXT,
+        director VARCHAR(100),
+        release_year INTEGER,
+        genre VARCHAR(50),
+        rating VARCHAR(10),
+        imdb_rating DECIMAL(3,1),
+        poster_url VARCHAR(500),
+        runtime_minutes INTEGER,
+        dedup_key TEXT GENERATED ALWAYS AS ({DEDUP_KEY}) STORED
+    )
+"""
+
+MERGE = f"""
+    INSERT INTO movie ({', '.join(STAGE_COLUMNS)})
+    SELECT DISTINCT ON (dedup_key) {', '.join(STAGE_COLUMNS)}
+    FROM movie_seed
+    ORDER BY dedup_key, dataset, seq
+    ON CONFLICT (dedup_key) DO NOTHING
+"""
+
+# Everything but the primary key and the dedup key (which ON CONFLICT needs)
+SECONDARY_INDEXES = """
+    SELECT i.indexname, i.indexdef
+    FROM pg_indexes i
+    JOIN pg_class c ON c.relname = i.indexname
+    JOIN pg_index x ON x.indexrelid = c.oid
+    WHERE i.tablename = 'movie' AND NOT x.indisprimary AND i.indexname <> 'uq_movie_dedup_key'
+"""
+
+
+def connect_db():
+    """Connect to PostgreSQL database"""
+    return psycopg2.connect(
+        host=os.getenv('DB_HOST', 'localhost'),
+        database=os.getenv('DB_NAME', 'movies_dev'),
+        user=os.getenv('DB_USER', os.getenv('USER')),
+        password=os.getenv('DB_PASSWORD', ''),
+        port=os.getenv('DB_PORT', '5432')
+    )
+
+
+def parse_dataset(path):
+    """
+    Rows of the INSERT INTO movie statements in a seed SQL file
+
+    Returns:
+        list: One dict per VALUES tuple, keyed by the statement's column list
+
+    Raises:
+        ValueError: On a tuple that doesn't match its column list, or on
+            anything but VALUES tuples up to ';' or an ON CONFLICT clause
+    """
+    with open(path, encoding='utf-8') as f:
+        sql = f.read()
+
+    def error(pos, message):
+        line = sql.count('\n', 0, pos) + 1
+        return ValueError(f"{os.path.basename(path)}:{line}: {message}")
+
+    rows = []
+    for statement in INSERT.finditer(sql):
+        columns = [c.strip() for c in statement.group(1).split(',')]
+        pos, row = statement.end(), None
+        # The statement ends at ';' or at its ON CONFLICT clause; anything
+        # else unrecognised is an error rather than a silent early stop
+        while True:
+            token = TOKEN.match(sql, pos)
+            if not token:
+                rest = sql[pos:].strip()
+                raise error(pos, f"unexpected {rest[:20]!r} in INSERT" if rest else "INSERT without ';'")
+            pos = token.end()
+            kind, text = token.lastgroup, token.group(token.lastgroup)
+            if kind in ('end', 'conflict'):
+                if row is not None:
+                    raise error(pos, "unclosed VALUES tuple")
+                break
+            if kind == 'open':
+                if row is not None:
+                    raise error(pos, "nested '(' in VALUES")
+                row = []
+            elif kind == 'close':
+                if row is None:
+                    raise error(pos, "')' outside a VALUES tuple")
+                if len(row) != len(columns):
+                    raise error(pos, f"{len(row)} values for {len(columns)} columns")
+                rows.append(dict(zip(columns, row)))
+                row = None
+            elif kind != 'comma' and row is None:
+                raise error(pos, "value outside a VALUES tuple")
+            elif kind == 'string':
+                row.append(text[1:-1].replace("''", "'"))
+            elif kind == 'number':
+                row.append(text)
+            elif kind == 'null':
+                row.append(None)
+    return rows
+
+
+def copy_dataset(dataset, path):
+    """Parse one dataset and COPY it into movie_seed on a dedicated connection"""
+    started = time.perf_counter()
+    rows = parse_dataset(path)
+    parsed = time.perf_counter()
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for seq, row in enumerate(rows):
+        writer.writerow([dataset, seq] + ['' if row.get(c) is None else row[c] for c in STAGE_COLUMNS])
+    buffer.seek(0)
+
+    conn = connect_db()
+    try:
+        with conn.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY movie_seed (dataset, seq, {', '.join(STAGE_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+        conn.commit()
+    finally:
+        conn.close()
+
+    return {
+        'name': os.path.basename(path),
+        'rows': len(rows),
+        'parse_ms': (parsed - started) * 1000,
+        'copy_ms': (time.perf_counter() - parsed) * 1000,
+    }
+
+
+def merge(conn, rebuild_indexes=None):
+    """
+    Merge movie_seed into movie in one transaction
+
+    Args:
+        conn: psycopg2 connection (committed)
+        rebuild_indexes: Drop and rebuild secondary indexes around the merge;
+                         None decides by whether the catalog is empty
+
+    Returns:
+        dict: 'inserted' count, 'indexes' rebuilt and per-step timings in ms
+    """
+    timings = {}
+    with conn.cursor() as cursor:
+        if rebuild_indexes is None:
+            cursor.execute("SELECT NOT EXISTS (SELECT 1 FROM movie)")
+            rebuild_indexes = cursor.fetchone()[0]
+
+        indexes = []
+        if rebuild_indexes:
+            cursor.execute(SECONDARY_INDEXES)
+            indexes = cursor.fetchall()
+            for name, _ in indexes:
+                cursor.execute(f'DROP INDEX "{name}"')
+
+        started = time.perf_counter()
+        cursor.execute(MERGE)
+        inserted = cursor.rowcount
+        timings['merge_ms'] = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        for _, definition in indexes:
+            cursor.execute(definition)
+        timings['index_ms'] = (time.perf_counter() - started) * 1000
+    conn.commit()
+
+    # ANALYZE outside the merge transaction so planner stats see the new rows
+    started = time.perf_counter()
+    with conn.cursor() as cursor:
+        cursor.execute("ANALYZE movie")
+    conn.commit()
+    timings['analyze_ms'] = (time.perf_counter() - started) * 1000
+
+    return {'inserted': inserted, 'indexes': [name for name, _ in indexes], **timings}
+
+
+def clear_catalog_cache():
+    """Drop the cached genre list (only reachable for shared cache backends)"""
+    sys.path.insert(0, os.path.join(BACKEND_DIR, 'src'))
+    from app import create_app
+
+    app = create_app()
+    with app.app_context():
+        app.cache_manager.clear_catalog()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load seed movie datasets in parallel')
+    parser.add_argument('datasets', nargs='*', help='Seed SQL files (default: backend/movies/*.sql)')
+    parser.add_argument('--workers', type=int, default=4, help='Datasets parsed and copied at once')
+    rebuild = parser.add_mutually_exclusive_group()
+    rebuild.add_argument('--rebuild-indexes', dest='rebuild_indexes', action='store_true', default=None,
+                         help='Drop and rebuild secondary indexes around the merge (default: only when empty)')
+    rebuild.add_argument('--keep-indexes', dest='rebuild_indexes', action='store_false')
+    args = parser.parse_args()
+
+    paths = args.datasets or sorted(glob.glob(os.path.join(DATASET_DIR, '*.sql')))
+    if not paths:
+        sys.exit(f"✗ No datasets found in {DATASET_DIR}")
+
+    started = time.perf_counter()
+    conn = connect_db()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(CREATE_STAGE)
+        conn.commit()
+
+        print(f"Loading {len(paths)} datasets with {args.workers} workers...")
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            reports = list(pool.map(copy_dataset, range(len(paths)), paths))
+        for report in reports:
+            print(f"  ✓ {report['name']:<28} {report['rows']:>6} rows  "
+                  f"parse {report['parse_ms']:7.1f} ms  copy {report['copy_ms']:7.1f} ms")
+
+        result = merge(conn, args.rebuild_indexes)
+    finally:
+        # A failed merge leaves the transaction aborted; the drop needs a fresh one
+        conn.rollback()
+        with conn.cursor() as cursor:
+            cursor.execute("DROP TABLE IF EXISTS movie_seed")
+        conn.commit()
+        conn.close()
+
+    staged = sum(report['rows'] for report in reports)
+    print(f"\nMerge: {result['inserted']} inserted, {staged - result['inserted']} duplicates skipped "
+          f"({result['merge_ms']:.1f} ms)")
+    if result['indexes']:
+        print(f"Rebuilt {len(result['indexes'])} indexes ({result['index_ms']:.1f} ms): {', '.join(result['indexes'])}")
+    print(f"ANALYZE movie ({result['analyze_ms']:.1f} ms)")
+
+    clear_catalog_cache()
+    print(f"✓ Loaded {staged} rows from {len(paths)} datasets in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
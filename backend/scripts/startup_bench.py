@@ -0,0 +1,119 @@
+"""
+Startup time benchmark for the backend.
+
+Boots the app the way a gunicorn worker or a `flask` CLI command does
+(import app, create_app()) in fresh interpreters, reports the median boot
+time and the slowest imports from `python -X importtime`, and exits non-zero
+when boot exceeds the budget or a dependency meant to load lazily is
+imported eagerly.
+
+Usage:
+    python scripts/startup_bench.py [--runs 5] [--budget-ms 1500] [--top 15]
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+# Loaded on first use only; seeing them at boot is a regression. (jinja2
+# itself is always imported by Flask; only our template environment is lazy.)
+LAZY_MODULES = ('anthropic', 'sendgrid', 'PIL')
+
+BOOT = """
+import json, sys, time
+started = time.perf_counter()
+from app import create_app
+create_app()
+elapsed = (time.perf_counter() - started) * 1000
+print(json.dumps({'ms': elapsed, 'eager': [m for m in sys.argv[1:] if m in sys.modules]}))
+"""
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def boot(extra_flags=()):
+    """Boot the app once in a fresh interpreter"""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, *extra_flags, '-c', BOOT, *LAZY_MODULES],
+        cwd=SRC_DIR, capture_output=True, text=True,
+    )
+    wall = (time.perf_counter() - started) * 1000
+    if result.returncode != 0:
+        print(result.stderr)
+        sys.exit(f"✗ App failed to boot (exit {result.returncode})")
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report['wall_ms'] = wall
+    report['stderr'] = result.stderr
+    return report
+
+
+def parse_importtime(stderr):
+    """
+    Parse `-X importtime` output
+
+    Returns:
+        list: (module, self_ms, cumulative_ms, depth) per imported module
+    """
+    rows = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us) / 1000, int(cumulative_us) / 1000, len(indent) // 2))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure backend cold start and import cost')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=float(os.getenv('STARTUP_BUDGET_MS', 1500)),
+                        help='Fail when the median boot exceeds this (default: $STARTUP_BUDGET_MS or 1500)')
+    parser.add_argument('--top', type=int, default=15, help='Number of slowest imports to list')
+    args = parser.parse_args()
+
+    # First run writes bytecode caches; it isn't counted
+    boot()
+    runs = [boot() for _ in range(args.runs)]
+    boot_ms = statistics.median(run['ms'] for run in runs)
+    wall_ms = statistics.median(run['wall_ms'] for run in runs)
+
+    rows = parse_importtime(boot(['-X', 'importtime'])['stderr'])
+    # Depth 1 = what `app` (and other top-level imports) pull in directly
+    top_level = sorted((r for r in rows if r[3] == 1), key=lambda r: -r[2])
+    by_self = sorted(rows, key=lambda r: -r[1])
+
+    print(f"Slowest direct imports (cumulative, {len(rows)} modules total):")
+    for module, _, cumulative, _ in top_level[:args.top]:
+        print(f"  {cumulative:8.1f} ms  {module}")
+    print("\nSlowest modules by own import time:")
+    for module, self_ms, _, _ in by_self[:args.top]:
+        print(f"  {self_ms:8.1f} ms  {module}")
+
+    print("\n" + "=" * 60)
+    print(f"Boot (import app + create_app): {boot_ms:.0f} ms median of {args.runs}")
+    print(f"Process wall time:              {wall_ms:.0f} ms median")
+    print(f"Budget:                         {args.budget_ms:.0f} ms")
+
+    failures = []
+    eager = sorted({module for run in runs for module in run['eager']})
+    if eager:
+        failures.append(f"imported eagerly at boot: {', '.join(eager)}")
+    if boot_ms > args.budget_ms:
+        failures.append(f"boot {boot_ms:.0f} ms exceeds budget {args.budget_ms:.0f} ms")
+
+    if failures:
+        for failure in failures:
+            print(f"✗ {failure}")
+        sys.exit(1)
+    print("✓ Startup within budget")
+
+
+if __name__ == '__main__':
+    main()
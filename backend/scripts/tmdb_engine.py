@@ -0,0 +1,407 @@
+"""
+Concurrent, rate-limited TMDB fetcher shared by the ingestion scripts.
+
+Requests go through one pooled requests.Session, are paced by a token bucket
+matched to TMDB's limits (~50 requests/second and 20 connections per IP;
+we default a little under both) and are retried with exponential backoff on
+429, 5xx and connection errors. Point TMDB_BASE_URL at scripts/mock_tmdb.py
+to run everything locally.
+
+Usage (throughput check, no database):
+    python scripts/tmdb_engine.py --count 500 --concurrency 8
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+load_dotenv()
+
+TMDB_API_KEY = os.getenv('TMDB_API_KEY')
+BASE_URL = os.getenv('TMDB_BASE_URL', 'https://api.themoviedb.org/3')
+IMAGE_BASE_URL = 'https://image.tmdb.org/t/p/w500'
+
+DEFAULT_RATE = float(os.getenv('TMDB_RATE_LIMIT', 40))          # requests per second
+DEFAULT_BURST = int(os.getenv('TMDB_RATE_BURST', 20))
+DEFAULT_CONCURRENCY = int(os.getenv('TMDB_CONCURRENCY', 8))     # TMDB allows 20 connections/IP
+DEFAULT_MAX_RETRIES = int(os.getenv('TMDB_MAX_RETRIES', 5))
+DEFAULT_CACHE_DIR = os.getenv('TMDB_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'movies-tmdb'))
+
+RESULTS_PER_PAGE = 20
+MAX_PAGES = 500  # TMDB caps list endpoints at 500 pages
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# What parse_movie raises on a malformed detail payload
+PARSE_ERRORS = (AttributeError, IndexError, KeyError, TypeError, ValueError)
+CATEGORIES = ('popular', 'top_rated', 'now_playing', 'upcoming')
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, up to `capacity` banked"""
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self):
+        """Take a token if one is available; never blocks"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class TMDBError(Exception):
+    """Raised when a request still fails after all retries"""
+
+
+class TMDBClient:
+    """Pooled, rate-limited TMDB API client with retry and backoff"""
+
+    def __init__(self, api_key=None, base_url=None, rate=DEFAULT_RATE, burst=DEFAULT_BURST,
+                 concurrency=DEFAULT_CONCURRENCY, max_retries=DEFAULT_MAX_RETRIES, timeout=10):
+        """
+        Args:
+            api_key: TMDB API key (defaults to TMDB_API_KEY)
+            base_url: API root (defaults to TMDB_BASE_URL)
+            rate: Sustained requests per second
+            burst: Requests allowed back to back before pacing kicks in
+            concurrency: Connection pool size, match to the worker count
+            max_retries: Attempts after the first for retryable failures
+            timeout: Per-request timeout in seconds
+        """
+        self.api_key = api_key or TMDB_API_KEY
+        self.base_url = (base_url or BASE_URL).rstrip('/')
+        self.bucket = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'retries': 0, 'rate_limited': 0, 'failures': 0}
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def get(self, path, **params):
+        """
+        GET a TMDB endpoint and return its JSON body
+
+        Raises:
+            TMDBError: After max_retries retryable failures, or on a 4xx
+        """
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        params = {'api_key': self.api_key, **params}
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            self._count('requests')
+            retry_after = None
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+                if response.status_code not in RETRY_STATUSES:
+                    if response.status_code >= 400:
+                        self._count('failures')
+                        raise TMDBError(f"{response.status_code} for {path}")
+                    return response.json()
+                if response.status_code == 429:
+                    self._count('rate_limited')
+                    retry_after = response.headers.get('Retry-After')
+                error = f"{response.status_code} for {path}"
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = str(e)
+
+            if attempt == self.max_retries:
+                break
+            self._count('retries')
+            # Honour Retry-After, otherwise exponential backoff with full jitter
+            delay = float(retry_after) if retry_after else random.uniform(0, min(30, 0.5 * 2 ** attempt))
+            time.sleep(delay)
+
+        self._count('failures')
+        raise TMDBError(f"Giving up after {self.max_retries + 1} attempts: {error}")
+
+    def list_page(self, category, page):
+        return self.get(f'movie/{category}', page=page, language='en-US')
+
+    def details(self, tmdb_id):
+        return self.get(f'movie/{tmdb_id}', append_to_response='credits,release_dates')
+
+    def search(self, title, year=None):
+        params = {'query': title}
+        if year:
+            params['year'] = year
+        return self.get('search/movie', **params)
+
+
+class DiskCache:
+    """
+    Detail payloads on local disk, one JSON file per TMDB id
+
+    Files are written to a temp name and renamed, so an interrupted run
+    never leaves a truncated payload behind.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_age_seconds=None):
+        self.directory = directory
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def _path(self, tmdb_id):
+        return os.path.join(self.directory, str(tmdb_id % 100).zfill(2), f"{tmdb_id}.json")
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def get(self, tmdb_id):
+        path = self._path(tmdb_id)
+        try:
+            if self.max_age_seconds and time.time() - os.path.getmtime(path) > self.max_age_seconds:
+                self._count('misses')
+                return None
+            with open(path) as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            self._count('misses')
+            return None
+        self._count('hits')
+        return payload
+
+    def delete(self, tmdb_id):
+        try:
+            os.remove(self._path(tmdb_id))
+        except FileNotFoundError:
+            pass
+
+    def set(self, tmdb_id, payload):
+        path = self._path(tmdb_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(payload, f)
+        os.replace(tmp, path)
+
+    def wrap(self, fetch, check=None):
+        """
+        Read-through wrapper for a fetch(tmdb_id) callable
+
+        Args:
+            fetch: callable(tmdb_id) -> payload
+            check: Optional callable(payload), e.g. parse_movie, that raises
+                one of PARSE_ERRORS on unusable payloads. Those are never
+                cached, and a cached one is fetched again.
+        """
+        def usable(payload):
+            if check is None:
+                return True
+            try:
+                check(payload)
+            except PARSE_ERRORS:
+                return False
+            return True
+
+        def cached_fetch(tmdb_id):
+            payload = self.get(tmdb_id)
+            if payload is not None and usable(payload):
+                return payload
+            payload = fetch(tmdb_id)
+            if usable(payload):
+                self.set(tmdb_id, payload)
+            else:
+                self.delete(tmdb_id)
+            return payload
+        return cached_fetch
+
+
+def parse_movie(details):
+    """Map a TMDB detail payload (with credits,release_dates) to a movie row dict"""
+    # Extract director
+    director = None
+    for person in details.get('credits', {}).get('crew', []):
+        if person['job'] == 'Director':
+            director = person['name']
+            break
+
+    # Extract US rating
+    rating = None
+    for country in details.get('release_dates', {}).get('results', []):
+        if country['iso_3166_1'] == 'US':
+            if country['release_dates']:
+                rating = country['release_dates'][0].get('certification') or None
+            break
+
+    # Get primary genre
+    genre = details['genres'][0].get('name') if details.get('genres') else None
+
+    return {
+        'tmdb_id': details.get('id'),
+        'title': details.get('title'),
+        'description': details.get('overview'),
+        'director': director,
+        'release_year': int(details['release_date'][:4]) if details.get('release_date') else None,
+        'genre': genre,
+        'rating': rating,
+        'imdb_rating': details.get('vote_average'),
+        'poster_url': f"{IMAGE_BASE_URL}{details['poster_path']}" if details.get('poster_path') else None,
+        'runtime_minutes': details.get('runtime'),
+    }
+
+
+def fetch_ids(client, category, pages, concurrency=DEFAULT_CONCURRENCY):
+    """
+    TMDB ids listed on the given pages of a category, in page order, deduplicated
+
+    Returns:
+        tuple: (ids, failed_pages)
+    """
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda page: _safe_page(client, category, page), pages))
+    seen, ids, failed_pages = set(), [], []
+    for page, page_results in zip(pages, results):
+        if page_results is None:
+            failed_pages.append(page)
+            continue
+        for item in page_results:
+            if item['id'] not in seen:
+                seen.add(item['id'])
+                ids.append(item['id'])
+    return ids, failed_pages
+
+
+def _safe_page(client, category, page):
+    """A list page's results, or None when the page could not be read"""
+    try:
+        return [item for item in client.list_page(category, page)['results'] if 'id' in item]
+    except (TMDBError, *PARSE_ERRORS) as e:
+        print(f"  ✗ Page {page}: {e!r}")
+        return None
+
+
+def fetch_details(client, tmdb_ids, concurrency=DEFAULT_CONCURRENCY, fetch=None, on_movie=None):
+    """
+    Fetch and parse detail payloads concurrently
+
+    Args:
+        client: TMDBClient
+        tmdb_ids: Ids to fetch
+        concurrency: Worker threads (keep <= the client's pool size)
+        fetch: Optional callable(tmdb_id) -> payload, e.g. a caching wrapper
+        on_movie: Optional callback(movie, done, total) as results arrive
+
+    Returns:
+        tuple: (movies, failed) where failed maps tmdb_id -> error message
+    """
+    fetch = fetch or client.details
+    movies, failed = [], {}
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {pool.submit(fetch, tmdb_id): tmdb_id for tmdb_id in tmdb_ids}
+        for future in as_completed(futures):
+            try:
+                movie = parse_movie(future.result())
+            except TMDBError as e:
+                print(f"  ✗ {futures[future]}: {e}")
+                failed[futures[future]] = str(e)
+                continue
+            except PARSE_ERRORS as e:
+                # A malformed payload fails this id only, not the whole batch
+                print(f"  ✗ {futures[future]}: unparseable payload ({e!r})")
+                failed[futures[future]] = f"unparseable payload: {e!r}"
+                continue
+            movies.append(movie)
+            if on_movie:
+                on_movie(movie, len(movies), len(tmdb_ids))
+    return movies, failed
+
+
+def random_pages(num_movies):
+    """Random, distinct list pages with enough results for num_movies"""
+    pages_needed = min(num_movies // RESULTS_PER_PAGE + 1, MAX_PAGES)
+    return random.sample(range(1, MAX_PAGES + 1), pages_needed)
+
+
+def fetch_movies(client, num_movies=10, category='popular', pages=None, concurrency=DEFAULT_CONCURRENCY):
+    """
+    Fetch up to num_movies parsed movies from a TMDB list category
+
+    Returns:
+        tuple: (movies, report) where report has counts, elapsed seconds and movies/sec
+    """
+    started = time.perf_counter()
+    ids, _ = fetch_ids(client, category, pages or random_pages(num_movies), concurrency)
+    ids = ids[:num_movies]
+    movies, failed = fetch_details(
+        client, ids, concurrency,
+        on_movie=lambda movie, done, total: print(f"  [{done}/{total}] {movie['title']} ({movie['release_year']})"),
+    )
+    return movies, throughput_report(client, started, len(movies), len(failed))
+
+
+def throughput_report(client, started, fetched, failed):
+    elapsed = time.perf_counter() - started
+    return {
+        'movies': fetched,
+        'failed': failed,
+        'elapsed_seconds': round(elapsed, 2),
+        'movies_per_second': round(fetched / elapsed, 2) if elapsed else 0.0,
+        **client.stats,
+    }
+
+
+def print_report(report):
+    print("\n" + "-" * 80)
+    print(f"✓ {report['movies']} movies in {report['elapsed_seconds']}s "
+          f"({report['movies_per_second']} movies/sec) | failed: {report['failed']} | "
+          f"requests: {report['requests']}, retries: {report['retries']}, 429s: {report['rate_limited']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure TMDB fetch throughput (no database writes)')
+    parser.add_argument('--count', type=int, default=200)
+    parser.add_argument('--category', choices=CATEGORIES, default='popular')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE, help='Requests per second')
+    parser.add_argument('--burst', type=int, default=DEFAULT_BURST)
+    parser.add_argument('--base-url', default=None, help='Override TMDB_BASE_URL, e.g. http://127.0.0.1:8090/3')
+    args = parser.parse_args()
+
+    client = TMDBClient(base_url=args.base_url, rate=args.rate, burst=args.burst, concurrency=args.concurrency)
+    _, report = fetch_movies(client, args.count, args.category, concurrency=args.concurrency)
+    print_report(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,17 +1,31 @@
+"""
+Fetch movies from TMDB and load them into the catalog.
+
+Without arguments this runs the interactive prompt. With arguments it runs
+as a non-interactive, resumable batch suitable for cron or a job runner:
+TMDB ids already loaded (tmdb_ingest checkpoint) are skipped without being
+fetched, and detail payloads are cached on disk so re-ingests are cheap.
+
+Usage:
+    python scripts/tmdb_fetch.py --category top_rated --pages 1-50 --count 1000 --concurrency 8
+"""
+import argparse
 import os
-import random
-import requests
+import sys
+import time
 import psycopg2
-from time import sleep
+from collections import Counter
 from dotenv import load_dotenv
+from catalog_loader import load_movies, loaded_tmdb_ids, record_failures
+from tmdb_engine import (
+    CATEGORIES, DEFAULT_BURST, DEFAULT_CACHE_DIR, DEFAULT_CONCURRENCY, DEFAULT_RATE, MAX_PAGES,
+    TMDB_API_KEY, DiskCache, TMDBClient, fetch_details, fetch_ids, parse_movie, print_report, random_pages,
+    throughput_report,
+)
+import tmdb_engine
 
 load_dotenv()
 
-# Configuration
-TMDB_API_KEY = os.getenv('TMDB_API_KEY')
-BASE_URL = 'https://api.themoviedb.org/3'
-IMAGE_BASE_URL = 'https://image.tmdb.org/t/p/w500'
-
 # Map choice to endpoint
 category_map = {
     '1': 'popular',
@@ -30,128 +44,13 @@ def connect_db():
         port=os.getenv('DB_PORT', '5432')
     )
 
-def check_movie_exists(cursor, title, release_year):
-    """Check if movie already exists in database"""
-    cursor.execute(
-        "SELECT id FROM movie WHERE title = %s AND release_year = %s",
-        (title, release_year)
-    )
-    return cursor.fetchone() is not None
-
-def insert_movie(cursor, conn, movie):
-    """Insert movie into database"""
-    try:
-        cursor.execute("""
-            INSERT INTO movie (
-                title, description, director, release_year, 
-                genre, rating, imdb_rating, poster_url, runtime_minutes
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            RETURNING id
-        """, (
-            movie['title'],
-            movie['description'],
-            movie['director'],
-            movie['release_year'],
-            movie['genre'],
-            movie['rating'],
-            movie['imdb_rating'],
-            movie['poster_url'],
-            movie['runtime_minutes']
-        ))
-        conn.commit()
-        movie_id = cursor.fetchone()[0]
-        return movie_id
-    except Exception as e:
-        conn.rollback()
-        print(f"    ✗ Error inserting movie: {e}")
-        return None
-
 def fetch_movies(num_movies=10, category="popular"):
-    """Fetch popular movies from TMDB API"""
-    movies = []
-    pages_needed = (num_movies // 20) + 1
-    
+    """Fetch movies from a TMDB list with the concurrent, rate-limited engine"""
     print(f"\nFetching {num_movies} movies from TMDB...")
     print("-" * 80)
-    
-    # Generate unique random page numbers
-    random_pages = random.sample(range(1, 501), pages_needed)  # TMDB has ~500 pages
 
-    for page in random_pages:
-        url = f"{BASE_URL}/movie/{category}"
-        params = {
-            'api_key': TMDB_API_KEY,
-            'page': page,
-            'language': 'en-US'
-        }
-        
-        try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            for movie_data in data['results']:
-                if len(movies) >= num_movies:
-                    break
-                
-                # Fetch detailed movie info
-                movie_id = movie_data['id']
-                detail_url = f"{BASE_URL}/movie/{movie_id}"
-                detail_params = {
-                    'api_key': TMDB_API_KEY,
-                    'append_to_response': 'credits,release_dates'
-                }
-                
-                detail_response = requests.get(detail_url, params=detail_params)
-                detail_response.raise_for_status()
-                details = detail_response.json()
-                
-                # Extract director
-                director = None
-                if 'credits' in details and 'crew' in details['credits']:
-                    for person in details['credits']['crew']:
-                        if person['job'] == 'Director':
-                            director = person['name']
-                            break
-                
-                # Extract US rating
-                rating = None
-                if 'release_dates' in details and 'results' in details['release_dates']:
-                    for country in details['release_dates']['results']:
-                        if country['iso_3166_1'] == 'US':
-                            if country['release_dates']:
-                                rating = country['release_dates'][0].get('certification')
-                            break
-                
-                # Get primary genre
-                genre = details.get('genres', [{}])[0].get('name') if details.get('genres') else None
-                
-                # Build movie object
-                movie = {
-                    'title': details.get('title'),
-                    'description': details.get('overview'),
-                    'director': director,
-                    'release_year': int(details.get('release_date', '0000')[:4]) if details.get('release_date') else None,
-                    'genre': genre,
-                    'rating': rating,
-                    'imdb_rating': details.get('vote_average'),
-                    'poster_url': f"{IMAGE_BASE_URL}{details['poster_path']}" if details.get('poster_path') else None,
-                    'runtime_minutes': details.get('runtime')
-                }
-                
-                movies.append(movie)
-                print(f"  [{len(movies)}/{num_movies}] {movie['title']} ({movie['release_year']})")
-                
-                # Rate limiting
-                sleep(0.25)
-                
-            if len(movies) >= num_movies:
-                break
-                
-        except requests.exceptions.RequestException as e:
-            print(f"✗ Error fetching movies: {e}")
-            break
-    
+    movies, report = tmdb_engine.fetch_movies(TMDBClient(), num_movies, category)
+    print_report(report)
     return movies
 
 def display_movies(movies):
@@ -170,7 +69,7 @@ def display_movies(movies):
             desc = movie['description'][:150]
             print(f"    Description: {desc}{'...' if len(movie['description']) > 150 else ''}")
 
-def main():
+def interactive():
     # Check API key
     if not TMDB_API_KEY:
         print("✗ ERROR: TMDB_API_KEY not found in environment!")
@@ -229,29 +128,17 @@ def main():
         insert = input("Insert these movies into the database? (yes/no): ").strip().lower()
         
         if insert in ['yes', 'y']:
-            print("\nInserting movies into database...")
+            print("\nLoading movies into database...")
             print("-" * 80)
-            
-            inserted_count = 0
-            skipped_count = 0
-            
-            for i, movie in enumerate(movies, 1):
-                # Check if movie exists
-                if check_movie_exists(cursor, movie['title'], movie['release_year']):
-                    print(f"  [{i}/{len(movies)}] {movie['title']} ({movie['release_year']}) - Already exists, skipping")
-                    skipped_count += 1
-                    continue
-                
-                # Insert movie
-                movie_id = insert_movie(cursor, conn, movie)
-                if movie_id:
-                    print(f"  [{i}/{len(movies)}] {movie['title']} ({movie['release_year']}) - ✓ Inserted (ID: {movie_id})")
-                    inserted_count += 1
-                else:
-                    skipped_count += 1
-            
-            print("\n" + "-" * 80)
-            print(f"✓ Inserted: {inserted_count} | Skipped: {skipped_count} | Total: {len(movies)}")
+
+            try:
+                result = load_movies(conn, movies)
+            except Exception as e:
+                print(f"✗ Error loading movies: {e}")
+                break
+
+            print(f"✓ Inserted: {result['inserted']} | Updated: {result['updated']} | "
+                  f"Skipped: {result['skipped']} | Total: {len(movies)}")
             
             # Ask to continue
             print("\n" + "=" * 80)
@@ -266,5 +153,95 @@ def main():
     conn.close()
     print("\n✓ Complete!")
 
+def parse_pages(spec):
+    """Parse a page spec such as '1-25,40,50-60' into a sorted list of pages"""
+    pages = set()
+    for part in spec.split(','):
+        start, _, end = part.strip().partition('-')
+        first, last = int(start), int(end or start)
+        if not 1 <= first <= last <= MAX_PAGES:
+            raise argparse.ArgumentTypeError(f"Invalid page range: {part} (pages are 1-{MAX_PAGES})")
+        pages.update(range(first, last + 1))
+    return sorted(pages)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Resumable, non-interactive TMDB catalog ingestion')
+    parser.add_argument('--category', choices=CATEGORIES, default='popular')
+    parser.add_argument('--count', type=int, default=None,
+                        help='Maximum number of movies to ingest (default: everything on the pages)')
+    parser.add_argument('--pages', type=parse_pages, default=None,
+                        help="List pages to read, e.g. '1-25,40' (default: random pages for --count)")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE, help='Requests per second')
+    parser.add_argument('--burst', type=int, default=DEFAULT_BURST)
+    parser.add_argument('--batch-size', type=int, default=200, help='Movies per load transaction')
+    parser.add_argument('--refresh', action='store_true', help='Re-ingest ids already loaded')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='Detail payload cache directory')
+    parser.add_argument('--cache-max-age-days', type=float, default=None, help='Refetch cached payloads older than this')
+    parser.add_argument('--no-cache', action='store_true', help='Always fetch details from TMDB')
+    args = parser.parse_args(argv)
+    if args.count is None and args.pages is None:
+        parser.error('give --count, --pages or both')
+    return args
+
+
+def run_batch(args):
+    """
+    Ingest one batch run
+
+    Returns:
+        int: Process exit code (1 if any id or list page failed; rerunning retries them)
+    """
+    if not TMDB_API_KEY:
+        print("✗ ERROR: TMDB_API_KEY not found in environment!")
+        return 2
+
+    client = TMDBClient(rate=args.rate, burst=args.burst, concurrency=args.concurrency)
+    fetch = client.details
+    cache = None
+    if not args.no_cache:
+        max_age = args.cache_max_age_days * 86400 if args.cache_max_age_days else None
+        cache = DiskCache(args.cache_dir, max_age)
+        fetch = cache.wrap(client.details, check=parse_movie)
+
+    conn = connect_db()
+    started = time.perf_counter()
+    pages = args.pages or random_pages(args.count)
+    listed, failed_pages = fetch_ids(client, args.category, pages, args.concurrency)
+    done = set() if args.refresh else loaded_tmdb_ids(conn, listed)
+    todo = [tmdb_id for tmdb_id in listed if tmdb_id not in done][:args.count]
+    print(f"{args.category}: {len(listed)} ids on {len(pages)} pages, "
+          f"{len(done)} already ingested, {len(todo)} to process")
+
+    totals = Counter()
+    failures = {}
+    for offset in range(0, len(todo), args.batch_size):
+        batch = todo[offset:offset + args.batch_size]
+        movies, failed = fetch_details(client, batch, args.concurrency, fetch=fetch)
+        result = load_movies(conn, movies)
+        record_failures(conn, failed)
+        totals.update(result)
+        failures.update(failed)
+        print(f"  [{offset + len(batch)}/{len(todo)}] inserted {result['inserted']}, "
+              f"updated {result['updated']}, skipped {result['skipped']}, failed {len(failed)}")
+    conn.close()
+
+    print_report(throughput_report(client, started, len(todo) - len(failures), len(failures)))
+    print(f"✓ Inserted: {totals['inserted']} | Updated: {totals['updated']} | "
+          f"Skipped: {totals['skipped'] + len(done)} | Failed: {len(failures)}")
+    if failed_pages:
+        print(f"✗ Unreadable list pages (their movies were not ingested): {failed_pages}")
+    if cache:
+        print(f"  Detail cache: {cache.stats['hits']} hits, {cache.stats['misses']} misses ({cache.directory})")
+    return 1 if failures or failed_pages else 0
+
+
+def main():
+    if len(sys.argv) == 1:
+        return interactive()
+    sys.exit(run_batch(parse_args()))
+
+
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
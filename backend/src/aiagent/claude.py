@@ -1,18 +1,22 @@
 import os
 import re
 import json
-from anthropic import Anthropic
+import time
+from flask import current_app
+from utils.metrics import observe_claude
 
 # Default configuration constants
 DEFAULT_MODEL = "claude-sonnet-4-20250514"
 DEFAULT_MAX_TOKENS = 300
 INPUT_TOKEN_COST = 0.000003
 OUTPUT_TOKEN_COST = 0.000015
+BACKEND_ANTHROPIC = 'anthropic'
+BACKEND_STUB = 'stub'
 
 class ClaudeClient:
     """Wrapper for Claude API interactions"""
     
-    def __init__(self, api_key=None, model=DEFAULT_MODEL, max_tokens=DEFAULT_MAX_TOKENS):
+    def __init__(self, api_key=None, model=DEFAULT_MODEL, max_tokens=DEFAULT_MAX_TOKENS, backend=None):
         """
         Initialize Claude API client
         
@@ -20,8 +24,9 @@ class ClaudeClient:
             api_key: Anthropic API key (defaults to ANTHROPIC_API_KEY env var)
             model: Claude model to use
             max_tokens: Maximum tokens in response
+            backend: 'anthropic' or 'stub' (defaults to CLAUDE_BACKEND)
         """
-        self.client = Anthropic(api_key=api_key or os.environ.get("ANTHROPIC_API_KEY"))
+        self.client = self._make_client(api_key, backend or current_app.config['CLAUDE_BACKEND'])
         self.model = model
         self.max_tokens = max_tokens
         
@@ -33,6 +38,26 @@ class ClaudeClient:
         self._raw_response = None
         self._parsed_data = None
     
+    @staticmethod
+    def _make_client(api_key, backend):
+        """
+        Build the underlying Messages API client for the selected backend
+
+        The anthropic backend honours CLAUDE_BASE_URL, so it can also be
+        pointed at the local stub server (aiagent/stub_server.py).
+        """
+        if backend == BACKEND_STUB:
+            from aiagent.stub import StubAnthropic, StubProfile
+            return StubAnthropic(StubProfile.from_config(current_app.config))
+        if backend == BACKEND_ANTHROPIC:
+            # Heavy SDK (httpx, pydantic); only paid for by processes that call Claude
+            from anthropic import Anthropic
+            return Anthropic(
+                api_key=api_key or os.environ.get("ANTHROPIC_API_KEY"),
+                base_url=current_app.config['CLAUDE_BASE_URL'],
+            )
+        raise ValueError(f"Unknown Claude backend: {backend}")
+
     def configure(self, context, message):
         """
         Configure the instance with system context and user message
@@ -62,18 +87,23 @@ class ClaudeClient:
             raise ValueError("Messages not configured. Call configure() first.")
         
         # Make API call with caching
-        self._raw_response = self.client.messages.create(
-            model=self.model,
-            max_tokens=self.max_tokens,
-            system=[
-                {
-                    "type": "text",
-                    "text": self.system_context,
-                    "cache_control": {"type": "ephemeral"}
-                }
-            ],
-            messages=self.messages
-        )
+        started, outcome = time.perf_counter(), 'error'
+        try:
+            self._raw_response = self.client.messages.create(
+                model=self.model,
+                max_tokens=self.max_tokens,
+                system=[
+                    {
+                        "type": "text",
+                        "text": self.system_context,
+                        "cache_control": {"type": "ephemeral"}
+                    }
+                ],
+                messages=self.messages
+            )
+            outcome = 'ok'
+        finally:
+            observe_claude(self.model, outcome, time.perf_counter() - started)
         
         # Parse response
         self._parsed_data = self._parse_response(self._raw_response.content[0].text)
@@ -133,12 +163,12 @@ class ClaudeClient:
         # Fallback if JSON parsing fails
         return {'message': response_text, 'recommendations': []}
 
-    def get_usage_cost(self):
+    def get_usage(self):
         """
-        Calculate actual cost from the last API call
+        Token counts from the last API call
         
         Returns:
-            float: Cost in USD
+            dict: input, output, cache creation and cache read token counts
             
         Raises:
             RuntimeError: If query() hasn't been called yet
@@ -147,13 +177,35 @@ class ClaudeClient:
             raise RuntimeError("No response available. Call query() first.")
         
         usage = self._raw_response.usage
+        return {
+            'input_tokens': usage.input_tokens,
+            'output_tokens': usage.output_tokens,
+            'cache_creation_input_tokens': getattr(usage, 'cache_creation_input_tokens', 0) or 0,
+            'cache_read_input_tokens': getattr(usage, 'cache_read_input_tokens', 0) or 0,
+        }
+
+    def get_usage_cost(self):
+        """
+        Calculate actual cost from the last API call
+        
+        Returns:
+            float: Cost in USD
+            
+        Raises:
+            RuntimeError: If query() hasn't been called yet
+        """
+        usage = self.get_usage()
         
         # Regular tokens
-        input_cost = usage.input_tokens * INPUT_TOKEN_COST
-        output_cost = usage.output_tokens * OUTPUT_TOKEN_COST
+        input_cost = usage['input_tokens'] * INPUT_TOKEN_COST
+        output_cost = usage['output_tokens'] * OUTPUT_TOKEN_COST
         
         # Cache tokens (if present)
-        cache_creation_cost = getattr(usage, 'cache_creation_input_tokens', 0) * INPUT_TOKEN_COST
-        cache_read_cost = getattr(usage, 'cache_read_input_tokens', 0) * INPUT_TOKEN_COST * 0.1  # 90% discount
+        cache_creation_cost = usage['cache_creation_input_tokens'] * INPUT_TOKEN_COST
+        cache_read_cost = usage['cache_read_input_tokens'] * INPUT_TOKEN_COST * 0.1  # 90% discount
     
-        return input_cost + output_cost + cache_creation_cost + cache_read_cost
\ No newline at end of file
+        return input_cost + output_cost + cache_creation_cost + cache_read_cost
+
+    def has_response(self):
+        """Whether a query has completed on this client"""
+        return self._raw_response is not None
\ No newline at end of file
@@ -0,0 +1,230 @@
+"""Deterministic local stand-in for the Anthropic Messages API.
+
+Used for load and latency testing of the AI-backed paths without network
+access or spend. The stub reads the movie IDs out of the system context and
+answers with schema-correct JSON, so the rest of the pipeline (parsing,
+hydration, usage accounting) runs exactly as it does against the real API.
+"""
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+
+MOVIE_LINE_PATTERN = re.compile(r'^(?P<title>.+) \((?P<year>\d{4}|None)\) - (?P<genre>[^\n]*?) - ID:(?P<id>\d+)$', re.MULTILINE)
+LATENCY_DISTRIBUTIONS = ('fixed', 'uniform', 'normal', 'lognormal')
+CHARS_PER_TOKEN = 4
+MAX_CACHED_SYSTEMS = 10000
+
+
+class StubOverloadedError(RuntimeError):
+    """Injected failure, mirrors the API's 529 overloaded_error"""
+    status_code = 529
+    error_type = 'overloaded_error'
+
+
+class StubProfile:
+    """Latency, token and failure settings for the stub backend"""
+
+    def __init__(self, latency_dist='fixed', latency_ms=0.0, latency_jitter_ms=0.0,
+                 output_tokens=None, max_recommendations=3, failure_rate=0.0, seed=0):
+        """
+        Args:
+            latency_dist: One of LATENCY_DISTRIBUTIONS
+            latency_ms: Mean (or fixed) latency per call in milliseconds
+            latency_jitter_ms: Spread of the distribution (range/stddev/sigma scale)
+            output_tokens: Fixed output token count (None derives it from the reply)
+            max_recommendations: Upper bound of movies in each reply
+            failure_rate: Probability [0, 1] that a call raises StubOverloadedError
+            seed: Base seed of the reply RNGs and of the latency/failure draws
+        """
+        if latency_dist not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {latency_dist}")
+        self.latency_dist = latency_dist
+        self.latency_ms = float(latency_ms)
+        self.latency_jitter_ms = float(latency_jitter_ms)
+        self.output_tokens = output_tokens
+        self.max_recommendations = int(max_recommendations)
+        self.failure_rate = float(failure_rate)
+        self.seed = int(seed)
+
+    @classmethod
+    def from_config(cls, config):
+        """Build a profile from the CLAUDE_STUB_* settings in an app config"""
+        return cls(
+            latency_dist=config['CLAUDE_STUB_LATENCY_DIST'],
+            latency_ms=config['CLAUDE_STUB_LATENCY_MS'],
+            latency_jitter_ms=config['CLAUDE_STUB_LATENCY_JITTER_MS'],
+            output_tokens=config['CLAUDE_STUB_OUTPUT_TOKENS'],
+            max_recommendations=config['CLAUDE_STUB_MAX_RECOMMENDATIONS'],
+            failure_rate=config['CLAUDE_STUB_FAILURE_RATE'],
+            seed=config['CLAUDE_STUB_SEED'],
+        )
+
+    def sample_latency(self, rng):
+        """Draw a latency in seconds from the configured distribution"""
+        mean, jitter = self.latency_ms, self.latency_jitter_ms
+        if self.latency_dist == 'fixed' or mean <= 0:
+            ms = mean
+        elif self.latency_dist == 'uniform':
+            ms = rng.uniform(mean - jitter, mean + jitter)
+        elif self.latency_dist == 'normal':
+            ms = rng.gauss(mean, jitter)
+        else:
+            # lognormal with the given mean; jitter is sigma scaled to ms
+            sigma = jitter / mean if mean else 0
+            ms = rng.lognormvariate(math.log(mean) - sigma ** 2 / 2, sigma)
+        return max(ms, 0.0) / 1000.0
+
+
+def estimate_tokens(text):
+    """Rough token estimate used for usage reporting (~4 chars per token)"""
+    return max(1, math.ceil(len(text) / CHARS_PER_TOKEN)) if text else 0
+
+
+def _system_text(system):
+    if isinstance(system, str):
+        return system
+    return "\n".join(block.get('text', '') for block in system or [])
+
+
+def _message_text(messages):
+    parts = []
+    for message in messages:
+        content = message['content']
+        if isinstance(content, str):
+            parts.append(content)
+        else:
+            parts.extend(block.get('text', '') for block in content)
+    return "\n".join(parts)
+
+
+def build_reply(system_text, messages, rng, max_recommendations=3):
+    """
+    Build a schema-correct reply from the movies listed in the system context
+
+    Returns:
+        dict: {'message': str, 'recommendations': list}
+    """
+    candidates = [m.groupdict() for m in MOVIE_LINE_PATTERN.finditer(system_text)]
+    # The available-movies block is the only one with IDs, so every candidate
+    # is a valid pick; keep the order stable before sampling
+    candidates.sort(key=lambda m: int(m['id']))
+    count = min(len(candidates), rng.randint(1, max(1, max_recommendations)))
+    picks = rng.sample(candidates, count) if count else []
+
+    recommendations = [
+        {
+            'id': int(m['id']),
+            'title': m['title'],
+            'year': int(m['year']) if m['year'] != 'None' else None,
+            'genre': m['genre'],
+            'reason': f"Picked from our {m['genre']} collection",
+        }
+        for m in picks
+    ]
+    if recommendations:
+        titles = ", ".join(rec['title'] for rec in recommendations)
+        message = f"You might enjoy {titles}."
+    else:
+        message = "I couldn't find a good match in our collection right now."
+    return {'message': message, 'recommendations': recommendations}
+
+
+def request_digest(model, system, messages, seed):
+    """Stable digest of a request, used to seed its RNG"""
+    payload = json.dumps([model, system, messages, seed], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class StubMessages:
+    """Mimics ``Anthropic().messages`` for the in-process backend"""
+
+    def __init__(self, profile, sleep=time.sleep):
+        self.profile = profile
+        self._sleep = sleep
+        # The stub server calls create() from several threads
+        self._lock = threading.Lock()
+        self._seen_systems = set()
+        self._calls = 0
+
+    def _call_rng(self):
+        """
+        RNG for latency and failure injection, new for every call
+
+        Seeded from the profile seed and a call counter, so a run is
+        reproducible but a retried request gets a fresh draw (failure_rate
+        is a per-call rate, not a per-prompt verdict).
+        """
+        with self._lock:
+            self._calls += 1
+            call = self._calls
+        return random.Random(f"{self.profile.seed}:{call}")
+
+    def create(self, model, max_tokens, messages, system=None, **kwargs):
+        """Return a Messages API shaped response object"""
+        return _to_namespace(self.create_payload(model, max_tokens, messages, system))
+
+    def create_payload(self, model, max_tokens, messages, system=None):
+        """
+        Produce the JSON body of a Messages API response
+
+        Raises:
+            StubOverloadedError: When failure injection fires for this request
+        """
+        call_rng = self._call_rng()
+        self._sleep(self.profile.sample_latency(call_rng))
+        if call_rng.random() < self.profile.failure_rate:
+            raise StubOverloadedError("Overloaded (injected by stub backend)")
+
+        # The reply itself depends only on the request
+        digest = request_digest(model, system, messages, self.profile.seed)
+        rng = random.Random(int(digest[:16], 16))
+        system_text = _system_text(system)
+        reply = build_reply(system_text, messages, rng, self.profile.max_recommendations)
+        text = json.dumps(reply)
+
+        # Second and later calls with the same system block read it from cache,
+        # like the ephemeral cache_control block does against the real API
+        system_tokens = estimate_tokens(system_text)
+        system_key = hashlib.sha256(system_text.encode('utf-8')).digest()
+        with self._lock:
+            cached = system_key in self._seen_systems
+            if len(self._seen_systems) >= MAX_CACHED_SYSTEMS:
+                self._seen_systems.clear()
+            self._seen_systems.add(system_key)
+        output_tokens = self.profile.output_tokens or estimate_tokens(text)
+
+        return {
+            'id': f"msg_stub_{digest[:24]}",
+            'type': 'message',
+            'role': 'assistant',
+            'model': model,
+            'content': [{'type': 'text', 'text': text}],
+            'stop_reason': 'end_turn',
+            'stop_sequence': None,
+            'usage': {
+                'input_tokens': estimate_tokens(_message_text(messages)),
+                'output_tokens': min(output_tokens, max_tokens),
+                'cache_creation_input_tokens': 0 if cached else system_tokens,
+                'cache_read_input_tokens': system_tokens if cached else 0,
+            },
+        }
+
+
+class StubAnthropic:
+    """Drop-in for ``anthropic.Anthropic`` that never leaves the process"""
+
+    def __init__(self, profile=None):
+        self.messages = StubMessages(profile or StubProfile())
+
+
+def _to_namespace(value):
+    if isinstance(value, dict):
+        return SimpleNamespace(**{k: _to_namespace(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return [_to_namespace(v) for v in value]
+    return value
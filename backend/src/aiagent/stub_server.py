@@ -0,0 +1,101 @@
+"""Local HTTP server that mimics the Anthropic Messages API.
+
+Point the real client at it with CLAUDE_BACKEND=anthropic and
+CLAUDE_BASE_URL=http://localhost:8089, then load-test the AI paths over an
+actual socket. Responses come from the same deterministic stub as the
+in-process backend.
+
+Usage (from backend/src):
+    python -m aiagent.stub_server --port 8089 --latency-ms 800 --jitter-ms 200
+"""
+import argparse
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from aiagent.stub import LATENCY_DISTRIBUTIONS, StubMessages, StubOverloadedError, StubProfile
+
+MESSAGES_PATH = '/v1/messages'
+
+
+def make_handler(messages):
+    """Build a request handler class bound to a StubMessages instance"""
+
+    class MessagesHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self):
+            if self.path.split('?')[0] != MESSAGES_PATH:
+                return self._send_error(404, 'not_found_error', f'Unknown path {self.path}')
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length) or b'{}')
+                payload = messages.create_payload(
+                    model=body['model'],
+                    max_tokens=body['max_tokens'],
+                    messages=body['messages'],
+                    system=body.get('system'),
+                )
+            except StubOverloadedError as e:
+                return self._send_error(e.status_code, e.error_type, str(e))
+            except (KeyError, ValueError) as e:
+                return self._send_error(400, 'invalid_request_error', f'Malformed request: {e}')
+            self._send_json(200, payload)
+
+        def _send_error(self, status, error_type, message):
+            self._send_json(status, {'type': 'error', 'error': {'type': error_type, 'message': message}})
+
+        def _send_json(self, status, payload):
+            data = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            # Keep load tests quiet; the client side records timings
+            pass
+
+    return MessagesHandler
+
+
+def make_server(host='127.0.0.1', port=8089, profile=None):
+    """Create (but do not start) a threaded stub server"""
+    handler = make_handler(StubMessages(profile or StubProfile()))
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local Anthropic Messages API stand-in')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency-dist', choices=LATENCY_DISTRIBUTIONS, default='fixed')
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--output-tokens', type=int, default=None)
+    parser.add_argument('--max-recommendations', type=int, default=3)
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    profile = StubProfile(
+        latency_dist=args.latency_dist,
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.jitter_ms,
+        output_tokens=args.output_tokens,
+        max_recommendations=args.max_recommendations,
+        failure_rate=args.failure_rate,
+        seed=args.seed,
+    )
+    server = make_server(args.host, args.port, profile)
+    print(f"Stub Messages API listening on http://{args.host}:{args.port}{MESSAGES_PATH}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -2,58 +2,90 @@ from flask import Flask, jsonify
 from flask_cors import CORS
 from dotenv import load_dotenv
 from flask_caching import Cache
-from services.recommendations import RecommendationsService
+from services.recommendations import RecommendationsService, warm_templates
 from utils.cache import CacheManager
+from utils.metrics import init_metrics
+from utils.query_guard import init_query_guard
 
 # Load environment variables from .env file
 load_dotenv()
 
 from config import Config
 from database import init_db
-from routes import membership_bp, movies_bp, watchlist_bp, chat_bp
-
-app = Flask(__name__)
-
-app.config.from_object(Config)
-
-cache = Cache(app, config={
-    'CACHE_TYPE': 'simple',
-    'CACHE_DEFAULT_TIMEOUT': 3600
-})
-cache.init_app(app)
-RecommendationsService.cache = cache
-cache_manager = CacheManager(cache)
-app.cache_manager = cache_manager
-
-init_db(app)
-
-# Allow requests from React dev server
-#CORS(app, origins=Config.CORS_ORIGINS, supports_credentials=True)
-CORS(
-    app, 
-    origins=Config.CORS_ORIGINS, 
-    supports_credentials=True,
-    allow_headers=['Content-Type'],
-    methods=['GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS']
-)
-
-app.register_blueprint(membership_bp)
-app.register_blueprint(movies_bp)
-app.register_blueprint(watchlist_bp)
-app.register_blueprint(chat_bp)
+from routes import membership_bp, movies_bp, watchlist_bp, chat_bp, jobs_bp
+from cli import jobs_cli, usage_cli, outbox_cli, chat_cli, posters_cli, catalog_cli
 
 # Import models for Flask-Migrate (safe now - no circular imports)
-# Todo - can we movie this to top for imports?
-# or perhaps even remove them?
-from models import Member, Movie, ChatMessage
+from models import Member, Movie, ChatMessage, Job, AgentUsage, EmailOutbox, TmdbIngest, MovieChange, ScriptCheckpoint
 
-@app.errorhandler(404)
-def not_found(error):
-    return jsonify({'error': 'Resource not found or invalid parameter format'}), 404
 
-@app.route('/')
-def status():
-    return "200 OK"
+def create_app(config=Config):
+    """
+    Build and configure the Flask application
+
+    Everything here is safe to run in a preforking master and cheap enough
+    for CLI commands: no database connection is opened (engines connect
+    lazily) and heavy dependencies load on first use. Entry points that
+    serve requests warm templates and caches themselves (see wsgi.py).
+
+    Args:
+        config: Settings object (a Config subclass overrides per app)
+
+    Returns:
+        Flask: The configured application
+    """
+    app = Flask(__name__)
+
+    app.config.from_object(config)
+
+    cache = Cache(app, config={
+        'CACHE_TYPE': app.config['CACHE_TYPE'],
+        'CACHE_DIR': app.config['CACHE_DIR'],
+        'CACHE_DEFAULT_TIMEOUT': app.config['CACHE_DEFAULT_TIMEOUT'],
+        'CACHE_KEY_PREFIX': app.config['CACHE_KEY_PREFIX'],
+    })
+    RecommendationsService.cache = cache
+    app.cache_manager = CacheManager(cache, catalog_timeout=app.config['CATALOG_CACHE_SECONDS'])
+
+    init_db(app)
+    init_metrics(app)
+    init_query_guard(app)
+
+    # Allow requests from React dev server
+    #CORS(app, origins=Config.CORS_ORIGINS, supports_credentials=True)
+    CORS(
+        app, 
+        origins=app.config['CORS_ORIGINS'], 
+        supports_credentials=True,
+        allow_headers=['Content-Type'],
+        methods=['GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS']
+    )
+
+    app.register_blueprint(membership_bp)
+    app.register_blueprint(movies_bp)
+    app.register_blueprint(watchlist_bp)
+    app.register_blueprint(chat_bp)
+    app.register_blueprint(jobs_bp)
+
+    app.cli.add_command(jobs_cli)
+    app.cli.add_command(usage_cli)
+    app.cli.add_command(outbox_cli)
+    app.cli.add_command(chat_cli)
+    app.cli.add_command(posters_cli)
+    app.cli.add_command(catalog_cli)
+
+    @app.errorhandler(404)
+    def not_found(error):
+        return jsonify({'error': 'Resource not found or invalid parameter format'}), 404
+
+    @app.route('/')
+    def status():
+        return "200 OK"
+
+    return app
+
 
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    # Compile prompt templates at startup so the first request pays nothing
+    warm_templates()
+    create_app().run(debug=True)
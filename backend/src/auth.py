@@ -1,34 +1,52 @@
-import bcrypt
 import jwt
-import os
 import secrets
 
-from datetime import date, datetime, timedelta
-from config import Config
+from datetime import date, datetime, time, timedelta
 from functools import wraps
-from flask import request, jsonify
-
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail
+from flask import current_app, g, request, jsonify
+from models import Member
+from services import mailer
+from utils.hashing import hash_password, check_password, needs_rehash, HashingBusyError
+from utils.movies import get_rating_tier, get_tier_ratings, RATING_TIER_ALL
 
 AUTHENTICATION_COOKIE = 'auth_token'
 AUTHENTICATION_LIFETIME = 30  # minutes
+RATING_CLAIM = 'rating'
 
-def hash_password(password):
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+def next_birthday(date_of_birth, today=None):
+    """First day after today on which the member is a year older"""
+    today = today or date.today()
+    for year in (today.year, today.year + 1):
+        try:
+            birthday = date_of_birth.replace(year=year)
+        except ValueError:
+            # Feb 29 birthdays: age() ticks over on Mar 1 in non-leap years
+            birthday = date(year, 3, 1)
+        if birthday > today:
+            return birthday
 
-def check_password(password, password_hash):
-    return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+def token_expiry(member, now=None):
+    """
+    Token lifetime, cut short at the next birthday so the rating claim
+    can never outlive the age it was computed from
+    """
+    now = now or datetime.utcnow()
+    expires = now + timedelta(minutes=AUTHENTICATION_LIFETIME)
+    birthday = datetime.combine(next_birthday(member.date_of_birth, now.date()), time.min)
+    return min(expires, birthday)
 
-def add_token(response, member_id, secure=False):
+def add_token(response, member, secure=False):
+    now = datetime.utcnow()
+    expires = token_expiry(member, now)
     token = jwt.encode({
-        'member_id': member_id,
-        'exp': datetime.utcnow() + timedelta(minutes=AUTHENTICATION_LIFETIME)
-    }, Config.SECRET_KEY, algorithm='HS256')
+        'member_id': member.id,
+        RATING_CLAIM: get_rating_tier(member.age()),  # signed, read by catalog routes
+        'exp': expires,
+    }, current_app.config['SECRET_KEY'], algorithm='HS256')
     response.set_cookie(
         AUTHENTICATION_COOKIE,              # Cookie name
         token,                              # JWT token value
-        max_age=AUTHENTICATION_LIFETIME*60,
+        max_age=max(int((expires - now).total_seconds()), 0),
         httponly=True,                      # httponly cookies are safe from javascript
         secure=secure,                      # Only sent over HTTPS (set False for development)
         samesite='Strict',                  # CSRF protection
@@ -49,7 +67,13 @@ def remove_token(response, secure=False):
     return response
 
 
-def send_verification_email(member):
+def queue_verification_email(member):
+    """
+    Issue a verification token and queue the email in the current transaction
+
+    The outbox row commits together with the member, and the dispatcher
+    (flask outbox dispatch) delivers it, so requests never wait on SendGrid.
+    """
     token = secrets.token_urlsafe(32)
     member.verification_token = token
     member.token_expires_at = datetime.utcnow() + timedelta(hours=10)  #TODO: hardcoded expiry
@@ -58,10 +82,8 @@ def send_verification_email(member):
     verification_link = f"http://localhost:5173/verify-email/{token}"  # TODO: hardcoded URL
     print(verification_link)
 
-    # After user is created in DB
-    message = Mail(
-        from_email='noreply@dabneystudios.com',
-        to_emails=member.email,
+    return mailer.enqueue(
+        to_email=member.email,
         subject='Welcome! Verify your email address.',
         html_content=f'''                                               # TODO jinja html template
             <h2>Welcome to Movie App!</h2>
@@ -71,14 +93,49 @@ def send_verification_email(member):
         '''
     )
 
-    try:
-        sg = SendGridAPIClient(os.environ.get('SENDGRID_API_KEY'))
-        response = sg.send(message)
-        print(f"Email sent: {response.status_code}")  # Email sent: 202
-    except Exception as e:
-        print(f"Error sending email: {e}")
 
 
+class MemberContext:
+    """
+    Request-scoped view of the authenticated member
+
+    The rating tier comes from the signed token claim when present, so age
+    gating needs no database access. The Member row is only loaded (once
+    per request) when something asks for it.
+    """
+
+    def __init__(self, member_id, rating_tier=None):
+        self.member_id = member_id
+        self._rating_tier = rating_tier
+        self._member = None
+
+    @property
+    def member(self):
+        if self._member is None:
+            self._member = Member.query.get(self.member_id)
+        return self._member
+
+    @property
+    def rating_tier(self):
+        if self._rating_tier is None:
+            self._rating_tier = get_rating_tier(self.member.age())
+        return self._rating_tier
+
+    @property
+    def unlocks_all(self):
+        return self.rating_tier == RATING_TIER_ALL
+
+    @property
+    def allowed_ratings(self):
+        return get_tier_ratings(self.rating_tier)
+
+def current_member():
+    """MemberContext of the current request, or None when anonymous"""
+    return g.get('member_context')
+
+def _set_member_context(data):
+    g.member_context = MemberContext(data['member_id'], data.get(RATING_CLAIM))
+    return data['member_id']
 
 def token_required(f):
     @wraps(f)
@@ -89,8 +146,8 @@ def token_required(f):
             return jsonify({'error': 'Token missing'}), 401
             
         try:
-            data = jwt.decode(token, Config.SECRET_KEY, algorithms=['HS256'])
-            member_id = data['member_id']
+            data = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=['HS256'])
+            member_id = _set_member_context(data)
         except jwt.ExpiredSignatureError:
             return jsonify({'error': 'Token expired'}), 401
         except jwt.InvalidTokenError:
@@ -107,8 +164,8 @@ def token_optional(f):
         
         if token:
             try:
-                data = jwt.decode(token, Config.SECRET_KEY, algorithms=["HS256"])
-                member_id = data['member_id']
+                data = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=["HS256"])
+                member_id = _set_member_context(data)
             except:
                 # Token invalid or expired - just continue with None
                 pass
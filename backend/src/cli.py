@@ -0,0 +1,89 @@
+"""Flask CLI commands for background processes (run with `flask <group> <command>`)"""
+import click
+from flask.cli import AppGroup
+
+jobs_cli = AppGroup('jobs', help='Background recommendation jobs')
+usage_cli = AppGroup('usage', help='Agent usage accounting')
+outbox_cli = AppGroup('outbox', help='Outgoing email delivery')
+chat_cli = AppGroup('chat', help='Chat history maintenance')
+posters_cli = AppGroup('posters', help='Local poster image cache')
+catalog_cli = AppGroup('catalog', help='Catalog maintenance')
+
+
+@jobs_cli.command('work')
+@click.option('--once', is_flag=True, help='Drain the queue and exit instead of polling.')
+@click.option('--poll-interval', type=float, default=None, help='Seconds to wait when the queue is empty.')
+def jobs_work(once, poll_interval):
+    """Claim and run queued recommendation jobs"""
+    from services.jobs import work
+    processed = work(poll_interval=poll_interval, once=once)
+    if once:
+        click.echo(f"Processed {processed} jobs")
+
+
+@usage_cli.command('rollup')
+@click.option('--batch-size', type=int, default=1000, help='Members per transaction.')
+def usage_rollup(batch_size):
+    """Recompute member agent_usage totals from the usage ledger"""
+    from models import AgentUsage
+    updated = AgentUsage.rollup(batch_size=batch_size)
+    click.echo(f"Rolled up agent usage for {updated} members")
+
+
+@outbox_cli.command('dispatch')
+@click.option('--once', is_flag=True, help='Send everything due and exit instead of polling.')
+@click.option('--transport', type=click.Choice(['sendgrid', 'smtp', 'file']), default=None,
+              help='Override MAIL_TRANSPORT.')
+def outbox_dispatch(once, transport):
+    """Deliver queued emails from the outbox"""
+    from services import mailer
+    totals = mailer.dispatch(transport=mailer.get_transport(transport), once=once)
+    if once:
+        click.echo(f"Sent {totals['sent']}, retrying {totals['retrying']}, failed {totals['failed']}")
+
+
+@chat_cli.command('sweep')
+@click.option('--batch-size', type=int, default=1000, help='Messages per transaction.')
+@click.option('--interval', type=float, default=None, help='Repeat every N seconds instead of exiting.')
+def chat_sweep(batch_size, interval):
+    """Mark expired chat messages inactive"""
+    import time
+    from models import ChatMessage
+    while True:
+        swept = ChatMessage.sweep_expired(batch_size=batch_size)
+        click.echo(f"Swept {swept} expired chat messages")
+        if interval is None:
+            return
+        time.sleep(interval)
+
+
+@posters_cli.command('warm')
+@click.option('--variant', 'variants', multiple=True, default=('w185', 'w342'), show_default=True,
+              help='Variant to generate (repeatable).')
+@click.option('--workers', type=int, default=8, help='Concurrent origin fetches.')
+@click.option('--limit', type=int, default=None, help='Only the first N movies by id.')
+def posters_warm(variants, workers, limit):
+    """Fetch originals and generate poster variants for the catalog"""
+    from models import Movie
+    from services.posters import POSTER_VARIANTS, get_poster_cache, warm
+    unknown = set(variants) - set(POSTER_VARIANTS)
+    if unknown:
+        raise click.BadParameter(f"unknown variants: {', '.join(sorted(unknown))}", param_hint='--variant')
+    posters = Movie.query\
+        .with_entities(Movie.id, Movie.poster_url)\
+        .filter(Movie.poster_url.isnot(None))\
+        .order_by(Movie.id)\
+        .limit(limit)\
+        .all()
+    counts = warm(get_poster_cache(), posters, variants, workers=workers)
+    click.echo(f"Posters ready: {counts['ready']}, failed: {counts['failed']}")
+
+
+@catalog_cli.command('prune-changes')
+@click.option('--keep-days', type=int, default=None, help='Days of change history to keep (default: CATALOG_CHANGES_KEEP_DAYS).')
+def catalog_prune_changes(keep_days):
+    """Trim the catalog change feed log"""
+    from flask import current_app
+    from models import MovieChange
+    deleted = MovieChange.prune(keep_days if keep_days is not None else current_app.config['CATALOG_CHANGES_KEEP_DAYS'])
+    click.echo(f"Pruned {deleted} catalog changes")
@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 class Config:
     """Base configuration"""
@@ -12,17 +13,148 @@ class Config:
         f"{os.getenv('DB_NAME', 'movies_dev')}"
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Connection pool, per process. Queries are cut off server side after
+    # DB_STATEMENT_TIMEOUT_MS (0 disables, e.g. for long `flask db upgrade`s).
+    # Behind PgBouncer in transaction mode set DB_PGBOUNCER=true: it rejects
+    # the startup `options` parameter, so the timeout is set per transaction.
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT_SECONDS = int(os.getenv('DB_POOL_TIMEOUT_SECONDS', 10))
+    DB_POOL_RECYCLE_SECONDS = int(os.getenv('DB_POOL_RECYCLE_SECONDS', 30*60))
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 15000))
+    DB_PGBOUNCER = os.getenv('DB_PGBOUNCER', 'false').lower() == 'true'
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'pool_timeout': DB_POOL_TIMEOUT_SECONDS,
+        'pool_recycle': DB_POOL_RECYCLE_SECONDS,
+        'pool_pre_ping': DB_POOL_PRE_PING,
+        'connect_args': {} if DB_PGBOUNCER or not DB_STATEMENT_TIMEOUT_MS else {
+            'options': f'-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}',
+        },
+    }
+
+    # Read replica for catalog reads (see database.replica_reads); unset
+    # keeps everything on the primary. Replica reads may trail recent writes.
+    DB_REPLICA_HOST = os.getenv('DB_REPLICA_HOST')
+    SQLALCHEMY_BINDS = {
+        'replica': (
+            f"postgresql://{os.getenv('DB_REPLICA_USER', os.getenv('DB_USER', os.getenv('USER')))}:"
+            f"{os.getenv('DB_REPLICA_PASSWORD', os.getenv('DB_PASSWORD', ''))}@"
+            f"{DB_REPLICA_HOST}:"
+            f"{os.getenv('DB_REPLICA_PORT', os.getenv('DB_PORT', '5432'))}/"
+            f"{os.getenv('DB_NAME', 'movies_dev')}"
+        ),
+    } if DB_REPLICA_HOST else {}
     
     # JWT/Auth
     SECRET_KEY = os.getenv('SECRET_KEY', 'my-super-secret-jwt-key-for-development-only')
     
+    # Password hashing: bcrypt work factor (stored hashes with another cost are
+    # rehashed on login) and the bounded pool it runs on. Callers beyond
+    # pool size + BCRYPT_MAX_WAITING get a 503 after BCRYPT_WAIT_SECONDS.
+    BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', 12))
+    BCRYPT_POOL_SIZE = int(os.getenv('BCRYPT_POOL_SIZE', os.cpu_count() or 2))
+    BCRYPT_MAX_WAITING = int(os.getenv('BCRYPT_MAX_WAITING', 32))
+    BCRYPT_WAIT_SECONDS = float(os.getenv('BCRYPT_WAIT_SECONDS', 2))
+    BCRYPT_RETRY_AFTER_SECONDS = int(os.getenv('BCRYPT_RETRY_AFTER_SECONDS', 1))
+
+    # Outgoing email: written to the email_outbox table and delivered by
+    # `flask outbox dispatch`. MAIL_TRANSPORT is sendgrid, smtp or file.
+    MAIL_TRANSPORT = os.getenv('MAIL_TRANSPORT', 'sendgrid')
+    MAIL_FROM = os.getenv('MAIL_FROM', 'noreply@dabneystudios.com')
+    MAIL_SINK_DIR = os.getenv('MAIL_SINK_DIR', os.path.join(tempfile.gettempdir(), 'movies-mail'))
+    SMTP_HOST = os.getenv('SMTP_HOST', 'localhost')
+    SMTP_PORT = int(os.getenv('SMTP_PORT', 1025))
+    OUTBOX_BATCH_SIZE = int(os.getenv('OUTBOX_BATCH_SIZE', 50))
+    OUTBOX_MAX_ATTEMPTS = int(os.getenv('OUTBOX_MAX_ATTEMPTS', 5))
+    OUTBOX_RETRY_BASE_SECONDS = int(os.getenv('OUTBOX_RETRY_BASE_SECONDS', 30))
+    OUTBOX_POLL_INTERVAL_SECONDS = int(os.getenv('OUTBOX_POLL_INTERVAL_SECONDS', 5))
+
+    # Response/data cache. 'SimpleCache' is per process: fine for `make run`,
+    # tests and scripts, but gunicorn refuses it with several workers, so
+    # `make serve`, `make worker` and `make populate` share FileSystemCache in
+    # CACHE_DIR. Keys are prefixed with the database name so apps on different
+    # databases never read each other's entries from a shared directory.
+    CACHE_TYPE = os.getenv('CACHE_TYPE', 'SimpleCache')
+    CACHE_DIR = os.getenv('CACHE_DIR', os.path.join(tempfile.gettempdir(), 'movies-cache'))
+    CACHE_DEFAULT_TIMEOUT = int(os.getenv('CACHE_DEFAULT_TIMEOUT', 3600))
+    CACHE_KEY_PREFIX = os.getenv('CACHE_KEY_PREFIX', f"{os.getenv('DB_NAME', 'movies_dev')}:")
+    CATALOG_CACHE_SECONDS = int(os.getenv('CATALOG_CACHE_SECONDS', 10*60))  # genre list etc.
+
+    # Catalog change feed (GET /movies/changes); `flask catalog prune-changes`
+    # drops log entries older than CATALOG_CHANGES_KEEP_DAYS
+    CATALOG_CHANGES_PAGE_SIZE = int(os.getenv('CATALOG_CHANGES_PAGE_SIZE', 10000))
+    CATALOG_CHANGES_MAX_PAGE_SIZE = int(os.getenv('CATALOG_CHANGES_MAX_PAGE_SIZE', 50000))
+    CATALOG_CHANGES_KEEP_DAYS = int(os.getenv('CATALOG_CHANGES_KEEP_DAYS', 30))
+
+    # Poster images: originals are fetched once from POSTER_ORIGIN ('http'
+    # = Movie.poster_url, 'directory' = files named like the poster_url
+    # basename in POSTER_ORIGIN_DIR) and resized variants kept on local disk
+    POSTER_CACHE_DIR = os.getenv('POSTER_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'movies-posters'))
+    POSTER_ORIGIN = os.getenv('POSTER_ORIGIN', 'http')
+    POSTER_ORIGIN_DIR = os.getenv('POSTER_ORIGIN_DIR', os.path.join(tempfile.gettempdir(), 'movies-poster-origin'))
+    POSTER_ORIGIN_TIMEOUT_SECONDS = float(os.getenv('POSTER_ORIGIN_TIMEOUT_SECONDS', 10))
+    POSTER_JPEG_QUALITY = int(os.getenv('POSTER_JPEG_QUALITY', 82))
+    POSTER_MAX_AGE_SECONDS = int(os.getenv('POSTER_MAX_AGE_SECONDS', 7*24*60*60))
+
+    # Prometheus metrics at /metrics (keep it off the public interface). With
+    # several worker processes point METRICS_DIR at a directory they share
+    # so any worker can report the totals of all of them (gunicorn.conf.py
+    # makes a temporary one when it's unset).
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+    METRICS_DIR = os.getenv('METRICS_DIR') or None
+    METRICS_FLUSH_SECONDS = float(os.getenv('METRICS_FLUSH_SECONDS', 1))
+
+    # SQL guard for tests and load runs (utils/query_guard.py): 'warn' or
+    # 'raise' when a request repeats one statement shape QUERY_GUARD_REPEAT_LIMIT
+    # times (N+1) or runs more statements than its @query_budget
+    QUERY_GUARD = os.getenv('QUERY_GUARD', 'off')
+    QUERY_GUARD_REPEAT_LIMIT = int(os.getenv('QUERY_GUARD_REPEAT_LIMIT', 3))
+
     # CORS
     CORS_ORIGINS = ['http://localhost:5173']
 
+    # Claude backend: 'anthropic' for the real API, 'stub' for the in-process
+    # deterministic stand-in used by load and latency tests. CLAUDE_BASE_URL
+    # points the anthropic backend elsewhere, e.g. the local stub server.
+    CLAUDE_BACKEND = os.getenv('CLAUDE_BACKEND', 'anthropic')
+    CLAUDE_BASE_URL = os.getenv('CLAUDE_BASE_URL') or None
+    CLAUDE_STUB_LATENCY_DIST = os.getenv('CLAUDE_STUB_LATENCY_DIST', 'fixed')  # fixed|uniform|normal|lognormal
+    CLAUDE_STUB_LATENCY_MS = float(os.getenv('CLAUDE_STUB_LATENCY_MS', 0))
+    CLAUDE_STUB_LATENCY_JITTER_MS = float(os.getenv('CLAUDE_STUB_LATENCY_JITTER_MS', 0))
+    CLAUDE_STUB_OUTPUT_TOKENS = int(os.getenv('CLAUDE_STUB_OUTPUT_TOKENS', 0)) or None
+    CLAUDE_STUB_MAX_RECOMMENDATIONS = int(os.getenv('CLAUDE_STUB_MAX_RECOMMENDATIONS', 3))
+    CLAUDE_STUB_FAILURE_RATE = float(os.getenv('CLAUDE_STUB_FAILURE_RATE', 0))
+    CLAUDE_STUB_SEED = int(os.getenv('CLAUDE_STUB_SEED', 0))
+
+    # Jinja prompt templates: compiled bytecode is cached on disk, and
+    # templates are only re-checked for edits when auto reload is on (dev)
+    JINJA_BYTECODE_CACHE_DIR = os.getenv(
+        'JINJA_BYTECODE_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'movies-jinja-cache'))
+    TEMPLATES_AUTO_RELOAD = os.getenv('TEMPLATES_AUTO_RELOAD', 'false').lower() == 'true'
+
     # chat expiry pushes old chats to active=False
     # this does not delete them, but it removes them from Claude AI api conversation context
     CHAT_EXPIRY_MINUTES = int(os.environ.get('CHAT_EXPIRY_MINUTES', 2))
 
+    # Prompt token budget for chatbot context (system prompt, watchlist,
+    # candidate movies and history). Older history turns beyond the verbatim
+    # window are cut down to CHAT_HISTORY_COMPACT_CHARS before being dropped.
+    CHAT_CONTEXT_TOKEN_BUDGET = int(os.environ.get('CHAT_CONTEXT_TOKEN_BUDGET', 6000))
+    CHAT_HISTORY_VERBATIM_TURNS = int(os.environ.get('CHAT_HISTORY_VERBATIM_TURNS', 6))
+    CHAT_HISTORY_COMPACT_CHARS = int(os.environ.get('CHAT_HISTORY_COMPACT_CHARS', 160))
+
+    # Slow AI triggers (similar films) run on `flask jobs work` processes;
+    # the overview answers right away with cached or fallback picks
+    ASYNC_AI_TRIGGERS = os.environ.get('ASYNC_AI_TRIGGERS', 'true').lower() == 'true'
+    JOB_POLL_INTERVAL_SECONDS = int(os.environ.get('JOB_POLL_INTERVAL_SECONDS', 2))
+    JOB_TIMEOUT_SECONDS = int(os.environ.get('JOB_TIMEOUT_SECONDS', 120))
+    JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', 3))
+    JOB_RESULT_TTL_SECONDS = int(os.environ.get('JOB_RESULT_TTL_SECONDS', 60*60))  # matches recommendation cache
+
     # 5 conversations × $0.024
     # Each conversation consists of 3 back-and-forths with claude ai
     # at about 100 characters per user message
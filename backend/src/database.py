@@ -1,11 +1,75 @@
+from contextlib import contextmanager
+from flask import g, has_app_context
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
 from flask_migrate import Migrate
+from sqlalchemy import event
+from sqlalchemy.sql import Select
+
+REPLICA_BIND = 'replica'
+
+
+class RoutingSession(Session):
+    """
+    Session that sends plain SELECTs to the read replica inside replica_reads()
+
+    Writes, locking reads (FOR UPDATE) and autoflush queries always use the
+    primary. Without a configured replica everything stays on the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._reads_from_replica(clause):
+            return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _reads_from_replica(self, clause):
+        return (
+            has_app_context()
+            and g.get('replica_reads', False)
+            and isinstance(clause, Select)
+            and clause._for_update_arg is None
+            and not self._flushing
+            and REPLICA_BIND in self._db.engines
+        )
+
 
 # Initialize extensions without app
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 migrate = Migrate()
 
+
+@contextmanager
+def replica_reads():
+    """
+    Route read-only queries in this block to the replica
+
+    Also usable as a decorator (@replica_reads()) on views and helpers that
+    only read catalog data and can tolerate replication lag.
+    """
+    if not has_app_context():
+        yield
+        return
+    previous = g.get('replica_reads', False)
+    g.replica_reads = True
+    try:
+        yield
+    finally:
+        g.replica_reads = previous
+
+
 def init_db(app):
     """Initialize database and migrations with Flask app"""
     db.init_app(app)
     migrate.init_app(app, db)
+
+    timeout_ms = app.config.get('DB_STATEMENT_TIMEOUT_MS')
+    if app.config.get('DB_PGBOUNCER') and timeout_ms:
+        # PgBouncer transaction pooling: a session setting would leak to
+        # whichever client gets the server connection next, so scope it
+        # to each transaction instead
+        def set_local_statement_timeout(conn):
+            conn.exec_driver_sql(f'SET LOCAL statement_timeout = {int(timeout_ms)}')
+
+        with app.app_context():
+            for engine in db.engines.values():
+                event.listen(engine, 'begin', set_local_statement_timeout)
@@ -2,3 +2,9 @@ from .member import Member
 from .movie import Movie
 from .watchlist import Watchlist
 from .chat_message import ChatMessage
+from .job import Job
+from .agent_usage import AgentUsage
+from .email_outbox import EmailOutbox
+from .tmdb_ingest import TmdbIngest
+from .movie_change import MovieChange
+from .script_checkpoint import ScriptCheckpoint
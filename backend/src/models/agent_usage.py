@@ -0,0 +1,102 @@
+from database import db
+from datetime import datetime
+from models.member import Member
+from sqlalchemy import func, update
+
+class AgentUsage(db.Model):
+    """Append-only ledger of Claude calls and what they cost"""
+    __tablename__ = 'agent_usage'
+
+    id = db.Column(db.BigInteger, primary_key=True)
+    member_id = db.Column(db.Integer, db.ForeignKey('member.id', ondelete='CASCADE'), nullable=False)
+    trigger = db.Column(db.String(20), nullable=False)  # RecommendationTrigger value
+    input_tokens = db.Column(db.Integer, nullable=False, default=0)
+    output_tokens = db.Column(db.Integer, nullable=False, default=0)
+    cache_creation_tokens = db.Column(db.Integer, nullable=False, default=0)
+    cache_read_tokens = db.Column(db.Integer, nullable=False, default=0)
+    cost = db.Column(db.Numeric(10, 6), nullable=False)
+    charged = db.Column(db.Boolean, nullable=False, default=True)  # counts toward discussion power
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_agent_usage_member_created_at', 'member_id', 'created_at'),
+    )
+
+    @classmethod
+    def record(cls, member_id, trigger, usage, cost, charge=True):
+        """
+        Append a ledger row and, for charged calls, bump the member total
+
+        The total is incremented in SQL (agent_usage = agent_usage + cost), so
+        concurrent calls can't overwrite each other. Runs in the caller's
+        transaction; a loaded Member keeps its old total until the commit
+        expires it (use the return value).
+
+        Args:
+            member_id: Member's ID
+            trigger: RecommendationTrigger the call was made for
+            usage: dict from ClaudeClient.get_usage()
+            cost: Cost in USD
+            charge: Whether the call counts toward the member's usage limit
+
+        Returns:
+            float or None: The member's new running total when charged
+        """
+        db.session.add(cls(
+            member_id=member_id,
+            trigger=trigger.value,
+            input_tokens=usage.get('input_tokens', 0),
+            output_tokens=usage.get('output_tokens', 0),
+            cache_creation_tokens=usage.get('cache_creation_input_tokens', 0),
+            cache_read_tokens=usage.get('cache_read_input_tokens', 0),
+            cost=cost,
+            charged=charge,
+        ))
+        if not charge:
+            return None
+
+        total = db.session.execute(
+            update(Member)
+            .where(Member.id == member_id)
+            .values(agent_usage=Member.agent_usage + cost)
+            .returning(Member.agent_usage)
+            .execution_options(synchronize_session=False)
+        ).scalar()
+        return float(total)
+
+    @classmethod
+    def rollup(cls, batch_size=1000):
+        """
+        Recompute every member's agent_usage from the charged ledger rows
+
+        Works through members in id order, one short transaction per batch,
+        to repair totals that drifted (e.g. after manual ledger edits).
+
+        Returns:
+            int: Number of member rows updated
+        """
+        total = db.select(func.coalesce(func.sum(cls.cost), 0))\
+            .where(cls.member_id == Member.id, cls.charged.is_(True))\
+            .scalar_subquery()
+
+        updated, last_id = 0, 0
+        while True:
+            ids = [member_id for (member_id,) in db.session.query(Member.id)
+                   .filter(Member.id > last_id)
+                   .order_by(Member.id)
+                   .limit(batch_size)]
+            if not ids:
+                return updated
+
+            result = db.session.execute(
+                update(Member)
+                .where(Member.id.in_(ids))
+                .values(agent_usage=total)
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+            updated += result.rowcount
+            last_id = ids[-1]
+
+    def __repr__(self):
+        return f'<AgentUsage member_id={self.member_id} trigger={self.trigger} cost={self.cost}>'
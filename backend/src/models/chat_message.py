@@ -1,7 +1,8 @@
 from database import db
+from sqlalchemy import and_
 from sqlalchemy.dialects.postgresql import ARRAY
 from datetime import datetime, timedelta
-from config import Config
+from flask import current_app
 
 class ChatMessage(db.Model):
     __tablename__ = 'chat_message'
@@ -16,21 +17,63 @@ class ChatMessage(db.Model):
     
     # Relationship
     member = db.relationship('Member', backref='chat_messages')
+
+    __table_args__ = (
+        # Serves the live-history read (member, active, created_at >= cutoff)
+        db.Index('ix_chat_message_member_active_created_at', 'member_id', 'active', 'created_at'),
+        # Serves the sweeper, which scans active rows by age across members
+        db.Index('ix_chat_message_active_created_at', 'created_at', postgresql_where=db.text('active')),
+    )
     
     @classmethod
     def complete_exchange(cls, member_id):
         """Mark all active messages as inactive for a given member"""
         cls.query.filter_by(member_id=member_id, active=True).update({'active': False})
 
+    @staticmethod
+    def expiry_cutoff():
+        """Messages created before this have left the conversation context"""
+        return datetime.utcnow() - timedelta(minutes=current_app.config['CHAT_EXPIRY_MINUTES'])
+
     @classmethod
-    def expire_all(cls, member_id, with_commit=False):
-        expiry_time = datetime.utcnow() - timedelta(minutes=Config.CHAT_EXPIRY_MINUTES)
-        cls.query\
-            .filter_by(member_id=member_id, active=True)\
-            .filter(cls.created_at < expiry_time)\
-            .update({'active': False})
-        if with_commit:
+    def live(cls):
+        """
+        Filter for messages still in the conversation context
+
+        Expiry is derived at read time from created_at, so reads never
+        write; sweep_expired() flips the stored flag in the background.
+        """
+        return and_(cls.active.is_(True), cls.created_at >= cls.expiry_cutoff())
+
+    @property
+    def is_live(self):
+        return bool(self.active) and self.created_at is not None and self.created_at >= self.expiry_cutoff()
+
+    @classmethod
+    def sweep_expired(cls, batch_size=1000):
+        """
+        Mark expired-but-active messages inactive, one batch per transaction
+
+        Returns:
+            int: Number of messages swept
+        """
+        swept = 0
+        while True:
+            batch = db.select(cls.id)\
+                .where(cls.active.is_(True), cls.created_at < cls.expiry_cutoff())\
+                .limit(batch_size)\
+                .with_for_update(skip_locked=True)\
+                .scalar_subquery()
+            result = db.session.execute(
+                db.update(cls)
+                .where(cls.id.in_(batch))
+                .values(active=False)
+                .execution_options(synchronize_session=False)
+            )
             db.session.commit()
+            swept += result.rowcount
+            if result.rowcount < batch_size:
+                return swept
 
     def to_dict(self):
         """Convert model to dictionary for JSON serialization"""
@@ -40,7 +83,7 @@ class ChatMessage(db.Model):
             'role': self.role,
             'content': self.content,
             'recommendedMovieIds': self.recommended_movie_ids if self.recommended_movie_ids else [],
-            'active': self.active,
+            'active': self.is_live,
             'createdAt': self.created_at.isoformat() if self.created_at else None,
         }
     
@@ -0,0 +1,38 @@
+from database import db
+from datetime import datetime
+from enum import Enum
+
+class OutboxStatus(str, Enum):
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+
+class EmailOutbox(db.Model):
+    """Outgoing email, written in the caller's transaction and sent by `flask outbox dispatch`"""
+    __tablename__ = 'email_outbox'
+
+    id = db.Column(db.Integer, primary_key=True)
+    to_email = db.Column(db.String(120), nullable=False)
+    subject = db.Column(db.String(255), nullable=False)
+    html_content = db.Column(db.Text, nullable=False)
+    status = db.Column(
+        db.Enum(OutboxStatus, values_callable=lambda obj: [e.value for e in obj]),
+        default=OutboxStatus.PENDING,
+        nullable=False
+    )
+    attempts = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    last_error = db.Column(db.Text, nullable=True)
+    next_attempt_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        # Dispatcher scans only what is still due
+        db.Index(
+            'ix_email_outbox_pending_next_attempt', 'next_attempt_at',
+            postgresql_where=db.text("status = 'pending'"),
+        ),
+    )
+
+    def __repr__(self):
+        return f'<EmailOutbox {self.id} to={self.to_email} status={self.status}>'
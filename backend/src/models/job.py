@@ -0,0 +1,60 @@
+from database import db
+from datetime import datetime
+from enum import Enum
+from sqlalchemy.dialects.postgresql import JSONB
+
+class JobStatus(str, Enum):
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+
+# Statuses a job can still make progress from
+PENDING_STATUSES = (JobStatus.QUEUED, JobStatus.RUNNING)
+
+class Job(db.Model):
+    """Background recommendation job, claimed by `flask jobs work` processes"""
+    __tablename__ = 'job'
+
+    id = db.Column(db.Integer, primary_key=True)
+    member_id = db.Column(db.Integer, db.ForeignKey('member.id', ondelete='CASCADE'), nullable=False)
+    trigger = db.Column(db.String(20), nullable=False)  # RecommendationTrigger value
+    status = db.Column(
+        db.Enum(JobStatus, values_callable=lambda obj: [e.value for e in obj]),
+        default=JobStatus.QUEUED,
+        nullable=False
+    )
+    result = db.Column(JSONB, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        # At most one pending job per member and trigger
+        db.Index(
+            'ix_job_pending_member_trigger', 'member_id', 'trigger',
+            unique=True,
+            postgresql_where=db.text("status IN ('queued', 'running')"),
+        ),
+        db.Index('ix_job_status_created_at', 'status', 'created_at'),
+    )
+
+    @property
+    def is_pending(self):
+        return self.status in PENDING_STATUSES
+
+    def to_dict(self):
+        """Convert model to dictionary for JSON serialization"""
+        return {
+            'id': self.id,
+            'trigger': self.trigger,
+            'status': self.status.value if hasattr(self.status, 'value') else self.status,
+            'error': self.error,
+            'createdAt': self.created_at.isoformat() if self.created_at else None,
+            'finishedAt': self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+    def __repr__(self):
+        return f'<Job {self.id} member_id={self.member_id} trigger={self.trigger} status={self.status}>'
@@ -1,6 +1,6 @@
-from config import Config
 from database import db
 from datetime import date, timedelta
+from flask import current_app
 
 class Member(db.Model):
     __tablename__ = 'member'
@@ -71,9 +71,20 @@ class Member(db.Model):
         # Was birthday less than 30 days ago, but not in the future
         return 0 <= days_since_birthday <= 30
 
-    def discussion_power(self):
-        used = float(self.agent_usage)
-        limit = Config.AGENT_USAGE_LIMIT
+    def usage_total(self):
+        """
+        Running agent usage: the member row's aggregate of the charged ledger
+
+        AgentUsage.record increments it atomically and AgentUsage.rollup
+        repairs it, so admission checks read it from the already loaded row
+        instead of summing the ledger.
+        """
+        return float(self.agent_usage)
+
+    def discussion_power(self, used=None):
+        """Usage against the limit; pass a known total to skip the lookup (and any reload)"""
+        used = self.usage_total() if used is None else used
+        limit = current_app.config['AGENT_USAGE_LIMIT']
         remaining = limit - used
         percentage = (used / limit) * 100
         
@@ -85,7 +96,7 @@ class Member(db.Model):
         }
 
     def has_discussion_power(self):
-        return float(self.agent_usage) < Config.AGENT_USAGE_LIMIT
+        return self.usage_total() < current_app.config['AGENT_USAGE_LIMIT']
 
     def remaining_discussion_power(self):
-        return Config.AGENT_USAGE_LIMIT - float(self.agent_usage)
+        return current_app.config['AGENT_USAGE_LIMIT'] - self.usage_total()
@@ -1,6 +1,10 @@
-from database import db
+from database import db, replica_reads
 from sqlalchemy import and_, or_
 
+# Catalog identity: case-folded title without punctuation or whitespace, plus
+# the year. Ingestion upserts against it (scripts/catalog_loader.py).
+DEDUP_KEY = "lower(regexp_replace(title, '[[:punct:][:space:]]+', '', 'g')) || ':' || coalesce(release_year::text, '')"
+
 class Movie(db.Model):
     __tablename__ = 'movie'
     
@@ -15,6 +19,17 @@ class Movie(db.Model):
     imdb_rating = db.Column(db.Numeric(3,1))
     poster_url = db.Column(db.String(500))
     created_at = db.Column(db.DateTime, server_default=db.func.now())
+    updated_at = db.Column(db.DateTime, server_default=db.func.now(), server_onupdate=db.FetchedValue(), nullable=False)  # maintained by trigger
+    dedup_key = db.Column(db.Text, db.Computed(DEDUP_KEY, persisted=True))
+
+    __table_args__ = (
+        db.Index('ix_movie_genre', 'genre'),
+        db.Index('ix_movie_release_year', 'release_year'),
+        db.Index('ix_movie_rating', 'rating'),
+        # Title search uses ILIKE '%term%', which needs pg_trgm
+        db.Index('ix_movie_title_trgm', 'title', postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'}),
+        db.Index('uq_movie_dedup_key', 'dedup_key', unique=True),
+    )
     
     def to_dict(self):
         """Convert model to dictionary for JSON serialization"""
@@ -30,11 +45,22 @@ class Movie(db.Model):
             'imdb_rating': float(self.imdb_rating) if self.imdb_rating else None,
             'poster_url': self.poster_url,
             'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
         }
     
     def __repr__(self):
         return f'<Movie {self.title} ({self.release_year})>'
     
+    @classmethod
+    def genres(cls):
+        """Distinct, non-empty genres in the catalog, alphabetically"""
+        rows = cls.query\
+            .with_entities(cls.genre)\
+            .distinct()\
+            .order_by(cls.genre)\
+            .all()
+        return [g[0] for g in rows if g[0]]  # Filter out None values
+
     @classmethod
     def hydrate(cls, recommendations):
         """
@@ -53,8 +79,9 @@ class Movie(db.Model):
         # Extract movie IDs
         movie_ids = [rec['id'] for rec in recommendations]
         
-        # Fetch full movie data
-        movies = Movie.query.filter(Movie.id.in_(movie_ids)).all()
+        # Fetch full movie data (catalog only, safe to read from the replica)
+        with replica_reads():
+            movies = Movie.query.filter(Movie.id.in_(movie_ids)).all()
         movie_map = {m.id: m.to_dict() for m in movies}
         
         # Merge with reasons from recommendations
@@ -68,7 +95,7 @@ class Movie(db.Model):
         return hydrated
 
     @staticmethod
-    def find_by_filters(filters, limit=100, allowed_ratings=None):
+    def find_by_filters(filters, limit=100, allowed_ratings=None, order_by=None):
         """
         Get movies filtered by decade
         
@@ -76,6 +103,7 @@ class Movie(db.Model):
             filters: dict with 'decades' key
             limit: maximum number of movies to return
             allowed_ratings: ratings, set by age filter, of movies to include
+            order_by: optional ordering clause (e.g. func.random())
         
         Returns:
             List of Movie objects
@@ -95,4 +123,7 @@ class Movie(db.Model):
         if allowed_ratings:
             query = query.filter(Movie.rating.in_(allowed_ratings))
 
+        if order_by is not None:
+            query = query.order_by(order_by)
+
         return query.limit(limit).all()
\ No newline at end of file
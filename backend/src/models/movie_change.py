@@ -0,0 +1,72 @@
+from database import db
+from datetime import datetime, timedelta
+
+# Change kinds written by the movie triggers; insert and update both mean
+# "fetch this movie again", delete means "drop it"
+CHANGE_INSERT = 'insert'
+CHANGE_UPDATE = 'update'
+CHANGE_DELETE = 'delete'
+
+class MovieChange(db.Model):
+    """
+    Catalog change log, written only by triggers on `movie`
+
+    `version` increases with every change and the catalog version is the
+    highest one. Writers serialize on an advisory lock, so versions become
+    visible in order and `since` cursors never skip a change.
+    """
+    __tablename__ = 'movie_change'
+
+    version = db.Column(db.BigInteger, primary_key=True)
+    movie_id = db.Column(db.Integer, nullable=False)
+    op = db.Column(db.String(10), nullable=False)
+    changed_at = db.Column(db.DateTime, default=datetime.utcnow, server_default=db.func.now(), nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_movie_change_changed_at', 'changed_at'),
+    )
+
+    def __repr__(self):
+        return f'<MovieChange {self.version} {self.op} movie_id={self.movie_id}>'
+
+    @classmethod
+    def current_version(cls):
+        """Latest catalog version (0 before the first change)"""
+        return db.session.query(db.func.coalesce(db.func.max(cls.version), 0)).scalar()
+
+    @classmethod
+    def oldest_version(cls):
+        """Oldest version still in the log, or None when it's empty"""
+        return db.session.query(db.func.min(cls.version)).scalar()
+
+    @classmethod
+    def since(cls, version, upto, limit):
+        """
+        Latest change per movie in (version, upto], oldest first
+
+        Several changes to one movie collapse into its newest, so a client
+        applying the feed in order ends up with the current catalog.
+        Continue from the last row's version when `limit` rows come back.
+        """
+        latest = db.session.query(cls.version, cls.movie_id, cls.op)\
+            .filter(cls.version > version, cls.version <= upto)\
+            .distinct(cls.movie_id)\
+            .order_by(cls.movie_id, cls.version.desc())\
+            .subquery()
+        return db.session.query(latest)\
+            .order_by(latest.c.version)\
+            .limit(limit)
+
+    @classmethod
+    def prune(cls, keep_days):
+        """
+        Delete log entries older than keep_days; clients behind them must resync
+
+        The newest entry is always kept so the catalog version never goes back.
+        """
+        deleted = cls.query\
+            .filter(cls.changed_at < db.func.now() - timedelta(days=keep_days),
+                    cls.version < cls.current_version())\
+            .delete(synchronize_session=False)
+        db.session.commit()
+        return deleted
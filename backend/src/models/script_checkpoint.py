@@ -0,0 +1,19 @@
+from database import db
+from datetime import datetime
+from sqlalchemy.dialects.postgresql import JSONB
+
+class ScriptCheckpoint(db.Model):
+    """
+    Resume state of a maintenance script (scripts/remove_duplicates.py etc.)
+
+    Kept in the database it describes, so runs against different databases
+    never pick up each other's progress.
+    """
+    __tablename__ = 'script_checkpoint'
+
+    name = db.Column(db.String(50), primary_key=True)
+    state = db.Column(JSONB, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, server_default=db.func.now(), nullable=False)
+
+    def __repr__(self):
+        return f'<ScriptCheckpoint {self.name} {self.state}>'
@@ -0,0 +1,25 @@
+from database import db
+from datetime import datetime
+
+# Checkpoint statuses; only loaded ids are skipped on the next run
+INGEST_LOADED = 'loaded'
+INGEST_FAILED = 'failed'
+
+class TmdbIngest(db.Model):
+    """Checkpoint of TMDB ids processed by scripts/tmdb_fetch.py"""
+    __tablename__ = 'tmdb_ingest'
+
+    tmdb_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    movie_id = db.Column(db.Integer, db.ForeignKey('movie.id', ondelete='SET NULL'), nullable=True)
+    status = db.Column(db.String(20), nullable=False)
+    attempts = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    error = db.Column(db.Text, nullable=True)
+    ingested_at = db.Column(db.DateTime, default=datetime.utcnow, server_default=db.func.now(), nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_tmdb_ingest_movie_id', 'movie_id'),
+        db.Index('ix_tmdb_ingest_ingested_at', 'ingested_at'),
+    )
+
+    def __repr__(self):
+        return f'<TmdbIngest {self.tmdb_id} -> movie_id={self.movie_id} status={self.status}>'
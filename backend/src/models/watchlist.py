@@ -23,6 +23,11 @@ class Watchlist(db.Model):
     # Relationships
     member = db.relationship('Member', backref='watchlist_items')
     movie = db.relationship('Movie', backref='watchlist_entries')
+
+    __table_args__ = (
+        db.UniqueConstraint('member_id', 'movie_id', name='watchlist_member_id_movie_id_key'),  # from schema.sql
+        db.Index('ix_watchlist_member_status', 'member_id', 'status'),
+    )
     
     def to_dict(self):
         """Convert model to dictionary for JSON serialization"""
@@ -1,4 +1,5 @@
 from .membership import membership_bp
 from .movies import movies_bp
 from .watchlist import watchlist_bp
-from .chat import chat_bp
\ No newline at end of file
+from .chat import chat_bp
+from .jobs import jobs_bp
@@ -1,14 +1,16 @@
-from database import db
-from flask import Blueprint, request, jsonify
-from auth import token_required
-from models import ChatMessage, Movie, Member
+from database import db, replica_reads
+from flask import Blueprint, request, jsonify, current_app
+from auth import token_required, current_member
+from models import ChatMessage, Movie, AgentUsage
 from services import RecommendationsService, RecommendationTrigger
+from utils.query_guard import query_budget
 
 chat_bp = Blueprint('chat', __name__, url_prefix='/chat')
 
 ROLE_USER = 'user'  # move this to ChatMessage or elsewhere?
 
 @chat_bp.route('/message', methods=['POST'])
+@query_budget(9)
 @token_required
 def post(member_id):
     data = request.get_json()
@@ -19,7 +21,7 @@ def post(member_id):
     
     try:
         # Pre-flight cost check
-        member = Member.query.get(member_id)
+        member = current_member().member
         if not member.has_discussion_power():
             return jsonify({
                 'error': 'Insufficient discussion power',
@@ -31,7 +33,7 @@ def post(member_id):
         db.session.add(chat_message)
 
         # Get recommendation from ChatService
-        rs = RecommendationsService(member_id)
+        rs = RecommendationsService(member_id, current_member())
         result = rs.get(trigger=RecommendationTrigger.CHATBOT_MESSAGE, params={'message': message})
         serialized_movies = Movie.hydrate(result.get('recommendations', []))
 
@@ -44,14 +46,19 @@ def post(member_id):
             recommended_movie_ids=movie_ids if movie_ids else None
         )
         db.session.add(assistant_chat_message)
-        actual_cost = rs.claude_client.get_usage_cost()
-        member.agent_usage = float(member.agent_usage) + actual_cost
+        usage_total = AgentUsage.record(
+            member_id,
+            RecommendationTrigger.CHATBOT_MESSAGE,
+            usage=rs.claude_client.get_usage(),
+            cost=rs.claude_client.get_usage_cost(),
+        )
         db.session.commit()
 
         return jsonify({
             'message': result['message'],
             'recommendations': serialized_movies,
-            'power': member.discussion_power(),
+            # The commit expired member; the ledger total avoids reloading it
+            'power': member.discussion_power(usage_total),
         }), 200
         
     except Exception as e:
@@ -62,30 +69,34 @@ def post(member_id):
 
 
 @chat_bp.route('/history', methods=['GET'])
+@query_budget(3)
 @token_required
 def get(member_id):
     """Get chat history for the current member"""
     try:
-        # checks whether older messages should be expired before querying chat
-        ChatMessage.expire_all(member_id, with_commit=True)
+        # Expiry is computed at read time (see ChatMessage.live); no writes here
         messages = ChatMessage.query\
             .filter_by(member_id=member_id)\
             .order_by(ChatMessage.created_at.asc())\
             .all()
-        # Hydrate messages with full movie data
+        # Hydrate messages with full movie data: one query for every
+        # recommended movie in the history, not one per message
+        movie_ids = {movie_id for msg in messages if msg.role == 'assistant'
+                     for movie_id in msg.recommended_movie_ids or ()}
+        with replica_reads():
+            movies = Movie.query.filter(Movie.id.in_(movie_ids)).all() if movie_ids else []
+        movie_map = {m.id: m.to_dict() for m in movies}
+
         result = []
         for msg in messages:
             msg_dict = msg.to_dict()
-            
-            # If assistant message has movie IDs, fetch full movie data
             if msg.role == 'assistant' and msg.recommended_movie_ids:
-                movies = Movie.query.filter(Movie.id.in_(msg.recommended_movie_ids)).all()
-                msg_dict['recommendations'] = [m.to_dict() for m in movies]
+                msg_dict['recommendations'] = [movie_map[movie_id] for movie_id in msg.recommended_movie_ids
+                                               if movie_id in movie_map]
             else:
                 msg_dict['recommendations'] = []
-            
             result.append(msg_dict)
-        member = Member.query.get(member_id)
+        member = current_member().member
         return jsonify({
             'messages': result,
             'count': len(result),
@@ -96,11 +107,11 @@ def get(member_id):
         return jsonify({'error': str(e)}), 500
 
 @chat_bp.route('/clear', methods=['DELETE'])
+@query_budget(1)
 @token_required
 def delete(member_id):
     """Delete all chat messages for the current member"""
     try:
-        from flask import current_app
         ChatMessage.query.filter_by(member_id=member_id).delete()
         current_app.cache_manager.clear_chat_context(member_id)
         db.session.commit()
@@ -0,0 +1,30 @@
+from flask import Blueprint, current_app, jsonify
+from auth import token_required
+from models import Job, Movie
+from utils.query_guard import query_budget
+
+jobs_bp = Blueprint('jobs', __name__, url_prefix='/jobs')
+
+@jobs_bp.route('/<int:id>', methods=['GET'])
+@query_budget(2)
+@token_required
+def get(member_id, id):
+    """Poll a background recommendation job"""
+    job = Job.query.filter_by(id=id, member_id=member_id).first()
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+
+    job_dict = job.to_dict()
+    if job.is_pending:
+        response = jsonify({'job': job_dict})
+        response.headers['Retry-After'] = str(current_app.config['JOB_POLL_INTERVAL_SECONDS'])
+        return response, 202
+
+    result = job.result or {}
+    return jsonify({
+        'job': job_dict,
+        'recommendations': {
+            'movies': Movie.hydrate(result.get('recommendations', [])),
+            'message': result.get('message', ''),
+        },
+    }), 200
@@ -1,31 +1,42 @@
 
 
-from flask import Blueprint, request, jsonify, make_response
+from flask import Blueprint, current_app, request, jsonify, make_response
 from sqlalchemy.exc import IntegrityError
 from auth import (
     token_required, 
+    current_member,
     add_token, 
     remove_token, 
     hash_password, 
     check_password,
-    send_verification_email,
+    needs_rehash,
+    queue_verification_email,
+    HashingBusyError,
 )
+from utils.hashing import stats as hashing_stats
+from utils.query_guard import query_budget
 from database import db
 from models import Member
 from datetime import date, datetime
-from utils.movies import get_rating, AGE_UNLOCK_ALL
+from utils.movies import get_rating_tier
 
 
 membership_bp = Blueprint('membership', __name__, url_prefix='/member')
 
+def busy_response(error):
+    """503 telling the client to back off while password hashing is saturated"""
+    response = jsonify({'error': str(error)})
+    response.headers['Retry-After'] = str(current_app.config['BCRYPT_RETRY_AFTER_SECONDS'])
+    return response, 503
+
 @membership_bp.route('', methods=['GET'])
+@query_budget(1)
 @token_required
 def get(member_id):
-    member = Member.query.get(member_id)
+    member = current_member().member
     if member:
         member_dict = member.to_dict()
-        age = member.age()
-        member_dict['rating'] = get_rating(age) if age < AGE_UNLOCK_ALL else 'ALL'
+        member_dict['rating'] = get_rating_tier(member.age())
         print(member_dict)
         return jsonify(member_dict)
     return jsonify({'error': 'Member not found'}), 404
@@ -37,13 +48,26 @@ def login():
     if not member:
         return jsonify({'error': 'Member not found'}), 404
     
-    is_valid = check_password(data.get('password'), member.password_hash)
+    try:
+        is_valid = check_password(data.get('password'), member.password_hash)
+    except HashingBusyError as e:
+        return busy_response(e)
     if not is_valid:
         return jsonify({'error': 'Incorrect Login Info'}), 404
+
+    # Upgrade hashes made with a different work factor while we have the password;
+    # if the pool is saturated, leave it for a later login
+    if needs_rehash(member.password_hash):
+        try:
+            member.password_hash = hash_password(data.get('password'))
+            db.session.commit()
+            hashing_stats.increment('rehashed')
+        except HashingBusyError:
+            db.session.rollback()
     
     return add_token(
         make_response(jsonify({'message': 'Member logged in'})), 
-        member.id
+        member
     )
 
 @membership_bp.route('/logout', methods=['POST'])
@@ -67,28 +91,30 @@ def post():
             date_of_birth=date_of_birth,
         )
 
-        send_verification_email(member)
-
-        # Add and commit to database
+        # Add member and queue verification email in one transaction
         db.session.add(member)
+        queue_verification_email(member)
         db.session.commit()
 
         return add_token(
             make_response(jsonify({'message': 'Member registered'})), 
-            member.id
+            member
         )
         
     except IntegrityError:
         db.session.rollback()
         return jsonify({'error': 'Duplicate Member record attempted'}), 409
+    except HashingBusyError as e:
+        db.session.rollback()
+        return busy_response(e)
 
 @membership_bp.route('/resend-verification', methods=['POST'])
 @token_required
 def resend_verification(member_id):
-    member = Member.query.get(member_id)
+    member = current_member().member
     if member:
-        # Generate new token, send email
-        send_verification_email(member)
+        # Generate new token, queue email
+        queue_verification_email(member)
         db.session.commit()
         return jsonify({'message': 'Verification link resent'})
     return jsonify({'error': 'Member not found'}), 404
@@ -1,15 +1,17 @@
-from flask import Blueprint, request, jsonify
-from auth import token_optional
-from models import Movie
+import json
+from flask import Blueprint, request, jsonify, current_app, send_file, stream_with_context
+from auth import token_optional, current_member
+from database import db, replica_reads
+from models import Movie, MovieChange
 from models.watchlist import Watchlist
-from models.member import Member
-from utils.movies import get_allowable_ratings
+from services.posters import POSTER_VARIANTS, PosterCache, PosterOriginError, get_poster_cache
+from utils.query_guard import query_budget
 from sqlalchemy import and_
-from utils.movies import get_allowable_ratings, AGE_UNLOCK_ALL
 
 movies_bp = Blueprint('movies', __name__, url_prefix='/movies')
 
 @movies_bp.route('', methods=['GET'])
+@query_budget(2)
 @token_optional
 def list(member_id=None):
     page = request.args.get('page', 1, type=int)
@@ -28,11 +30,13 @@ def list(member_id=None):
 
     # Manual LIMIT/OFFSET with SQLAlchemy
     movies_list = []
+    # The member's own watchlist is read from the primary so a movie added a
+    # moment ago shows up; anonymous catalog reads can take the replica
     if member_id:
-        member = Member.query.get(member_id)
-        age = member.age()
-        if age < AGE_UNLOCK_ALL:
-            query = query.filter(Movie.rating.in_(get_allowable_ratings(age)))
+        # Age gating from the token's rating tier; no member lookup needed
+        member = current_member()
+        if not member.unlocks_all:
+            query = query.filter(Movie.rating.in_(member.allowed_ratings))
 
         # Query movies with LEFT JOIN to watchlist
         movies_query = query\
@@ -52,8 +56,9 @@ def list(member_id=None):
 
         total_count = query.count()
     else:
-        movies = query.offset(offset).limit(per_page).all()
-        total_count = Movie.query.count()
+        with replica_reads():
+            movies = query.offset(offset).limit(per_page).all()
+            total_count = Movie.query.count()
         movies_list = [movie.to_dict() for movie in movies]
 
     return jsonify({
@@ -65,16 +70,10 @@ def list(member_id=None):
     })
 
 @movies_bp.route('/<int:id>', methods=['GET'])
+@query_budget(1)
 @token_optional
 def get(id, member_id=None):
     if member_id:
-        movie = Movie.query.get(id)
-        member = Member.query.get(member_id)
-        age = member.age()
-        allowed_ratings = get_allowable_ratings(age)
-        if not movie.rating in allowed_ratings and age < AGE_UNLOCK_ALL:
-            return jsonify({'error': 'Movie not found'}), 404
-
         # Query with watchlist data
         result = Movie.query\
             .outerjoin(Watchlist, and_(
@@ -92,6 +91,10 @@ def get(id, member_id=None):
             return jsonify({'error': 'Movie not found'}), 404
         
         movie, in_watchlist, status = result
+        member = current_member()
+        if not member.unlocks_all and movie.rating not in member.allowed_ratings:
+            return jsonify({'error': 'Movie not found'}), 404
+
         movie_dict = movie.to_dict()
         movie_dict['inWatchlist'] = in_watchlist
         if status:
@@ -99,20 +102,95 @@ def get(id, member_id=None):
         
         return jsonify(movie_dict)
     else:
-        # No auth - just return movie
-        movie = Movie.query.get(id)
+        # No auth - just return movie (no watchlist state, so the replica will do)
+        with replica_reads():
+            movie = Movie.query.get(id)
         if not movie:
             return jsonify({'error': 'Movie not found'}), 404
         return jsonify(movie.to_dict())
 
+@movies_bp.route('/changes', methods=['GET'])
+@query_budget(3)
+def changes():
+    """
+    Catalog change feed as NDJSON: {"version", "id", "op"} per changed movie
+
+    Clients load the catalog once, keep the X-Catalog-Version header and
+    then poll ?since=<that version>. A full page (`limit` lines) means more
+    changes are waiting: continue from the last line's version. 410 means
+    the log no longer reaches back to `since` and the catalog must be
+    reloaded. Reads the primary so the version and the rows agree.
+    """
+    since = request.args.get('since', 0, type=int)
+    config = current_app.config
+    limit = request.args.get('limit', config['CATALOG_CHANGES_PAGE_SIZE'], type=int)
+    if limit < 1:
+        return jsonify({'error': 'limit must be a positive integer'}), 400
+    limit = min(limit, config['CATALOG_CHANGES_MAX_PAGE_SIZE'])
+
+    upto = MovieChange.current_version()
+    oldest = MovieChange.oldest_version()
+    if oldest is not None and since < oldest - 1:
+        return jsonify({'error': 'Change history expired; reload the catalog', 'version': upto}), 410
+
+    # Execute here, inside the view, so the query guard and request metrics
+    # count the statement; the generator only fetches rows as it streams
+    rows = db.session.execute(MovieChange.since(since, upto, limit).statement,
+                              execution_options={'yield_per': 1000})
+
+    def generate():
+        for version, movie_id, op in rows:
+            yield json.dumps({'version': version, 'id': movie_id, 'op': op}) + '\n'
+
+    response = current_app.response_class(stream_with_context(generate()), mimetype='application/x-ndjson')
+    response.headers['X-Catalog-Version'] = str(upto)
+    return response
+
 @movies_bp.route('/genres', methods=['GET'])
+@query_budget(1)
+@replica_reads()
 def genres():
-    genres = Movie.query\
-        .with_entities(Movie.genre)\
-        .distinct()\
-        .order_by(Movie.genre)\
-        .all()
-    
+    # Snapshot is warmed before workers fork (see wsgi.py)
+    genres = current_app.cache_manager.get_genres()
+    if genres is None:
+        genres = Movie.genres()
+        current_app.cache_manager.set_genres(genres)
+
     return jsonify({
-        'genres': [g[0] for g in genres if g[0]]  # Filter out None values
-    })
\ No newline at end of file
+        'genres': genres
+    })
+
+@movies_bp.route('/<int:id>/poster/<variant>', methods=['GET'])
+@query_budget(1)
+@replica_reads()
+def poster(id, variant):
+    """Poster image served from the local cache (variants: w92, w185, w342, original)"""
+    if variant not in POSTER_VARIANTS:
+        return jsonify({'error': f'Unknown poster variant: {variant}'}), 404
+
+    poster_url = Movie.query\
+        .with_entities(Movie.poster_url)\
+        .filter(Movie.id == id)\
+        .scalar()
+    if not poster_url:
+        return jsonify({'error': 'Poster not found'}), 404
+    # A cache miss waits on the origin; don't hold a pooled connection meanwhile
+    db.session.remove()
+
+    # Revalidation needs only the URL, not the file
+    etag = PosterCache.etag(poster_url, variant)
+    if etag in request.if_none_match:
+        response = current_app.response_class(status=304)
+        response.set_etag(etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = current_app.config['POSTER_MAX_AGE_SECONDS']
+        return response
+
+    try:
+        path = get_poster_cache().get(id, poster_url, variant)
+    except PosterOriginError as e:
+        print(f"Poster fetch failed for movie {id}: {e}")
+        return jsonify({'error': 'Poster unavailable'}), 502
+
+    return send_file(path, mimetype=PosterCache.mimetype(poster_url, variant), etag=etag,
+                     conditional=True, max_age=current_app.config['POSTER_MAX_AGE_SECONDS'])
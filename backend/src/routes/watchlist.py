@@ -1,25 +1,22 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from database import db
 from models.chat_message import ChatMessage
 from models.watchlist import Watchlist, WatchlistStatus
-from models.member import Member
 from sqlalchemy.orm import joinedload
 from models.movie import Movie
-from auth import token_required
+from auth import token_required, current_member
 from datetime import datetime
-from utils.movies import (
-    get_allowable_ratings, 
-    get_rating, 
-    age_unlocks_ratings, 
-    AGE_UNLOCK_ALL
-)
+from utils.movies import get_rating, age_unlocks_ratings
 from sqlalchemy.sql import func
 from models.movie import Movie
 from services import RecommendationsService, RecommendationTrigger
+from services.jobs import JobQueue
+from utils.query_guard import query_budget
 
 watchlist_bp = Blueprint('watchlist', __name__, url_prefix='/watchlist')
 
 @watchlist_bp.route('', methods=['POST'])
+@query_budget(5)
 @token_required
 def post(member_id):
     """Add a movie to members's watchlist"""
@@ -34,10 +31,8 @@ def post(member_id):
     if not movie:
         return jsonify({'error': 'Movie not found'}), 404
     
-    member = Member.query.get(member_id)
-    age = member.age()
-    allowed_ratings = get_allowable_ratings(age)
-    if not movie.rating in allowed_ratings and age < AGE_UNLOCK_ALL:
+    member = current_member()
+    if not member.unlocks_all and movie.rating not in member.allowed_ratings:
         return jsonify({'error': 'Movie not found'}), 404
 
     # Check if already in watchlist
@@ -52,7 +47,6 @@ def post(member_id):
         watchlist_item = Watchlist(member_id=member_id, movie_id=movie_id)
         db.session.add(watchlist_item)
         
-        from flask import current_app
         # Complete chat exchange within same transaction
         ChatMessage.complete_exchange(member_id)
         current_app.cache_manager.clear_chat_context(member_id)
@@ -69,6 +63,7 @@ def post(member_id):
 
 
 @watchlist_bp.route('', methods=['GET'])
+@query_budget(1)
 @token_required
 def get(member_id):
     """Get member's watchlist with optional status filter"""
@@ -97,6 +92,7 @@ def get(member_id):
 
 
 @watchlist_bp.route('/<int:movie_id>', methods=['DELETE'])
+@query_budget(3)
 @token_required
 def delete(member_id, movie_id):
     """Remove a movie from member's watchlist"""
@@ -123,6 +119,7 @@ def delete(member_id, movie_id):
         return jsonify({'error': str(e)}), 500
 
 @watchlist_bp.route('/<int:movie_id>', methods=['PATCH'])
+@query_budget(3)
 @token_required
 def update(member_id, movie_id):
     """Update watchlist item status (mark as watched/queued)"""
@@ -162,6 +159,7 @@ def update(member_id, movie_id):
     }), 200
 
 @watchlist_bp.route('/overview', methods=['GET'])
+@query_budget(8)
 @token_required
 def overview(member_id):
     """
@@ -170,16 +168,22 @@ def overview(member_id):
     2. Empty watchlist → fresh random picks
     3. All watched, no queued → similar recommendations (AI)
     4. Has queued movies → return those
+
+    The AI trigger runs on a background worker when ASYNC_AI_TRIGGERS is on:
+    a fresh result is served straight away, otherwise fallback picks come
+    back with 202 and a job to poll at /jobs/<id>.
     """
-    member = Member.query.get(member_id)
+    member = current_member().member
     
     reason = ''
     serialized_movies = []
+    job = None
+    statuses = None
     
     # Priority 0: Unverified
     if not member.email_verified:
         print('TRIGGER: UNVERIFIED')
-        rs = RecommendationsService(member_id)
+        rs = RecommendationsService(member_id, current_member())
         result = rs.get(trigger=RecommendationTrigger.DATABASE_RANDOM)
         serialized_movies = Movie.hydrate(result.get('recommendations', []))
         reason = 'Fresh picks from our collection'
@@ -194,7 +198,7 @@ def overview(member_id):
             reason = f"Happy Birthday! {rating} movies have been unlocked!"
         else:
             reason = f"You are now able to browse {rating} movies."
-        rs = RecommendationsService(member_id)
+        rs = RecommendationsService(member_id, current_member())
         result = rs.get(
             trigger=RecommendationTrigger.RATING_UNLOCK, 
             params={'rating': rating}
@@ -202,19 +206,17 @@ def overview(member_id):
         serialized_movies = Movie.hydrate(result.get('recommendations', []))
     
     else:
-        # Get watchlist stats
-        watchlist_items = Watchlist.query\
-            .filter_by(member_id=member_id)\
-            .all()
+        # Get watchlist stats (statuses only; reused for the response totals)
+        statuses = db.session.query(Watchlist.status).filter_by(member_id=member_id).all()
         
-        queued_count = sum(1 for item in watchlist_items if item.status == WatchlistStatus.QUEUED)
-        watched_count = sum(1 for item in watchlist_items if item.status == WatchlistStatus.WATCHED)
-        total_count = len(watchlist_items)
+        queued_count = sum(1 for (s,) in statuses if s == WatchlistStatus.QUEUED)
+        watched_count = sum(1 for (s,) in statuses if s == WatchlistStatus.WATCHED)
+        total_count = len(statuses)
         
         # Priority 2: Empty watchlist → random fresh picks
         if total_count == 0:
             print('TRIGGER: FRESH PICKS')
-            rs = RecommendationsService(member_id)
+            rs = RecommendationsService(member_id, current_member())
             result = rs.get(trigger=RecommendationTrigger.DATABASE_RANDOM)
             serialized_movies = Movie.hydrate(result.get('recommendations', []))
             reason = 'Fresh picks from our collection'
@@ -222,10 +224,24 @@ def overview(member_id):
         # Priority 3: All watched, no queued → similar recommendations
         elif queued_count == 0 and watched_count > 0:
             print('TRIGGER: SIMILAR FILMS')
-            rs = RecommendationsService(member_id)
-            result = rs.get(trigger=RecommendationTrigger.WATCHLIST_SIMILAR)
+            trigger = RecommendationTrigger.WATCHLIST_SIMILAR
+            if current_app.config['ASYNC_AI_TRIGGERS']:
+                result = current_app.cache_manager.get_recommendations(member_id, trigger)\
+                    or JobQueue.latest_result(member_id, trigger)
+                if result:
+                    current_app.cache_manager.set_recommendations(member_id, trigger, result)
+                else:
+                    job = JobQueue.enqueue(member_id, trigger)
+            else:
+                result = RecommendationsService(member_id, current_member()).get(trigger=trigger)
+
+            if job:
+                rs = RecommendationsService(member_id, current_member())
+                result = rs.get(trigger=RecommendationTrigger.DATABASE_RANDOM)
+                reason = 'Fresh picks while we find movies like the ones you\'ve watched'
+            else:
+                reason = 'Based on movies you\'ve watched'
             serialized_movies = Movie.hydrate(result.get('recommendations', []))
-            reason = 'Based on movies you\'ve watched'
         
         # Priority 4: Has queued movies → return those (already hydrated)
         else:
@@ -238,8 +254,9 @@ def overview(member_id):
             reason = 'Movies from your watchlist queue'
     
     # Get final stats for response
-    statuses = db.session.query(Watchlist.status).filter_by(member_id=member_id).all()
-    return jsonify({
+    if statuses is None:
+        statuses = db.session.query(Watchlist.status).filter_by(member_id=member_id).all()
+    body = {
         'watchlist': {
             'total': len(statuses),
             'watched': sum(1 for (s,) in statuses if s == 'watched'),
@@ -249,4 +266,8 @@ def overview(member_id):
             'movies': serialized_movies,
             'reason': reason,
         }
-    }), 200
\ No newline at end of file
+    }
+    if job:
+        body['job'] = job.to_dict()
+        return jsonify(body), 202
+    return jsonify(body), 200
\ No newline at end of file
@@ -1,2 +1,22 @@
 # backend/src/services/__init__.py
-from .recommendations import RecommendationsService, RecommendationTrigger
\ No newline at end of file
+"""
+Service layer
+
+Exports resolve on first access (PEP 562), so importing a light submodule
+such as services.mailer doesn't drag in the AI recommendation stack.
+"""
+import importlib
+
+_EXPORTS = {
+    'RecommendationsService': 'services.recommendations',
+    'RecommendationTrigger': 'services.triggers',
+    'warm_templates': 'services.recommendations',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
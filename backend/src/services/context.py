@@ -0,0 +1,157 @@
+"""Token-budgeted prompt context for the chatbot trigger"""
+import math
+import re
+from flask import current_app
+
+CHARS_PER_TOKEN = 4
+LINE_OVERHEAD_TOKENS = 1    # newline / list separator per rendered line
+MESSAGE_OVERHEAD_TOKENS = 4  # role marker and framing per chat turn
+COMPACTED_SUFFIX = ' […]'
+WORD_PATTERN = re.compile(r'[a-z0-9]{3,}')
+# Words in nearly every prompt or movie line; they say nothing about relevance
+STOPWORDS = frozenset('''
+    about after all also and any are but can could did does for from get give had has have her
+    his how into its just like more most not now one only other our out really she should show
+    some something that the their them then there these they this those too very want was way
+    were what when which who why will with would you your
+    film films movie movies watch watched watching recommend recommendation recommendations
+    similar good great best new see seen
+'''.split())
+
+# Share of the free budget each block may claim before handing leftovers on
+HISTORY_SHARE = 0.4
+WATCHLIST_SHARE = 0.2
+
+
+def estimate_tokens(text):
+    """Rough token estimate (~4 characters per token)"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+
+def _line_tokens(lines):
+    return sum(estimate_tokens(line) + LINE_OVERHEAD_TOKENS for line in lines)
+
+
+def _history_tokens(history):
+    return sum(estimate_tokens(turn['content']) + MESSAGE_OVERHEAD_TOKENS for turn in history)
+
+
+def _words(text):
+    return set(WORD_PATTERN.findall(text.lower())) - STOPWORDS
+
+
+class ContextBuilder:
+    """
+    Fits watchlist, candidate movies and chat history into a token budget
+
+    Blocks are trimmed in priority order: recent history first, then the
+    watchlist, then available movies, each taking at most its share of the
+    budget left after the fixed prompt and the new message. Whatever a block
+    doesn't use is handed to the next one. The savings of every trim are
+    kept in ``metrics``.
+    """
+
+    def __init__(self, budget=None, verbatim_turns=None, compact_chars=None):
+        """
+        Args:
+            budget: Total prompt token budget (defaults to CHAT_CONTEXT_TOKEN_BUDGET)
+            verbatim_turns: Most recent history turns kept word for word
+            compact_chars: Length older history turns are cut down to
+        """
+        self.budget = budget or current_app.config['CHAT_CONTEXT_TOKEN_BUDGET']
+        self.verbatim_turns = verbatim_turns if verbatim_turns is not None else current_app.config['CHAT_HISTORY_VERBATIM_TURNS']
+        self.compact_chars = compact_chars or current_app.config['CHAT_HISTORY_COMPACT_CHARS']
+        self.metrics = {}
+
+    def fit(self, base_prompt, message, watchlist, available, history):
+        """
+        Trim context blocks so the whole prompt fits the budget
+
+        Args:
+            base_prompt: System prompt rendered with empty blocks
+            message: The new user message
+            watchlist: Watchlist lines, most recent first
+            available: Candidate movie lines
+            history: Chat history dicts ({role, content}), oldest first
+
+        Returns:
+            tuple: (watchlist, available, history) trimmed to the budget
+        """
+        fixed = estimate_tokens(base_prompt) + estimate_tokens(message) + MESSAGE_OVERHEAD_TOKENS
+        free = max(self.budget - fixed, 0)
+        keywords = _words(message)
+
+        history_out = self._fit_history(history, int(free * HISTORY_SHARE))
+        free -= _history_tokens(history_out)
+
+        watchlist_out = self._fit_lines('watchlist', watchlist, keywords, int(free * WATCHLIST_SHARE / (1 - HISTORY_SHARE)))
+        free -= _line_tokens(watchlist_out)
+
+        available_out = self._fit_lines('available', available, keywords, free)
+        free -= _line_tokens(available_out)
+
+        self.metrics['total'] = {
+            'budget': self.budget,
+            'fixed_tokens': fixed,
+            'tokens_after': self.budget - free,
+            'tokens_saved': sum(block['tokens_saved'] for block in self.metrics.values()),
+        }
+        return watchlist_out, available_out, history_out
+
+    def _fit_lines(self, name, lines, keywords, budget):
+        """Keep the most relevant lines (keyword overlap, then original order) that fit"""
+        ranked = sorted(
+            enumerate(lines),
+            key=lambda pair: (-len(keywords & _words(pair[1])), pair[0])
+        )
+        kept, used = [], 0
+        for index, line in ranked:
+            cost = estimate_tokens(line) + LINE_OVERHEAD_TOKENS
+            if used + cost > budget:
+                continue
+            kept.append((index, line))
+            used += cost
+
+        # Present survivors in their original order (e.g. most recent first)
+        result = [line for _, line in sorted(kept)]
+        self._record(name, lines, result, _line_tokens(lines), used)
+        return result
+
+    def _fit_history(self, history, budget):
+        """Compact older turns, then drop the oldest until the rest fits"""
+        cutoff = max(len(history) - self.verbatim_turns, 0)
+        compacted = [
+            self._compact(turn) if index < cutoff else turn
+            for index, turn in enumerate(history)
+        ]
+
+        while compacted and _history_tokens(compacted) > budget:
+            compacted.pop(0)
+        # The API expects the conversation to open with a user turn
+        while compacted and compacted[0]['role'] != 'user':
+            compacted.pop(0)
+
+        self._record('history', history, compacted, _history_tokens(history), _history_tokens(compacted))
+        return compacted
+
+    def _compact(self, turn):
+        content = turn['content']
+        if len(content) <= self.compact_chars:
+            return turn
+        return {**turn, 'content': content[:self.compact_chars].rstrip() + COMPACTED_SUFFIX}
+
+    def _record(self, name, before, after, tokens_before, tokens_after):
+        self.metrics[name] = {
+            'items_before': len(before),
+            'items_after': len(after),
+            'tokens_before': tokens_before,
+            'tokens_after': tokens_after,
+            'tokens_saved': tokens_before - tokens_after,
+        }
+
+    def summary(self):
+        """One-line description of what each trim saved"""
+        return ', '.join(
+            f"{name}: {block['items_before']}→{block['items_after']} items, -{block['tokens_saved']} tokens"
+            for name, block in self.metrics.items() if name != 'total'
+        )
@@ -0,0 +1,179 @@
+"""Database-backed job queue for slow, AI-backed recommendation triggers"""
+import time
+import traceback
+from datetime import datetime, timedelta
+from flask import current_app
+from database import db
+from models.agent_usage import AgentUsage
+from models.job import Job, JobStatus, PENDING_STATUSES
+from sqlalchemy.exc import IntegrityError
+from services.recommendations import RecommendationsService, RecommendationTrigger
+
+
+class JobQueue:
+    """Enqueue, claim and run recommendation jobs stored in the `job` table"""
+
+    @staticmethod
+    def enqueue(member_id, trigger):
+        """
+        Queue a job unless one is already pending for this member and trigger
+
+        Args:
+            member_id: Member's ID
+            trigger: RecommendationTrigger to run in the background
+
+        Returns:
+            Job: The new or already pending job
+        """
+        existing = JobQueue.pending(member_id, trigger)
+        if existing:
+            return existing
+
+        job = Job(member_id=member_id, trigger=trigger.value)
+        db.session.add(job)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Lost the race with a concurrent request; reuse its job
+            db.session.rollback()
+            return JobQueue.pending(member_id, trigger)
+        return job
+
+    @staticmethod
+    def pending(member_id, trigger):
+        return Job.query\
+            .filter_by(member_id=member_id, trigger=trigger.value)\
+            .filter(Job.status.in_(PENDING_STATUSES))\
+            .first()
+
+    @staticmethod
+    def latest_result(member_id, trigger, max_age_seconds=None):
+        """Result of the newest finished job for this trigger, if still fresh"""
+        max_age = max_age_seconds or current_app.config['JOB_RESULT_TTL_SECONDS']
+        job = Job.query\
+            .filter_by(member_id=member_id, trigger=trigger.value, status=JobStatus.DONE)\
+            .filter(Job.finished_at >= datetime.utcnow() - timedelta(seconds=max_age))\
+            .order_by(Job.finished_at.desc())\
+            .first()
+        return job.result if job else None
+
+    @staticmethod
+    def claim():
+        """
+        Atomically claim the oldest runnable job
+
+        Queued jobs are picked with SKIP LOCKED so any number of workers can
+        poll the same table. Running jobs whose worker died (started longer
+        than JOB_TIMEOUT_SECONDS ago) are picked up again while they have
+        attempts left; those that don't are failed (see fail_stale).
+
+        Returns:
+            Job or None
+        """
+        stale = JobQueue.fail_stale()
+        job = Job.query\
+            .filter(db.or_(
+                Job.status == JobStatus.QUEUED,
+                db.and_(Job.status == JobStatus.RUNNING, Job.started_at < stale,
+                        Job.attempts < current_app.config['JOB_MAX_ATTEMPTS']),
+            ))\
+            .order_by(Job.created_at.asc())\
+            .with_for_update(skip_locked=True)\
+            .first()
+        if job is None:
+            db.session.rollback()
+            return None
+
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.utcnow()
+        job.attempts += 1
+        db.session.commit()
+        return job
+
+    @staticmethod
+    def fail_stale():
+        """
+        Fail running jobs whose worker died on their last allowed attempt
+
+        A job that kills its worker (OOM, segfault, SIGKILL at a timeout)
+        never reaches run()'s error handling, so the retry cap is enforced
+        here instead.
+
+        Returns:
+            datetime: The staleness cutoff (jobs started before it are stale)
+        """
+        now = datetime.utcnow()
+        stale = now - timedelta(seconds=current_app.config['JOB_TIMEOUT_SECONDS'])
+        max_attempts = current_app.config['JOB_MAX_ATTEMPTS']
+        failed = Job.query\
+            .filter(Job.status == JobStatus.RUNNING,
+                    Job.started_at < stale,
+                    Job.attempts >= max_attempts)\
+            .update({
+                Job.status: JobStatus.FAILED,
+                Job.error: f"Worker stopped responding after {max_attempts} attempts",
+                Job.finished_at: now,
+            }, synchronize_session=False)
+        if failed:
+            db.session.commit()
+        return stale
+
+    @staticmethod
+    def run(job):
+        """Execute a claimed job and store its result or failure"""
+        try:
+            rs = RecommendationsService(job.member_id)
+            trigger = RecommendationTrigger(job.trigger)
+            result = rs.get(trigger=trigger)
+            if rs.claude_client and rs.claude_client.has_response():
+                # Background triggers are logged but don't draw on discussion power
+                AgentUsage.record(
+                    job.member_id, trigger,
+                    usage=rs.claude_client.get_usage(),
+                    cost=rs.claude_client.get_usage_cost(),
+                    charge=False,
+                )
+            job.result = result
+            job.error = None
+            job.status = JobStatus.DONE
+            job.finished_at = datetime.utcnow()
+        except Exception as e:
+            traceback.print_exc()
+            db.session.rollback()
+            job.error = str(e)
+            # Leave it queued for another attempt until the retry budget is spent
+            if job.attempts >= current_app.config['JOB_MAX_ATTEMPTS']:
+                job.status = JobStatus.FAILED
+                job.finished_at = datetime.utcnow()
+            else:
+                job.status = JobStatus.QUEUED
+        db.session.commit()
+        return job
+
+
+def work(poll_interval=None, once=False):
+    """
+    Worker loop: claim and run jobs until interrupted
+
+    Args:
+        poll_interval: Seconds to sleep when the queue is empty
+        once: Drain the queue once and return instead of polling forever
+
+    Returns:
+        int: Number of jobs processed
+    """
+    poll_interval = poll_interval or current_app.config['JOB_POLL_INTERVAL_SECONDS']
+    processed = 0
+    while True:
+        job = JobQueue.claim()
+        if job is None:
+            if once:
+                return processed
+            time.sleep(poll_interval)
+            continue
+
+        started = time.perf_counter()
+        JobQueue.run(job)
+        processed += 1
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"JOB {job.id} {job.trigger} member={job.member_id} -> {job.status.value} in {elapsed:.0f}ms")
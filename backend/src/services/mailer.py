@@ -0,0 +1,156 @@
+"""Email outbox dispatcher and pluggable delivery transports"""
+import json
+import os
+import smtplib
+import time
+import traceback
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from flask import current_app
+from database import db
+from models.email_outbox import EmailOutbox, OutboxStatus
+
+
+class SendGridTransport:
+    """Delivers through the SendGrid HTTP API"""
+
+    def __init__(self, api_key=None):
+        self.api_key = api_key or os.environ.get('SENDGRID_API_KEY')
+
+    def send(self, email):
+        from sendgrid import SendGridAPIClient
+        from sendgrid.helpers.mail import Mail
+        message = Mail(
+            from_email=current_app.config['MAIL_FROM'],
+            to_emails=email.to_email,
+            subject=email.subject,
+            html_content=email.html_content,
+        )
+        response = SendGridAPIClient(self.api_key).send(message)
+        if response.status_code >= 300:
+            raise RuntimeError(f"SendGrid responded {response.status_code}")
+
+
+class SMTPTransport:
+    """Delivers over plain SMTP, e.g. to a local sink like MailHog"""
+
+    def __init__(self, host=None, port=None):
+        self.host = host or current_app.config['SMTP_HOST']
+        self.port = port or current_app.config['SMTP_PORT']
+
+    def send(self, email):
+        with smtplib.SMTP(self.host, self.port, timeout=10) as smtp:
+            smtp.send_message(_to_message(email))
+
+
+class FileTransport:
+    """Writes each email to a directory instead of sending it (tests, local dev)"""
+
+    def __init__(self, directory=None):
+        self.directory = directory or current_app.config['MAIL_SINK_DIR']
+        os.makedirs(self.directory, exist_ok=True)
+
+    def send(self, email):
+        path = os.path.join(self.directory, f"{email.id}.eml")
+        with open(path, 'w') as f:
+            f.write(_to_message(email).as_string())
+
+
+TRANSPORTS = {
+    'sendgrid': SendGridTransport,
+    'smtp': SMTPTransport,
+    'file': FileTransport,
+}
+
+
+def get_transport(name=None):
+    """Build the transport selected by MAIL_TRANSPORT"""
+    name = name or current_app.config['MAIL_TRANSPORT']
+    if name not in TRANSPORTS:
+        raise ValueError(f"Unknown mail transport: {name}")
+    return TRANSPORTS[name]()
+
+
+def _to_message(email):
+    message = EmailMessage()
+    message['From'] = current_app.config['MAIL_FROM']
+    message['To'] = email.to_email
+    message['Subject'] = email.subject
+    message.set_content(email.html_content, subtype='html')
+    return message
+
+
+def enqueue(to_email, subject, html_content):
+    """Add an email to the outbox in the current transaction (no commit)"""
+    email = EmailOutbox(to_email=to_email, subject=subject, html_content=html_content)
+    db.session.add(email)
+    return email
+
+
+def dispatch_batch(transport, batch_size=None):
+    """
+    Send one batch of due emails
+
+    Rows are locked with SKIP LOCKED, so several dispatchers can run side
+    by side. Failures are retried with exponential backoff until
+    OUTBOX_MAX_ATTEMPTS, then marked failed.
+
+    Returns:
+        dict: {'sent': int, 'retrying': int, 'failed': int}
+    """
+    now = datetime.utcnow()
+    emails = EmailOutbox.query\
+        .filter(EmailOutbox.status == OutboxStatus.PENDING, EmailOutbox.next_attempt_at <= now)\
+        .order_by(EmailOutbox.next_attempt_at.asc())\
+        .with_for_update(skip_locked=True)\
+        .limit(batch_size or current_app.config['OUTBOX_BATCH_SIZE'])\
+        .all()
+
+    counts = {'sent': 0, 'retrying': 0, 'failed': 0}
+    for email in emails:
+        email.attempts += 1
+        try:
+            transport.send(email)
+            email.status = OutboxStatus.SENT
+            email.sent_at = datetime.utcnow()
+            email.last_error = None
+            counts['sent'] += 1
+        except Exception as e:
+            traceback.print_exc()
+            email.last_error = str(e)
+            if email.attempts >= current_app.config['OUTBOX_MAX_ATTEMPTS']:
+                email.status = OutboxStatus.FAILED
+                counts['failed'] += 1
+            else:
+                delay = current_app.config['OUTBOX_RETRY_BASE_SECONDS'] * 2 ** (email.attempts - 1)
+                email.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+                counts['retrying'] += 1
+    db.session.commit()
+    return counts
+
+
+def dispatch(transport=None, poll_interval=None, once=False):
+    """
+    Dispatcher loop: send due batches until interrupted
+
+    Args:
+        transport: Delivery transport (defaults to MAIL_TRANSPORT)
+        poll_interval: Seconds to sleep when nothing is due
+        once: Send everything currently due and return
+
+    Returns:
+        dict: Totals per outcome
+    """
+    transport = transport or get_transport()
+    poll_interval = poll_interval or current_app.config['OUTBOX_POLL_INTERVAL_SECONDS']
+    totals = {'sent': 0, 'retrying': 0, 'failed': 0}
+    while True:
+        counts = dispatch_batch(transport)
+        for key, value in counts.items():
+            totals[key] += value
+        if any(counts.values()):
+            print(f"OUTBOX {json.dumps(counts)}")
+            continue
+        if once:
+            return totals
+        time.sleep(poll_interval)
@@ -0,0 +1,191 @@
+"""Local poster image cache: originals on disk, resized variants on demand"""
+import hashlib
+import mimetypes
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from flask import current_app
+
+# Variant name -> target width in pixels (None keeps the original file)
+POSTER_VARIANTS = {
+    'w92': 92,
+    'w185': 185,
+    'w342': 342,
+    'original': None,
+}
+
+
+class PosterOriginError(Exception):
+    """The origin could not supply a poster"""
+
+
+class HTTPOrigin:
+    """Fetches posters from their poster_url (TMDB image CDN)"""
+
+    def __init__(self, timeout=None):
+        import requests
+        self.timeout = timeout or current_app.config['POSTER_ORIGIN_TIMEOUT_SECONDS']
+        self.session = requests.Session()
+
+    def fetch(self, url):
+        import requests
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            raise PosterOriginError(str(e)) from e
+        return response.content
+
+
+class DirectoryOrigin:
+    """Reads posters from a local directory by poster_url basename (tests, local dev)"""
+
+    def __init__(self, directory=None):
+        self.directory = directory or current_app.config['POSTER_ORIGIN_DIR']
+
+    def fetch(self, url):
+        path = os.path.join(self.directory, os.path.basename(url.split('?')[0]))
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError as e:
+            raise PosterOriginError(str(e)) from e
+
+
+ORIGINS = {
+    'http': HTTPOrigin,
+    'directory': DirectoryOrigin,
+}
+
+
+def get_origin(name=None):
+    """Build the origin selected by POSTER_ORIGIN"""
+    name = name or current_app.config['POSTER_ORIGIN']
+    if name not in ORIGINS:
+        raise ValueError(f"Unknown poster origin: {name}")
+    return ORIGINS[name]()
+
+
+class PosterCache:
+    """
+    Poster files on local disk, keyed by movie id and poster_url
+
+    Files live under <directory>/<id % 100>/<id>/<digest>/, where digest
+    hashes the poster_url, so a changed poster never serves a stale file.
+    Writes go to a temp name and are renamed into place, which makes
+    concurrent workers generating the same variant safe.
+    """
+
+    def __init__(self, directory=None, origin=None, quality=None):
+        self.directory = directory or current_app.config['POSTER_CACHE_DIR']
+        self.origin = origin or get_origin()
+        self.quality = quality or current_app.config['POSTER_JPEG_QUALITY']
+
+    @staticmethod
+    def digest(poster_url):
+        return hashlib.sha1(poster_url.encode('utf-8')).hexdigest()[:16]
+
+    @classmethod
+    def etag(cls, poster_url, variant):
+        return f"{cls.digest(poster_url)}-{variant}"
+
+    @staticmethod
+    def mimetype(poster_url, variant):
+        if POSTER_VARIANTS[variant]:
+            return 'image/jpeg'
+        return mimetypes.guess_type(poster_url.split('?')[0])[0] or 'image/jpeg'
+
+    def path(self, movie_id, poster_url, variant):
+        if POSTER_VARIANTS[variant]:
+            filename = f"{variant}.jpg"
+        else:
+            filename = 'original' + (os.path.splitext(poster_url.split('?')[0])[1] or '.jpg')
+        return os.path.join(self.directory, f"{movie_id % 100:02d}", str(movie_id),
+                            self.digest(poster_url), filename)
+
+    def _write(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def original(self, movie_id, poster_url):
+        """Path of the cached original, fetching it from the origin on a miss"""
+        path = self.path(movie_id, poster_url, 'original')
+        if not os.path.exists(path):
+            self._write(path, self.origin.fetch(poster_url))
+        return path
+
+    def get(self, movie_id, poster_url, variant):
+        """
+        Path of a poster variant, creating it (and the original) on a miss
+
+        Raises:
+            PosterOriginError: The original isn't cached and the origin failed
+        """
+        path = self.path(movie_id, poster_url, variant)
+        if os.path.exists(path):
+            return path
+        original = self.original(movie_id, poster_url)
+        if POSTER_VARIANTS[variant] is None:
+            return original
+        try:
+            data = self.resize(original, POSTER_VARIANTS[variant])
+        except OSError as e:
+            # Not an image (e.g. an error page); refetch on the next request
+            os.remove(original)
+            raise PosterOriginError(f"Unreadable poster for movie {movie_id}: {e}") from e
+        self._write(path, data)
+        return path
+
+    def resize(self, source, width):
+        """JPEG bytes of the image at source scaled down to width (never up)"""
+        from PIL import Image
+        with Image.open(source) as image:
+            if image.mode != 'RGB':
+                image = image.convert('RGB')
+            if image.width > width:
+                height = round(image.height * width / image.width)
+                image = image.resize((width, height), Image.LANCZOS)
+            out = BytesIO()
+            image.save(out, 'JPEG', quality=self.quality, optimize=True, progressive=True)
+        return out.getvalue()
+
+
+def warm(cache, posters, variants, workers=8):
+    """
+    Generate poster variants ahead of requests
+
+    Args:
+        cache: PosterCache
+        posters: Iterable of (movie_id, poster_url)
+        variants: Variant names to build for each poster
+        workers: Concurrent origin fetches
+
+    Returns:
+        dict: {'ready': int, 'failed': int} posters
+    """
+    def build(poster):
+        movie_id, poster_url = poster
+        try:
+            for variant in variants:
+                cache.get(movie_id, poster_url, variant)
+        except PosterOriginError as e:
+            print(f"Poster warm failed for movie {movie_id}: {e}")
+            return False
+        return True
+
+    counts = {'ready': 0, 'failed': 0}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for ok in pool.map(build, posters):
+            counts['ready' if ok else 'failed'] += 1
+    return counts
+
+
+def get_poster_cache():
+    """One cache (and origin connection pool) per app"""
+    if 'poster_cache' not in current_app.extensions:
+        current_app.extensions['poster_cache'] = PosterCache()
+    return current_app.extensions['poster_cache']
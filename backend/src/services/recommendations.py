@@ -1,41 +1,61 @@
-from enum import Enum
+import os
+from functools import lru_cache
 from pathlib import Path
-from jinja2 import Environment, FileSystemLoader
-from models import Movie, Member
+from config import Config
+from models import Movie
 from models.watchlist import Watchlist
 from models.chat_message import ChatMessage
 from sqlalchemy.orm import joinedload
-from utils.movies import extract_filters, get_allowable_ratings, AGE_UNLOCK_ALL
+from utils.movies import extract_filters
+from auth import MemberContext
 from sqlalchemy.sql import func
 from aiagent.claude import ClaudeClient
+from services.context import ContextBuilder
+from services.triggers import RecommendationTrigger
 from functools import wraps
 from utils.cache import CacheKeys, cache_recommendations, cache_available_movies
+from utils.metrics import observe_context
 
 # Template directory constant
 TEMPLATE_DIR = Path(__file__).resolve().parent.parent / 'templates' / 'context'
+CONTEXT_TEMPLATES = ('chatbot.jinja', 'similar.jinja')
 
-class RecommendationTrigger(Enum):
-    """Enum for recommendation trigger types"""
-    CHATBOT_MESSAGE = "chatbot"
-    RATING_UNLOCK = "unlock"
-    WATCHLIST_QUEUED = "queued"
-    WATCHLIST_SIMILAR = "similar"
-    DATABASE_RANDOM = "fresh"
+@lru_cache(maxsize=None)
+def get_jinja_env():
+    """
+    One environment per process: templates compile once and stay in memory.
+    Compiled bytecode is also kept on disk so fresh workers skip compilation.
+    """
+    from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+    os.makedirs(Config.JINJA_BYTECODE_CACHE_DIR, exist_ok=True)
+    return Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR),
+        bytecode_cache=FileSystemBytecodeCache(Config.JINJA_BYTECODE_CACHE_DIR),
+        auto_reload=Config.TEMPLATES_AUTO_RELOAD,
+    )
+
+
+def warm_templates():
+    """Load and compile the context templates so no request pays for it"""
+    return [get_jinja_env().get_template(name) for name in CONTEXT_TEMPLATES]
 
 
 class RecommendationsService:
     """Handles movie recommendations via multiple triggers"""
     cache = None  # Set by app.py
 
-    def __init__(self, member_id):
+    def __init__(self, member_id, member_context=None):
         """
         Initialize recommendations service for a specific member
         
         Args:
             member_id: Member's ID
+            member_context: Request's MemberContext (built lazily when absent,
+                e.g. on background workers)
         """
         self.member_id = member_id
-        self.jinja_env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
+        self.member_context = member_context or MemberContext(member_id)
+        self.jinja_env = get_jinja_env()
         self.claude_client = None  # Lazy loaded when AI needed
     
     @cache_recommendations
@@ -72,19 +92,27 @@ class RecommendationsService:
         # Gather context
         watchlist_movies = self._get_watchlist()
         available_movies = self._get_available_movies(message)
-        
-        # Build system context
+        chat_history = self._get_chat_history()
+
+        # Trim context blocks to the prompt token budget
         template = self.jinja_env.get_template('chatbot.jinja')
+        builder = ContextBuilder()
+        watchlist_movies, available_movies, chat_history = builder.fit(
+            base_prompt=template.render(watchlist_movies=[], available_movies=[]),
+            message=message,
+            watchlist=watchlist_movies,
+            available=available_movies,
+            history=chat_history,
+        )
+        observe_context(builder.metrics)
+
+        # Build system context
         context = template.render(
             watchlist_movies=watchlist_movies,
             available_movies=available_movies,
             watchlist_count=len(watchlist_movies),
             available_count=len(available_movies)
         )
-        
-        # Get chat history and build messages array
-        ChatMessage.expire_all(self.member_id, with_commit=True)
-        chat_history = self._get_chat_history()
         messages = chat_history + [{"role": "user", "content": message}]
         
         # Query Claude
@@ -166,13 +194,11 @@ class RecommendationsService:
         ]
         
         # Get available movies
-        member = Member.query.get(self.member_id)
         query = Movie.query
 
-        age = member.age()
-        if age < AGE_UNLOCK_ALL:
-            allowed_ratings = get_allowable_ratings(age)
-            query = query.filter(Movie.rating.in_(allowed_ratings))
+        member = self.member_context
+        if not member.unlocks_all:
+            query = query.filter(Movie.rating.in_(member.allowed_ratings))
 
         available_movies_list = query\
             .order_by(func.random())\
@@ -206,14 +232,11 @@ class RecommendationsService:
     
     def _get_fresh(self):
         """Get random movies from database (no AI)"""
-        member = Member.query.get(self.member_id)        
-
         query = Movie.query
 
-        age = member.age()
-        if age < AGE_UNLOCK_ALL:
-            allowed_ratings = get_allowable_ratings(age)
-            query = query.filter(Movie.rating.in_(allowed_ratings))
+        member = self.member_context
+        if not member.unlocks_all:
+            query = query.filter(Movie.rating.in_(member.allowed_ratings))
 
         movies = query\
             .order_by(func.random())\
@@ -239,10 +262,11 @@ class RecommendationsService:
     # Helper methods
     
     def _get_watchlist(self):
-        """Fetch and format member's watchlist"""
+        """Fetch and format member's watchlist, most recently added first"""
         watchlist_items = Watchlist.query\
             .filter_by(member_id=self.member_id)\
             .options(joinedload(Watchlist.movie))\
+            .order_by(Watchlist.added_at.desc())\
             .all()
         
         # Check if status is enum or string
@@ -255,16 +279,15 @@ class RecommendationsService:
     def _get_available_movies(self, message):
         """Get available movies, optionally filtered by message"""
         filters = extract_filters(message)
-        member = Member.query.get(self.member_id)
-        age = member.age()
-        allowed_ratings = get_allowable_ratings(age)
+        member = self.member_context
+        allowed_ratings = member.allowed_ratings
         
         MAX_FILMS = 100
         if filters['decades']:
             movies = Movie.find_by_filters(
                 filters,
                 limit=MAX_FILMS,
-                allowed_ratings=allowed_ratings if age < AGE_UNLOCK_ALL else None,
+                allowed_ratings=None if member.unlocks_all else allowed_ratings,
                 order_by=func.random()
             )
         else:
@@ -282,7 +305,8 @@ class RecommendationsService:
     def _get_chat_history(self):
         """Fetch recent chat history for the member"""
         messages = ChatMessage.query\
-            .filter_by(member_id=self.member_id, active=True)\
+            .filter_by(member_id=self.member_id)\
+            .filter(ChatMessage.live())\
             .order_by(ChatMessage.created_at.asc())\
             .all()
         
@@ -0,0 +1,10 @@
+from enum import Enum
+
+
+class RecommendationTrigger(Enum):
+    """Enum for recommendation trigger types"""
+    CHATBOT_MESSAGE = "chatbot"
+    RATING_UNLOCK = "unlock"
+    WATCHLIST_QUEUED = "queued"
+    WATCHLIST_SIMILAR = "similar"
+    DATABASE_RANDOM = "fresh"
@@ -1,5 +1,10 @@
 """Cache utility for centralized cache key management and invalidation"""
 from functools import wraps
+from flask import current_app
+from services.triggers import RecommendationTrigger
+
+# Cache backends that live inside one process
+LOCAL_CACHE_TYPES = ('NullCache', 'SimpleCache', 'null', 'simple')
 
 class CacheKeys:
     """Centralized cache key definitions"""
@@ -12,18 +17,53 @@ class CacheKeys:
     def recommendations(member_id, trigger):
         return f"rec:{member_id}:{trigger}"
 
+    @staticmethod
+    def genres():
+        return "catalog:genres"
+
 
 class CacheManager:
     """Handles cache operations across the application"""
     
-    def __init__(self, cache):
+    def __init__(self, cache, catalog_timeout=None):
+        """
+        Args:
+            cache: Flask-Caching Cache, or None to disable caching
+            catalog_timeout: Seconds catalog aggregates (genres) stay cached
+        """
         self.cache = cache
+        self.catalog_timeout = catalog_timeout
     
     def clear_chat_context(self, member_id):
         """Clear chat-related caches when conversation ends"""
         if self.cache:
             self.cache.delete(CacheKeys.chat_movies(member_id))
     
+    def get_recommendations(self, member_id, trigger):
+        """Cached recommendation result for a trigger, or None"""
+        if self.cache:
+            return self.cache.get(CacheKeys.recommendations(member_id, trigger.value))
+        return None
+
+    def set_recommendations(self, member_id, trigger, result):
+        if self.cache:
+            self.cache.set(CacheKeys.recommendations(member_id, trigger.value), result, timeout=60*60)
+
+    def get_genres(self):
+        """Cached catalog genre list, or None"""
+        if self.cache:
+            return self.cache.get(CacheKeys.genres())
+        return None
+
+    def set_genres(self, genres):
+        if self.cache:
+            self.cache.set(CacheKeys.genres(), genres, timeout=self.catalog_timeout)
+
+    def clear_catalog(self):
+        """Clear catalog aggregates after a bulk load"""
+        if self.cache:
+            self.cache.delete(CacheKeys.genres())
+
     def clear_all_member_caches(self, member_id):
         """Clear all caches for a member (nuclear option)"""
         if self.cache:
@@ -31,7 +71,6 @@ class CacheManager:
             self.cache.delete(CacheKeys.chat_movies(member_id))
             
             # Clear all recommendation caches
-            from services import RecommendationTrigger
             for trigger in RecommendationTrigger:
                 if trigger != RecommendationTrigger.CHATBOT_MESSAGE:
                     self.cache.delete(CacheKeys.recommendations(member_id, trigger.value))
@@ -40,7 +79,6 @@ def cache_recommendations(func):
     """Decorator to cache recommendation results"""
     def wrapper(self, trigger, params=None):
         # Skip caching for chatbot (conversational)
-        from services import RecommendationTrigger
         if trigger == RecommendationTrigger.CHATBOT_MESSAGE:
             return func(self, trigger, params)
         
@@ -81,8 +119,7 @@ def cache_available_movies(func):
         
         # Store in cache with chat expiry TTL
         if self.cache:
-            from config import Config
-            ttl = Config.CHAT_EXPIRY_MINUTES * 60  # Convert to seconds
+            ttl = current_app.config['CHAT_EXPIRY_MINUTES'] * 60  # Convert to seconds
             self.cache.set(cache_key, result, timeout=ttl)
         
         return result
@@ -0,0 +1,113 @@
+"""Bounded worker pool for bcrypt hashing and verification
+
+bcrypt releases the GIL while it works, so a small thread pool keeps a burst
+of logins from occupying every request thread with CPU-bound hashing. The
+number of callers allowed to wait for the pool is capped; beyond that,
+callers get HashingBusyError and the route answers 503 instead of piling up.
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+from config import Config
+from utils.metrics import count_bcrypt, observe_bcrypt
+
+LATENCY_WINDOW = 1024  # most recent operations kept for percentiles
+
+
+class HashingBusyError(Exception):
+    """Raised when the hashing pool and its wait queue are full"""
+
+
+class HashingStats:
+    """
+    Rolling latency and throughput figures for hash/verify operations
+
+    Every observation also goes to the /metrics registry (bcrypt_*), which
+    is where production figures are read; snapshot() serves in-process
+    benchmarks (scripts/bench_bcrypt.py).
+    """
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self._lock = threading.Lock()
+        self._samples = {'hash': deque(maxlen=window), 'verify': deque(maxlen=window)}
+        self._counts = {'hash': 0, 'verify': 0, 'rejected': 0, 'rehashed': 0}
+
+    def observe(self, operation, started, seconds):
+        with self._lock:
+            self._samples[operation].append((started, seconds))
+            self._counts[operation] += 1
+        observe_bcrypt(operation, seconds)
+
+    def increment(self, counter):
+        with self._lock:
+            self._counts[counter] += 1
+        count_bcrypt(counter)
+
+    def snapshot(self):
+        """
+        Summarise the recorded window
+
+        Returns:
+            dict: counts plus, per operation, p50/p95/p99 latency (ms) and
+                  throughput (ops/sec) over the window
+        """
+        with self._lock:
+            samples = {op: list(values) for op, values in self._samples.items()}
+            result = dict(self._counts)
+
+        for operation, values in samples.items():
+            if not values:
+                continue
+            latencies = sorted(seconds for _, seconds in values)
+            span = max(time.time() - values[0][0], 1e-6)
+            result[operation + '_latency_ms'] = {
+                f'p{p}': round(latencies[min(int(len(latencies) * p / 100), len(latencies) - 1)] * 1000, 1)
+                for p in (50, 95, 99)
+            }
+            result[operation + '_per_sec'] = round(len(values) / span, 2)
+        result['rounds'] = Config.BCRYPT_ROUNDS
+        return result
+
+
+stats = HashingStats()
+_executor = ThreadPoolExecutor(max_workers=Config.BCRYPT_POOL_SIZE, thread_name_prefix='bcrypt')
+_slots = threading.BoundedSemaphore(Config.BCRYPT_POOL_SIZE + Config.BCRYPT_MAX_WAITING)
+
+
+def _run(operation, fn, *args):
+    if not _slots.acquire(timeout=Config.BCRYPT_WAIT_SECONDS):
+        stats.increment('rejected')
+        raise HashingBusyError("Password hashing is at capacity, try again shortly")
+    started_wall, started = time.time(), time.perf_counter()
+    try:
+        return _executor.submit(fn, *args).result()
+    finally:
+        _slots.release()
+        stats.observe(operation, started_wall, time.perf_counter() - started)
+
+
+def hash_password(password, rounds=None):
+    """Hash a password with the configured work factor on the pool"""
+    salt = bcrypt.gensalt(rounds=rounds or Config.BCRYPT_ROUNDS)
+    return _run('hash', bcrypt.hashpw, password.encode('utf-8'), salt).decode('utf-8')
+
+
+def check_password(password, password_hash):
+    """Verify a password against its stored hash on the pool"""
+    return _run('verify', bcrypt.checkpw, password.encode('utf-8'), password_hash.encode('utf-8'))
+
+
+def hash_rounds(password_hash):
+    """Work factor encoded in a bcrypt hash ($2b$<rounds>$...)"""
+    try:
+        return int(password_hash.split('$')[2])
+    except (IndexError, ValueError):
+        return None
+
+
+def needs_rehash(password_hash):
+    """Whether a stored hash was made with a different work factor than the target"""
+    return hash_rounds(password_hash) != Config.BCRYPT_ROUNDS
@@ -0,0 +1,296 @@
+"""Request, SQL and Claude call metrics in Prometheus text format
+
+Each request records its latency, status and, through SQLAlchemy cursor
+events, the number of SQL statements it ran and the time spent in them.
+Claude calls record their own latency, chat prompts record the context
+tokens they kept and trimmed, and password hashing records its latency
+(throughput is the rate of its count). Observations are a dict update
+under a lock; nothing is formatted until /metrics is scraped.
+
+Metrics live in the process that recorded them. With several gunicorn
+workers set METRICS_DIR: each process writes its totals there (at most
+every METRICS_FLUSH_SECONDS) and /metrics serves the sum of all files, so
+any worker can answer a scrape. Totals of exited workers are folded into
+one file by the gunicorn child_exit hook.
+"""
+import glob
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from flask import Response, g, has_request_context, request
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+CLAUDE_BUCKETS = (0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+BCRYPT_BUCKETS = (0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 1, 2, 5)
+
+EXITED_FILE = 'exited.json'
+
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name, help, labels):
+        self.name, self.help, self.labels = name, help, labels
+
+    def empty(self):
+        return 0.0
+
+    def add(self, value, amount):
+        return value + amount
+
+    def merge(self, a, b):
+        return a + b
+
+    def samples(self, key, value):
+        yield self.name, key, value
+
+
+class Histogram:
+    """Stored as per-bucket (not cumulative) counts, then +Inf, then the sum"""
+    kind = 'histogram'
+
+    def __init__(self, name, help, labels, buckets):
+        self.name, self.help, self.labels, self.buckets = name, help, labels, buckets
+
+    def empty(self):
+        return [0] * (len(self.buckets) + 1) + [0.0]
+
+    def add(self, value, amount):
+        value[bisect_left(self.buckets, amount)] += 1
+        value[-1] += amount
+        return value
+
+    def merge(self, a, b):
+        return [x + y for x, y in zip(a, b)]
+
+    def samples(self, key, value):
+        cumulative = 0
+        for bound, count in zip(self.buckets + ('+Inf',), value):
+            cumulative += count
+            yield f"{self.name}_bucket", key + (('le', format_number(bound)),), cumulative
+        yield f"{self.name}_sum", key, value[-1]
+        yield f"{self.name}_count", key, cumulative
+
+
+REQUESTS = Counter('http_requests_total', 'HTTP requests by route and status', ('method', 'endpoint', 'status'))
+REQUEST_SECONDS = Histogram('http_request_duration_seconds', 'HTTP request latency by route',
+                            ('method', 'endpoint'), LATENCY_BUCKETS)
+REQUEST_QUERIES = Histogram('http_request_queries', 'SQL statements per request',
+                            ('method', 'endpoint'), QUERY_BUCKETS)
+REQUEST_DB_SECONDS = Histogram('http_request_db_seconds', 'Time in SQL statements per request',
+                               ('method', 'endpoint'), LATENCY_BUCKETS)
+CLAUDE_SECONDS = Histogram('claude_request_duration_seconds', 'Claude API call latency',
+                           ('model', 'outcome'), CLAUDE_BUCKETS)
+CONTEXT_TOKENS = Counter('chat_context_tokens_total', 'Chat prompt context tokens sent, by block',
+                         ('block',))
+CONTEXT_TOKENS_SAVED = Counter('chat_context_tokens_saved_total', 'Chat prompt context tokens trimmed, by block',
+                               ('block',))
+BCRYPT_SECONDS = Histogram('bcrypt_duration_seconds', 'Password hash/verify latency, including the pool wait',
+                           ('operation',), BCRYPT_BUCKETS)
+BCRYPT_EVENTS = Counter('bcrypt_events_total', 'Hashing calls rejected at capacity, and hashes upgraded on login',
+                        ('event',))
+METRICS = (REQUESTS, REQUEST_SECONDS, REQUEST_QUERIES, REQUEST_DB_SECONDS, CLAUDE_SECONDS,
+           CONTEXT_TOKENS, CONTEXT_TOKENS_SAVED, BCRYPT_SECONDS, BCRYPT_EVENTS)
+
+
+def format_number(value):
+    if isinstance(value, str):
+        return value
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+class Registry:
+    """Metric values of this process, keyed by metric name and label values"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {metric.name: {} for metric in METRICS}
+        self._flushed_at = 0.0
+        self.directory = None
+        self.flush_seconds = 1.0
+
+    def configure(self, directory, flush_seconds):
+        """Share totals through directory (METRICS_DIR); None keeps them in process"""
+        self.directory = directory
+        self.flush_seconds = flush_seconds
+
+    def observe(self, metric, labels, amount):
+        with self._lock:
+            values = self._values[metric.name]
+            values[labels] = metric.add(values.get(labels, metric.empty()), amount)
+
+    def snapshot(self):
+        with self._lock:
+            return {name: {key: list(value) if isinstance(value, list) else value
+                           for key, value in values.items()}
+                    for name, values in self._values.items()}
+
+    def flush(self, force=False):
+        """Write this process's totals to METRICS_DIR (rate limited unless forced)"""
+        if not self.directory:
+            return
+        now = time.monotonic()
+        if not force and now - self._flushed_at < self.flush_seconds:
+            return
+        self._flushed_at = now
+        write_snapshot(os.path.join(self.directory, f"{os.getpid()}.json"), self.snapshot())
+
+
+registry = Registry()
+
+
+def write_snapshot(path, snapshot):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump({name: [[list(key), value] for key, value in values.items()]
+                   for name, values in snapshot.items()}, f)
+    os.replace(tmp, path)
+
+
+def read_snapshot(path):
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return {name: {tuple(key): value for key, value in values} for name, values in data.items()}
+
+
+def merge(snapshots):
+    merged = {metric.name: {} for metric in METRICS}
+    for snapshot in snapshots:
+        for metric in METRICS:
+            values = merged[metric.name]
+            for key, value in snapshot.get(metric.name, {}).items():
+                values[key] = metric.merge(values[key], value) if key in values else value
+    return merged
+
+
+def collect():
+    """Totals of this process, or of every process sharing METRICS_DIR"""
+    if not registry.directory:
+        return registry.snapshot()
+    registry.flush(force=True)
+    return merge(read_snapshot(path) for path in glob.glob(os.path.join(registry.directory, '*.json')))
+
+
+def render(snapshot):
+    """Prometheus text exposition format (version 0.0.4)"""
+    lines = []
+    for metric in METRICS:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for key, value in sorted(snapshot.get(metric.name, {}).items()):
+            labels = tuple(zip(metric.labels, key))
+            for name, sample_labels, sample in metric.samples(labels, value):
+                label_text = ','.join(f'{k}="{escape(v)}"' for k, v in sample_labels)
+                lines.append(f"{name}{{{label_text}}} {format_number(sample)}")
+    return '\n'.join(lines) + '\n'
+
+
+def fold_exited_worker(directory, pid):
+    """Add an exited worker's totals to the shared exited-workers file (gunicorn master)"""
+    if not directory:
+        return
+    path = os.path.join(directory, f"{pid}.json")
+    if not os.path.exists(path):
+        return
+    exited = os.path.join(directory, EXITED_FILE)
+    write_snapshot(exited, merge([read_snapshot(exited), read_snapshot(path)]))
+    os.remove(path)
+
+
+def reset(directory):
+    """Start from zero (gunicorn master start): drop totals of a previous run"""
+    if directory:
+        for path in glob.glob(os.path.join(directory, '*.json')):
+            os.remove(path)
+
+
+def observe_claude(model, outcome, seconds):
+    registry.observe(CLAUDE_SECONDS, (model, outcome), seconds)
+    if not has_request_context():
+        # Job workers serve no requests; flush here so their calls show up
+        registry.flush()
+
+
+def observe_bcrypt(operation, seconds):
+    registry.observe(BCRYPT_SECONDS, (operation,), seconds)
+
+
+def count_bcrypt(event_name):
+    registry.observe(BCRYPT_EVENTS, (event_name,), 1)
+
+
+def observe_context(blocks):
+    """Record a ContextBuilder's per-block token counts (its ``metrics``)"""
+    for block, counts in blocks.items():
+        if block == 'total':
+            continue
+        registry.observe(CONTEXT_TOKENS, (block,), counts['tokens_after'])
+        registry.observe(CONTEXT_TOKENS_SAVED, (block,), counts['tokens_saved'])
+    if not has_request_context():
+        registry.flush()
+
+
+def _before_request():
+    g.metrics_started = time.perf_counter()
+    g.metrics_queries = 0
+    g.metrics_db_seconds = 0.0
+
+
+def _after_request(response):
+    started = g.get('metrics_started')
+    if started is None:
+        return response
+    # Label by route pattern, never the raw path, to bound the series count
+    endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+    labels = (request.method, endpoint)
+    registry.observe(REQUESTS, labels + (str(response.status_code),), 1)
+    registry.observe(REQUEST_SECONDS, labels, time.perf_counter() - started)
+    registry.observe(REQUEST_QUERIES, labels, g.metrics_queries)
+    registry.observe(REQUEST_DB_SECONDS, labels, g.metrics_db_seconds)
+    registry.flush()
+    return response
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        conn.info['metrics_started'] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop('metrics_started', None)
+    if started is not None and has_request_context() and 'metrics_queries' in g:
+        g.metrics_db_seconds += time.perf_counter() - started
+        g.metrics_queries += 1
+
+
+def metrics():
+    return Response(render(collect()), mimetype='text/plain; version=0.0.4')
+
+
+def init_metrics(app):
+    """Record request and SQL metrics for the app and serve them at /metrics"""
+    registry.configure(app.config.get('METRICS_DIR'), app.config.get('METRICS_FLUSH_SECONDS', 1.0))
+    if not app.config.get('METRICS_ENABLED'):
+        return
+    from database import db
+
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.add_url_rule('/metrics', 'metrics', metrics)
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
@@ -1,4 +1,5 @@
 AGE_UNLOCK_ALL = 18
+RATING_TIER_ALL = 'ALL'
 RATING_AGE_REQUIREMENTS = {
     'G': 0,
     'PG': 0,
@@ -32,6 +33,21 @@ def get_rating(age):
     # Default to lowest rating if nothing matches
     return 'G'
 
+def get_rating_tier(age):
+    """Highest rating an age unlocks, or RATING_TIER_ALL once everything is unlocked"""
+    return get_rating(age) if age < AGE_UNLOCK_ALL else RATING_TIER_ALL
+
+def get_tier_ratings(tier):
+    """Ratings allowed for a rating tier (same result as get_allowable_ratings for that age)"""
+    if tier == RATING_TIER_ALL:
+        return list(RATING_AGE_REQUIREMENTS)
+    min_age = RATING_AGE_REQUIREMENTS[tier]
+    return [
+        rating
+        for rating, required in RATING_AGE_REQUIREMENTS.items()
+        if required <= min_age
+    ]
+
 def age_unlocks_ratings(prev, next):
     return get_rating(prev) != get_rating(next)
 
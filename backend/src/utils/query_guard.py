@@ -0,0 +1,112 @@
+"""SQL statement guard for tests and load runs: N+1 detection and query budgets
+
+With QUERY_GUARD set to 'warn' or 'raise', every SQL statement a request
+executes is recorded. When the request ends, statements are grouped by
+shape (the SQL with parameters and IN lists collapsed), and two problems
+are reported:
+
+- the same shape ran QUERY_GUARD_REPEAT_LIMIT times or more, which is
+  usually a query inside a loop;
+- the route ran more statements than its @query_budget allows.
+
+'warn' prints a report. 'raise' raises QueryBudgetExceeded, so the request
+fails (and propagates to the test under app.testing). With 'off', the
+default, no listeners are installed and nothing is recorded.
+"""
+import re
+from collections import Counter
+from functools import wraps
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+GUARD_OFF = 'off'
+GUARD_WARN = 'warn'
+GUARD_RAISE = 'raise'
+
+PARAMETER = re.compile(r"%\(\w+\)s|%s|\?|\$\d+|'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+PARAMETER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+
+
+class QueryBudgetExceeded(Exception):
+    """A request ran more statements than its budget, or repeated one shape"""
+
+
+def statement_shape(statement):
+    """SQL text with literals and parameters as ?, IN lists as (?...), whitespace collapsed"""
+    shape = PARAMETER.sub('?', statement)
+    shape = PARAMETER_LIST.sub('(?...)', shape)
+    return ' '.join(shape.split())
+
+
+def query_budget(limit):
+    """
+    Declare the most SQL statements a view may run per request
+
+    Put it directly under the route decorator so it also covers statements
+    run by the auth decorators.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            g.query_budget = limit
+            return f(*args, **kwargs)
+        decorated.query_budget = limit
+        return decorated
+    return decorator
+
+
+def check(statements, budget, repeat_limit):
+    """
+    Problems with a request's statements
+
+    Returns:
+        list: Descriptions of repeated shapes and a budget overrun, if any
+    """
+    problems = [
+        f"{count}x same statement (possible N+1): {shape[:200]}"
+        for shape, count in Counter(map(statement_shape, statements)).most_common()
+        if count >= repeat_limit
+    ]
+    if budget is not None and len(statements) > budget:
+        problems.append(f"{len(statements)} statements exceed the budget of {budget}")
+    return problems
+
+
+def _before_request():
+    g.query_log = []
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and 'query_log' in g:
+        g.query_log.append(statement)
+
+
+def init_query_guard(app):
+    """Record each request's statements and check them when it ends"""
+    mode = app.config.get('QUERY_GUARD', GUARD_OFF)
+    if mode == GUARD_OFF:
+        return
+    if mode not in (GUARD_WARN, GUARD_RAISE):
+        raise ValueError(f"Unknown QUERY_GUARD mode: {mode}")
+    from database import db
+
+    repeat_limit = app.config['QUERY_GUARD_REPEAT_LIMIT']
+
+    def after_request(response):
+        statements = g.pop('query_log', None)
+        if statements is None:
+            return response
+        problems = check(statements, g.get('query_budget'), repeat_limit)
+        if problems:
+            report = f"{request.method} {request.path}: " + '; '.join(problems)
+            if mode == GUARD_RAISE:
+                raise QueryBudgetExceeded(report)
+            print(f"QUERY GUARD: {report}")
+        return response
+
+    app.before_request(_before_request)
+    app.after_request(after_request)
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
@@ -0,0 +1,32 @@
+"""WSGI entry point for production servers (see gunicorn.conf.py)"""
+from app import create_app
+from database import db
+from models import Movie
+from services import warm_templates
+
+app = create_app()
+
+# Compile prompt templates at startup so the first request pays nothing
+warm_templates()
+
+
+def warm_catalog():
+    """
+    Load catalog snapshots into the cache
+
+    With preload_app this runs once in the gunicorn master, before any
+    worker starts, and the workers read it from the shared cache. The
+    connection it used is closed so no socket is shared with the children.
+    """
+    with app.app_context():
+        try:
+            app.cache_manager.set_genres(Movie.genres())
+        except Exception as e:
+            print(f"Catalog warm-up skipped: {e}")
+        finally:
+            db.session.remove()
+            for engine in db.engines.values():
+                engine.dispose()
+
+
+warm_catalog()
@@ -0,0 +1,34 @@
+"""
+Shared test setup
+
+Run from backend/ with `PYTHONPATH=src pytest tests/` (make test-backend).
+Tests that need Postgres use the `database` fixture, which creates an empty
+scratch database (TEST_DB_NAME, default movies_test) for each test module
+and skips when the server can't be reached.
+"""
+import os
+import sys
+
+import psycopg2
+import pytest
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+TEST_DB = os.getenv('TEST_DB_NAME', 'movies_test')
+
+# Config reads the environment at import time, so set it before any app import
+os.environ['DB_NAME'] = TEST_DB
+os.environ['EXPLAIN_DB_NAME'] = TEST_DB  # scratch database of explain_check
+os.environ.setdefault('CLAUDE_BACKEND', 'stub')
+sys.path.insert(0, os.path.join(BACKEND_DIR, 'scripts'))
+
+
+@pytest.fixture(scope='module')
+def database():
+    """Empty scratch database, dropped after the module"""
+    import explain_check
+    try:
+        explain_check.recreate_database()
+    except psycopg2.OperationalError as e:
+        pytest.skip(f"Postgres unavailable: {e}")
+    yield TEST_DB
+    explain_check.drop_database()
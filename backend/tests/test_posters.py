@@ -0,0 +1,89 @@
+"""Poster route: local cache misses, hits and revalidation (services/posters.py)"""
+import io
+import os
+
+import pytest
+from PIL import Image
+
+import explain_check
+from config import Config
+from services.posters import DirectoryOrigin, PosterCache
+
+POSTER_URLS = ('https://image.tmdb.org/t/p/w500/alien.jpg', 'https://image.tmdb.org/t/p/w500/heat.jpg')
+
+
+@pytest.fixture(scope='module')
+def posters(database, tmp_path_factory):
+    """App serving posters from a DirectoryOrigin into a scratch POSTER_CACHE_DIR"""
+    from app import create_app
+    from database import db
+
+    origin_dir = tmp_path_factory.mktemp('origin')
+    cache_dir = tmp_path_factory.mktemp('posters')
+    for url in POSTER_URLS:
+        Image.new('RGB', (400, 600), 'red').save(origin_dir / os.path.basename(url))
+
+    class PosterConfig(Config):
+        POSTER_ORIGIN = 'directory'
+        POSTER_ORIGIN_DIR = str(origin_dir)
+        POSTER_CACHE_DIR = str(cache_dir)
+
+    app = create_app(PosterConfig)
+    with app.app_context():
+        with db.engine.begin() as conn:
+            with open(explain_check.SCHEMA_PATH) as f:
+                conn.exec_driver_sql(f.read())
+            movie_ids = [
+                conn.exec_driver_sql("INSERT INTO movie (title, poster_url) VALUES (%s, %s) RETURNING id",
+                                     (os.path.basename(url), url)).scalar()
+                for url in POSTER_URLS
+            ]
+    yield app, origin_dir, cache_dir, movie_ids
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+def test_miss_fetches_origin_without_holding_a_connection(posters, monkeypatch):
+    app, origin_dir, cache_dir, (movie_id, _) = posters
+    from database import db
+    checked_out = []
+    fetch = DirectoryOrigin.fetch
+
+    def tracking_fetch(self, url):
+        checked_out.append(db.engine.pool.checkedout())
+        return fetch(self, url)
+
+    monkeypatch.setattr(DirectoryOrigin, 'fetch', tracking_fetch)
+    response = app.test_client().get(f'/movies/{movie_id}/poster/w92')
+
+    assert response.status_code == 200
+    assert response.mimetype == 'image/jpeg'
+    assert Image.open(io.BytesIO(response.data)).width == 92
+    assert checked_out == [0]
+    with app.app_context():
+        assert os.path.exists(PosterCache().path(movie_id, POSTER_URLS[0], 'w92'))
+
+
+def test_hit_is_served_without_the_origin(posters):
+    app, origin_dir, cache_dir, (_, movie_id) = posters
+    client = app.test_client()
+    first = client.get(f'/movies/{movie_id}/poster/w185')
+    os.remove(origin_dir / os.path.basename(POSTER_URLS[1]))
+    second = client.get(f'/movies/{movie_id}/poster/w185')
+
+    assert first.status_code == second.status_code == 200
+    assert second.data == first.data
+    assert second.headers['ETag'] == first.headers['ETag']
+
+
+def test_matching_etag_is_not_modified(posters):
+    app, origin_dir, cache_dir, (movie_id, _) = posters
+    etag = PosterCache.etag(POSTER_URLS[0], 'w342')
+    response = app.test_client().get(f'/movies/{movie_id}/poster/w342', headers={'If-None-Match': f'"{etag}"'})
+
+    assert response.status_code == 304
+    assert response.cache_control.max_age == Config.POSTER_MAX_AGE_SECONDS
+    with app.app_context():
+        # Revalidation never touches the cache
+        assert not os.path.exists(PosterCache().path(movie_id, POSTER_URLS[0], 'w342'))
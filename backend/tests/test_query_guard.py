@@ -0,0 +1,168 @@
+"""N+1 detection and per-route query budgets (utils/query_guard.py)"""
+import pytest
+from flask import request
+from sqlalchemy import text
+
+import explain_check
+from config import Config
+from utils.query_guard import QueryBudgetExceeded, check, query_budget, statement_shape
+
+
+class GuardedConfig(Config):
+    QUERY_GUARD = 'raise'
+    # Chat tests post messages; keep the member under the spend cap
+    AGENT_USAGE_LIMIT = float('inf')
+
+
+def test_statement_shape_collapses_parameters_and_literals():
+    a = statement_shape("SELECT * FROM movie WHERE id = %(id_1)s AND title = 'Alien'")
+    b = statement_shape("SELECT *  FROM movie\n WHERE id = 42 AND title = 'It''s'")
+    assert a == b == "SELECT * FROM movie WHERE id = ? AND title = ?"
+
+
+def test_statement_shape_collapses_in_lists():
+    assert statement_shape("SELECT * FROM movie WHERE id IN (%(p_1)s, %(p_2)s, %(p_3)s)") == \
+        statement_shape("SELECT * FROM movie WHERE id IN (7)") == \
+        "SELECT * FROM movie WHERE id IN (?...)"
+
+
+def test_check_flags_repeated_shapes():
+    statements = [f"SELECT * FROM movie WHERE id = {i}" for i in range(3)]
+    problems = check(statements, budget=None, repeat_limit=3)
+    assert len(problems) == 1
+    assert problems[0].startswith('3x same statement')
+    assert check(statements[:2], budget=None, repeat_limit=3) == []
+
+
+def test_check_flags_budget_overrun():
+    statements = ["SELECT 1", "SELECT * FROM movie", "SELECT * FROM member"]
+    assert check(statements, budget=3, repeat_limit=3) == []
+    assert check(statements, budget=2, repeat_limit=3) == ["3 statements exceed the budget of 2"]
+
+
+@pytest.fixture
+def guarded_app(database):
+    """App with QUERY_GUARD=raise and a /budgeted route running ?n statements on a budget of 2"""
+    from app import create_app
+    from database import db
+    app = create_app(GuardedConfig)
+    app.testing = True
+
+    @app.route('/budgeted')
+    @query_budget(2)
+    def budgeted():
+        for _ in range(request.args.get('n', type=int)):
+            db.session.execute(text('SELECT 1'))
+        return 'ok'
+
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+
+def test_route_within_budget(guarded_app):
+    assert guarded_app.test_client().get('/budgeted?n=2').status_code == 200
+
+
+def test_route_over_budget_raises(guarded_app):
+    with pytest.raises(QueryBudgetExceeded, match='3 statements exceed the budget of 2'):
+        guarded_app.test_client().get('/budgeted?n=3')
+
+
+# Every budgeted route, called as a member with a watchlist and chat history.
+# (method, path, json body); a route over its @query_budget, or repeating a
+# statement shape (N+1), raises QueryBudgetExceeded.
+ROUTES = [
+    ('GET', '/movies', None),
+    ('GET', '/movies?page=2&genre=Drama', None),
+    ('GET', '/movies?search=Midnight%20Harbor', None),
+    ('GET', '/movies/{movie_id}', None),
+    ('GET', '/movies/genres', None),
+    ('GET', '/movies/changes?since=0&limit=100', None),
+    ('GET', '/member', None),
+    ('GET', '/watchlist', None),
+    ('GET', '/watchlist/overview', None),
+    ('GET', '/chat/history', None),
+    ('POST', '/chat/message', {'message': 'Something like Alien, but funnier'}),
+    ('DELETE', '/chat/clear', None),
+]
+
+
+@pytest.fixture(scope='module')
+def seeded(database):
+    """
+    Guarded app on schema.sql + migrations + a small generate_data catalog
+
+    Returns:
+        tuple: (app, client with the member's auth cookie, member_id, movie_id
+               of a movie not on the member's watchlist)
+    """
+    conn = explain_check.admin_connect()
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        has_trgm = cursor.fetchone()
+    conn.close()
+    if not has_trgm:
+        pytest.skip('pg_trgm extension not installed (required by the migrations)')
+
+    import generate_data
+    from flask_migrate import upgrade
+    from app import create_app
+    from database import db
+
+    app = create_app(GuardedConfig)
+    app.testing = True
+    with app.app_context():
+        with db.engine.begin() as conn:
+            with open(explain_check.SCHEMA_PATH) as f:
+                conn.exec_driver_sql(f.read())
+        upgrade(directory=explain_check.MIGRATIONS_DIR)
+    generate_data.generate(movies=500, members=40, watchlist=10, chat=8, seed=7, workers=2)
+
+    with app.app_context():
+        member_id = db.session.execute(text("""
+            SELECT c.member_id FROM chat_message c
+            WHERE EXISTS (SELECT 1 FROM watchlist w WHERE w.member_id = c.member_id)
+            GROUP BY c.member_id ORDER BY count(*) DESC, c.member_id LIMIT 1
+        """)).scalar()
+        # An adult, so every rating is visible
+        db.session.execute(text("UPDATE member SET date_of_birth = '1985-06-15' WHERE id = :id"), {'id': member_id})
+        movie_id = db.session.execute(text("""
+            SELECT min(id) FROM movie
+            WHERE id NOT IN (SELECT movie_id FROM watchlist WHERE member_id = :id)
+        """), {'id': member_id}).scalar()
+        db.session.commit()
+        db.session.remove()
+
+    client = app.test_client()
+    name, token = explain_check.make_token(app, member_id, 40)
+    client.set_cookie('localhost', name, token)
+    yield app, client, member_id, movie_id
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.mark.parametrize('method, path, body', ROUTES)
+def test_route_stays_within_its_budget(seeded, method, path, body):
+    app, client, member_id, movie_id = seeded
+    response = client.open(path.format(movie_id=movie_id), method=method, json=body)
+    assert response.status_code in (200, 202)
+
+
+def test_watchlist_changes_stay_within_their_budgets(seeded):
+    app, client, member_id, movie_id = seeded
+    assert client.post('/watchlist', json={'movieId': movie_id}).status_code == 201
+    assert client.patch(f'/watchlist/{movie_id}', json={'status': 'watched'}).status_code == 200
+    assert client.delete(f'/watchlist/{movie_id}').status_code == 200
+
+
+def test_job_polls_stay_within_their_budget(seeded):
+    from services.jobs import JobQueue
+    from services.triggers import RecommendationTrigger
+    app, client, member_id, movie_id = seeded
+    with app.app_context():
+        job_id = JobQueue.enqueue(member_id, RecommendationTrigger.WATCHLIST_QUEUED).id
+        assert client.get(f'/jobs/{job_id}').status_code == 202
+        JobQueue.run(JobQueue.claim())
+    assert client.get(f'/jobs/{job_id}').status_code == 200
@@ -0,0 +1,41 @@
+"""Hot GET routes keep their index plans (see scripts/explain_check.py)"""
+import pytest
+
+import explain_check
+
+
+@pytest.fixture(scope='module')
+def seeded(database):
+    """App on a schema-complete, seeded scratch database"""
+    conn = explain_check.admin_connect()
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        has_trgm = cursor.fetchone()
+    conn.close()
+    if not has_trgm:
+        pytest.skip('pg_trgm extension not installed (required by the migrations)')
+
+    from app import create_app
+    from database import db
+    app = create_app()
+    members, movie_id = explain_check.prepare(app, explain_check.parse_args([]))
+    captured = explain_check.capture_selects(app)
+    yield app, captured, members, movie_id
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.mark.parametrize('path, who, max_cost, seq_scan_ok', explain_check.ROUTES)
+def test_route_plans(seeded, path, who, max_cost, seq_scan_ok):
+    app, captured, members, movie_id = seeded
+    response, plans = explain_check.route_plans(app, captured, path.format(movie_id=movie_id), who, members)
+
+    assert response.status_code in (200, 202)
+    assert plans
+    problems = [
+        f"{problem}: {' '.join(statement.split())[:110]}"
+        for statement, plan in plans
+        for problem in explain_check.plan_problems(plan, max_cost, seq_scan_ok)
+    ]
+    assert not problems
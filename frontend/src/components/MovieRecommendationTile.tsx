@@ -1,6 +1,7 @@
 import React from 'react';
 import { useNavigate } from 'react-router-dom';
 import type { Movie } from '../types';
+import { API_ENDPOINTS } from '../constants/api';
 import '../styles/MovieRecommendationTile.css';
 
 interface MovieRecommendationTileProps {
@@ -25,7 +26,7 @@ const MovieRecommendationTile: React.FC<MovieRecommendationTileProps> = ({ movie
     <div className="movie-recommendation-tile" onClick={handleClick}>
       <div className="recommendation-poster">
         {movie.poster_url ? (
-          <img src={movie.poster_url} alt={`${movie.title} poster`} />
+          <img src={API_ENDPOINTS.MOVIES.POSTER(movie.id, 'w185')} alt={`${movie.title} poster`} />
         ) : (
           <div className="recommendation-poster-placeholder">
             <div className="recommendation-initials">{initials}</div>
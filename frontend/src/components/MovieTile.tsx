@@ -1,5 +1,6 @@
 import React from 'react';
 import type { Movie } from '../types';
+import { API_ENDPOINTS } from '../constants/api';
 import { useNavigate } from 'react-router-dom';
 import type { WatchlistFilter } from '../types/Watchlist';
 import { WatchlistFilterValue } from '../types/Watchlist';
@@ -31,7 +32,7 @@ const MovieTile: React.FC<MovieTileProps> = ({
     <div className="movie-tile" onClick={() => navigate(`/movies/${movie.id}`)}>
       {movie.poster_url ? (
         <img 
-          src={movie.poster_url} 
+          src={API_ENDPOINTS.MOVIES.POSTER(movie.id, 'w342')}
           alt={`${movie.title} poster`}
           className="movie-poster"
         />
@@ -14,6 +14,8 @@ export const API_ENDPOINTS = {
     LIST: `${API_BASE_URL}/movies`,
     DETAIL: (id) => `${API_BASE_URL}/movies/${id}`,
     GENRES: `${API_BASE_URL}/movies/genres`,
+    // Cached and resized by the backend: w92, w185, w342 or original
+    POSTER: (id, variant) => `${API_BASE_URL}/movies/${id}/poster/${variant}`,
   },
   WATCHLIST: {
     LIST: `${API_BASE_URL}/watchlist`,
@@ -22,6 +24,9 @@ export const API_ENDPOINTS = {
     UPDATE: (id) => `${API_BASE_URL}/watchlist/${id}`,
     OVERVIEW: `${API_BASE_URL}/watchlist/overview`,
   },
+  JOBS: {
+    STATUS: (id) => `${API_BASE_URL}/jobs/${id}`,
+  },
   CHAT: {
     MESSAGE: `${API_BASE_URL}/chat/message`,
     HISTORY: `${API_BASE_URL}/chat/history`,
@@ -5,7 +5,7 @@ import { accountRecord } from '../store/accountSlice'
 import type { AppDispatch, RootState } from '../store/store'
 import { API_ENDPOINTS } from '../constants/api'
 import MovieTile from '../components/MovieTile'
-import type { Movie, OverviewResponse } from '../types'
+import type { JobResponse, Movie, OverviewResponse } from '../types'
 import './../styles/Home.css'
 
 function Home() {
@@ -58,16 +58,50 @@ function Home() {
         })
         const data: OverviewResponse = await response.json()
         setOverview(data)
+        if (data.job) {
+          pollJob(data.job.id)
+        }
       } catch (error) {
         console.error('Error fetching overview:', error)
       } finally {
         setLoading(false)
       }
     }
+
+    // AI recommendations run in the background; swap them in once ready
+    let pollTimer: ReturnType<typeof setTimeout> | null = null
+    const pollJob = async (jobId: number) => {
+      try {
+        const response = await fetch(API_ENDPOINTS.JOBS.STATUS(jobId), {
+          credentials: 'include',
+        })
+        const data: JobResponse = await response.json()
+        if (response.status === 202) {
+          const retryAfter = Number(response.headers.get('Retry-After') || 2)
+          pollTimer = setTimeout(() => pollJob(jobId), retryAfter * 1000)
+        } else if (data.recommendations?.movies?.length) {
+          const movies = data.recommendations.movies
+          setOverview(prev => prev && {
+            ...prev,
+            job: data.job,
+            recommendations: {
+              movies,
+              reason: 'Based on movies you\'ve watched',
+            },
+          })
+        }
+      } catch (error) {
+        console.error('Error polling recommendations job:', error)
+      }
+    }
     
     if (account) {
       fetchOverview()
     }
+
+    return () => {
+      if (pollTimer) clearTimeout(pollTimer)
+    }
   }, [account])
 
   useEffect(() => {
@@ -99,7 +99,7 @@ const MovieDetail = () => {
       <div className="movie-detail-content">
         <div className="movie-detail-poster">
           {movie.poster_url ? (
-            <img src={movie.poster_url} alt={`${movie.title} poster`} />
+            <img src={API_ENDPOINTS.MOVIES.POSTER(movie.id, 'original')} alt={`${movie.title} poster`} />
           ) : (
             <div className="poster-placeholder">
               <div className="poster-initials">{initials}</div>
@@ -38,6 +38,24 @@ export interface OverviewResponse {
     movies: Movie[];
     reason: string;
   };
+  job?: Job;
+}
+
+export interface Job {
+  id: number;
+  trigger: string;
+  status: 'queued' | 'running' | 'done' | 'failed';
+  error: string | null;
+  createdAt: string | null;
+  finishedAt: string | null;
+}
+
+export interface JobResponse {
+  job: Job;
+  recommendations?: {
+    movies: Movie[];
+    message: string;
+  };
 }
 
 // Type for filter values (union of possible string values)